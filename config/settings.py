@@ -12,6 +12,108 @@ SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'django-insecure-your-secret-key-her
 
 # YouTube API settings
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+# Data API units per day (resets at midnight Pacific), calls per second and burst size
+YOUTUBE_DAILY_QUOTA = int(os.getenv('YOUTUBE_DAILY_QUOTA', 10000))
+YOUTUBE_API_RATE = float(os.getenv('YOUTUBE_API_RATE', 10))
+YOUTUBE_API_BURST = int(os.getenv('YOUTUBE_API_BURST', 20))
+# Retries for 429 / 5xx / rate-limit errors, with jittered exponential backoff (seconds)
+YOUTUBE_MAX_RETRIES = int(os.getenv('YOUTUBE_MAX_RETRIES', 5))
+YOUTUBE_RETRY_BASE_DELAY = float(os.getenv('YOUTUBE_RETRY_BASE_DELAY', 1.0))
+# ETag response cache for Data API calls. BACKEND is 'disk', 'redis' or 'none'; LOCATION
+# is a directory for disk (defaulting to .youtube_cache) and a required URL for redis.
+# Bodies younger than a resource's TTL (seconds) are served without a request;
+# older ones are revalidated with If-None-Match.
+YOUTUBE_RESPONSE_CACHE = {
+    'BACKEND': os.getenv('YOUTUBE_RESPONSE_CACHE_BACKEND', 'disk'),
+    'LOCATION': os.getenv(
+        'YOUTUBE_RESPONSE_CACHE_LOCATION',
+        str(BASE_DIR / '.youtube_cache') if os.getenv('YOUTUBE_RESPONSE_CACHE_BACKEND', 'disk') == 'disk' else ''
+    ),
+    'MAX_BYTES': int(os.getenv('YOUTUBE_RESPONSE_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+    'TTLS': {
+        'channels.list': 60 * 60,
+        'playlists.list': 60 * 60,
+        'playlistItems.list': 0,
+        'videos.list': 0,
+    },
+}
+# Playlist pages fetched ahead of processing, and how many pages are processed at once
+YOUTUBE_PIPELINE_PREFETCH_PAGES = int(os.getenv('YOUTUBE_PIPELINE_PREFETCH_PAGES', 2))
+YOUTUBE_INGEST_MAX_IN_FLIGHT = int(os.getenv('YOUTUBE_INGEST_MAX_IN_FLIGHT', 1))
+YOUTUBE_REQUEST_TIMEOUT = int(os.getenv('YOUTUBE_REQUEST_TIMEOUT', 30))
+# Connection pool of the process-wide aiohttp session
+YOUTUBE_HTTP_POOL_SIZE = int(os.getenv('YOUTUBE_HTTP_POOL_SIZE', 100))
+YOUTUBE_HTTP_POOL_SIZE_PER_HOST = int(os.getenv('YOUTUBE_HTTP_POOL_SIZE_PER_HOST', 20))
+YOUTUBE_HTTP_DNS_CACHE_TTL = int(os.getenv('YOUTUBE_HTTP_DNS_CACHE_TTL', 300))
+YOUTUBE_HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('YOUTUBE_HTTP_KEEPALIVE_TIMEOUT', 30))
+YOUTUBE_PLAYLIST_MAX_VIDEOS = int(os.getenv('YOUTUBE_PLAYLIST_MAX_VIDEOS', 500))
+# Concurrent 50-ID videos.list calls during metric refreshes, and rows per bulk write
+YOUTUBE_REFRESH_CONCURRENCY = int(os.getenv('YOUTUBE_REFRESH_CONCURRENCY', 8))
+YOUTUBE_BULK_BATCH_SIZE = int(os.getenv('YOUTUBE_BULK_BATCH_SIZE', 500))
+# Metric snapshot tiers: (max video age in hours, hours between snapshots), youngest first.
+# A max age of None covers every older video.
+YOUTUBE_SNAPSHOT_TIERS = [
+    (48, 1),
+    (24 * 30, 24),
+    (None, 24 * 7),
+]
+YOUTUBE_SNAPSHOT_BUDGET_UNITS = int(os.getenv('YOUTUBE_SNAPSHOT_BUDGET_UNITS', 200))
+YOUTUBE_SNAPSHOT_INTERVAL = int(os.getenv('YOUTUBE_SNAPSHOT_INTERVAL', 15 * 60))
+# Transcript fetches run on their own thread pool, separate from ORM writes
+YOUTUBE_TRANSCRIPT_WORKERS = int(os.getenv('YOUTUBE_TRANSCRIPT_WORKERS', 8))
+YOUTUBE_TRANSCRIPT_CONCURRENCY = int(os.getenv('YOUTUBE_TRANSCRIPT_CONCURRENCY', 8))
+YOUTUBE_TRANSCRIPT_LANGUAGES = os.getenv('YOUTUBE_TRANSCRIPT_LANGUAGES', 'en').split(',')
+# How long "subtitles disabled" / "no transcript" results are remembered (seconds)
+YOUTUBE_TRANSCRIPT_NEGATIVE_TTL = int(os.getenv('YOUTUBE_TRANSCRIPT_NEGATIVE_TTL', 7 * 24 * 60 * 60))
+
+# Transcript content is stored gzip-compressed (1-9); downloads are streamed in chunks of this many bytes
+YOUTUBE_TRANSCRIPT_COMPRESSION_LEVEL = int(os.getenv('YOUTUBE_TRANSCRIPT_COMPRESSION_LEVEL', 6))
+YOUTUBE_TRANSCRIPT_DOWNLOAD_CHUNK_SIZE = int(os.getenv('YOUTUBE_TRANSCRIPT_DOWNLOAD_CHUNK_SIZE', 64 * 1024))
+
+# PostgreSQL text search configuration for the transcript search vector (changing it needs rebuild_transcript_search)
+YOUTUBE_TRANSCRIPT_SEARCH_CONFIG = os.getenv('YOUTUBE_TRANSCRIPT_SEARCH_CONFIG', 'english')
+
+# Largest page a client can request with ?page_size= on paginated endpoints
+YOUTUBE_API_MAX_PAGE_SIZE = int(os.getenv('YOUTUBE_API_MAX_PAGE_SIZE', 100))
+
+# Rows fetched per server-side cursor round trip by the streaming channel export
+YOUTUBE_EXPORT_CHUNK_SIZE = int(os.getenv('YOUTUBE_EXPORT_CHUNK_SIZE', 2000))
+
+# Near-duplicate transcript detection: MinHash signature size and LSH bands (permutations must be a
+# multiple of bands; changing either needs `manage.py index_transcript_minhash`), and the default
+# estimated Jaccard similarity above which two transcripts count as duplicates
+YOUTUBE_MINHASH_PERMUTATIONS = int(os.getenv('YOUTUBE_MINHASH_PERMUTATIONS', 128))
+YOUTUBE_MINHASH_BANDS = int(os.getenv('YOUTUBE_MINHASH_BANDS', 16))
+YOUTUBE_DUPLICATE_THRESHOLD = float(os.getenv('YOUTUBE_DUPLICATE_THRESHOLD', 0.8))
+
+# Monthly range partitioning of VideoMetrics (PostgreSQL only), applied by migration 0005 or
+# `manage.py metrics_partitions --convert`, and how many future months to keep created
+YOUTUBE_METRICS_PARTITIONING = os.getenv('YOUTUBE_METRICS_PARTITIONING', '0') == '1'
+YOUTUBE_METRICS_PARTITIONS_AHEAD = int(os.getenv('YOUTUBE_METRICS_PARTITIONS_AHEAD', 3))
+
+# Analytics response cache (youtube/api/analytics_cache.py) in the 'analytics' cache alias.
+# Entries are invalidated by per-channel data versions bumped on ingest; with
+# STALE_WHILE_REVALIDATE the previous response is served while a new one is computed in
+# the background. Channels requested WARM_MIN_HITS times within WARM_WINDOW seconds get
+# their recently requested URLs (up to WARM_MAX_PATHS) recomputed after an ingest.
+# Only ENABLED with CACHE_BACKEND=redis: ingests run in the Celery worker, and version
+# bumps in a per-process cache would never reach the web processes.
+YOUTUBE_ANALYTICS_CACHE = {
+    'ENABLED': os.getenv('CACHE_BACKEND', 'locmem') == 'redis',
+    'ALIAS': 'analytics',
+    'TIMEOUT': int(os.getenv('ANALYTICS_CACHE_TIMEOUT', 7 * 24 * 60 * 60)),
+    'STALE_WHILE_REVALIDATE': os.getenv('ANALYTICS_CACHE_SWR', '1') == '1',
+    'REVALIDATE_TIMEOUT': 60,
+    'WARM_MIN_HITS': int(os.getenv('ANALYTICS_CACHE_WARM_MIN_HITS', 5)),
+    'WARM_WINDOW': 60 * 60,
+    'WARM_MAX_PATHS': 10,
+}
+
+# Cold-start budget checked by `manage.py startup_benchmark --check` (milliseconds from
+# interpreter start), and client libraries that must stay out of the web/CLI import path
+STARTUP_BUDGET_READY_MS = int(os.getenv('STARTUP_BUDGET_READY_MS', 1500))
+STARTUP_BUDGET_FIRST_REQUEST_MS = int(os.getenv('STARTUP_BUDGET_FIRST_REQUEST_MS', 2000))
+STARTUP_LAZY_MODULES = ['googleapiclient', 'youtube_transcript_api', 'aiohttp', 'httplib2', 'numpy']
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -105,7 +207,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Rest Framework settings
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'youtube.api.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
@@ -117,8 +219,8 @@ REST_FRAMEWORK = {
 }
 
 # Redis settings (for Celery and caching)
-REDIS_HOST = 'localhost'
-REDIS_PORT = 6379
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
 REDIS_DB = 0
 
 # Celery settings
@@ -126,4 +228,44 @@ CELERY_BROKER_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}'
 CELERY_RESULT_BACKEND = f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
\ No newline at end of file
+CELERY_RESULT_SERIALIZER = 'json'
+# Run tasks inline (no broker/worker needed) for tests and local debugging
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', '0') == '1'
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_BEAT_SCHEDULE = {
+    'snapshot-video-metrics': {
+        'task': 'youtube.tasks.snapshot_metrics',
+        'schedule': YOUTUBE_SNAPSHOT_INTERVAL,
+    },
+    'maintain-metrics-partitions': {
+        'task': 'youtube.tasks.maintain_metrics_partitions',
+        'schedule': 24 * 60 * 60,
+    },
+}
+
+# Cache settings: Redis when CACHE_BACKEND=redis, per-process local memory otherwise.
+# Analytics responses get their own cache so they can't evict quota counters and the like;
+# with local memory the analytics cache is off (see YOUTUBE_ANALYTICS_CACHE).
+REDIS_CACHE_DB = int(os.getenv('REDIS_CACHE_DB', 1))
+REDIS_ANALYTICS_CACHE_DB = int(os.getenv('REDIS_ANALYTICS_CACHE_DB', 2))
+if os.getenv('CACHE_BACKEND', 'locmem') == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_CACHE_DB}',
+        },
+        'analytics': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_ANALYTICS_CACHE_DB}',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'analytics': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'analytics',
+        },
+    }
@@ -1,47 +1,35 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action 
 from rest_framework.response import Response
-from django.db.models import Avg, Count, Sum
-from django.db.models.functions import TruncDate, Extract
-from ..models import Channel, Video, VideoMetrics
+from django.conf import settings
+from ..models import Channel, Video, VideoMetricsRollup
+from ..services.analytics_cache import VIDEO_CHANNEL_KEY, get_analytics_cache
+from ..services.terms import PERIODS, term_trends
+from .analytics_cache import CachedAnalyticsMixin, cached_analytics
+from .pagination import VIDEO_ORDERING
 from .analytics_serializers import ChannelAnalyticsSerializer, VideoAnalyticsSerializer
 
+MAX_QUERY_TERMS = 20
 
-class ChannelAnalyticsViewSet(viewsets.ModelViewSet):
-    queryset = Channel.objects.all()
+
+class ChannelAnalyticsViewSet(CachedAnalyticsMixin, viewsets.ModelViewSet):
+    # Aggregates come from the denormalized ChannelStats row, joined on its primary key
+    queryset = Channel.objects.select_related('stats').order_by('pk')
     serializer_class = ChannelAnalyticsSerializer
+    keyset_ordering = ('id',)
+
+    def analytics_channel_id(self, pk):
+        return pk
+
+    def instance_channel_id(self, instance):
+        return instance.pk
     
     @action(detail=True, methods=['get'])
+    @cached_analytics
     def metrics(self, request, pk=None):
         try:
             channel = self.get_object()
-            
-            data = {
-                'youtube_id': channel.youtube_id,
-                'title': channel.title,
-                'video_count': channel.videos.count(),
-                'publishing_dates': list(
-                    channel.videos.annotate(
-                        date=TruncDate('published_at')
-                    ).values('date').annotate(
-                        count=Count('id')
-                    ).order_by('date')
-                ),
-                'top_videos': list(
-                    channel.videos.order_by('-view_count')[:5].values(
-                        'youtube_id',
-                        'title', 
-                        'view_count', 
-                        'like_count', 
-                        'published_at'
-                    )
-                ),
-                'created_at': channel.created_at,
-                'updated_at': channel.updated_at
-            }
-            
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
+            serializer = self.get_serializer(channel)
             return Response(serializer.data)
             
         except Channel.DoesNotExist:
@@ -50,21 +38,95 @@ class ChannelAnalyticsViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-class VideoAnalyticsViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'])
+    @cached_analytics
+    def terms(self, request, pk=None):
+        """
+        How often the channel's transcripts mention terms over time, and its rising terms.
+
+        Query params: q (comma-separated words or phrases), period (week|month|year,
+        default month), recent (periods compared against the earlier ones, default 3)
+        and limit (rising terms returned, default 20, max 100).
+        """
+        period = request.query_params.get('period', 'month')
+        if period not in PERIODS:
+            return Response(
+                {'error': f"period must be one of: {', '.join(PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        terms = [term for term in request.query_params.get('q', '').split(',') if term.strip()]
+        if len(terms) > MAX_QUERY_TERMS:
+            return Response(
+                {'error': f"At most {MAX_QUERY_TERMS} terms can be queried at once"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            channel_id = int(pk)
+            recent = int(request.query_params.get('recent', 3))
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+            if recent < 1 or limit < 0:
+                raise ValueError('recent must be positive and limit non-negative')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not Channel.objects.filter(pk=channel_id).exists():
+            return Response(
+                {'error': 'Channel not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        trends = term_trends(channel_id, terms, period=period, recent=recent, rising_limit=limit)
+        return Response({'channel': channel_id, **trends})
+
+class VideoAnalyticsViewSet(CachedAnalyticsMixin, viewsets.ModelViewSet):
     queryset = Video.objects.all()
     serializer_class = VideoAnalyticsSerializer
+    keyset_ordering = VIDEO_ORDERING
+
+    def analytics_channel_id(self, pk):
+        # Cached with the responses; ingests that move a video to another channel drop it
+        cache = get_analytics_cache()
+        key = VIDEO_CHANNEL_KEY.format(pk)
+        channel_id = cache.get(key)
+        if channel_id is None:
+            try:
+                channel_id = Video.objects.filter(pk=pk).values_list('channel_id', flat=True).first()
+            except ValueError:
+                return None
+            if channel_id is not None:
+                cache.set(key, channel_id, timeout=settings.YOUTUBE_ANALYTICS_CACHE['TIMEOUT'])
+        return channel_id
+
+    def instance_channel_id(self, instance):
+        return instance.channel_id
     
     @action(detail=True, methods=['get'])
+    @cached_analytics
     def metrics(self, request, pk=None):
+        """Video details with its metric history from the rollups (?granularity=day|week, default day)"""
+        granularity = request.query_params.get('granularity', VideoMetricsRollup.GRANULARITY_DAY)
+        if granularity not in dict(VideoMetricsRollup.GRANULARITY_CHOICES):
+            return Response(
+                {'error': f"granularity must be one of: {', '.join(dict(VideoMetricsRollup.GRANULARITY_CHOICES))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             video = self.get_object()
             
-            metrics_history = video.metrics.annotate(
-                date=TruncDate('captured_at')
-            ).values('date').annotate(
-                view_count=Avg('view_count'),
-                like_count=Avg('like_count')
-            ).order_by('date')
+            metrics_history = list(
+                video.rollups.filter(granularity=granularity).order_by('bucket').values(
+                    'bucket',
+                    'min_views',
+                    'max_views',
+                    'last_views',
+                    'view_delta',
+                    'min_likes',
+                    'max_likes',
+                    'last_likes',
+                    'like_delta',
+                    'samples'
+                )
+            )
             
             data = {
                 'youtube_id': video.youtube_id,
@@ -74,7 +136,9 @@ class VideoAnalyticsViewSet(viewsets.ModelViewSet):
                 'view_count': video.view_count,
                 'like_count': video.like_count,
                 'created_at': video.created_at,
-                'updated_at': video.updated_at
+                'updated_at': video.updated_at,
+                'granularity': granularity,
+                'history': metrics_history
             }
             
             serializer = self.get_serializer(data=data)
@@ -0,0 +1,200 @@
+"""
+Response cache for the analytics viewsets.
+
+Responses are cached per absolute URL together with the data version of their
+scope (a channel, or every channel for list endpoints). A request is served from
+the cache while the version is unchanged; after a write bumps it, the response
+is recomputed, or with stale-while-revalidate the old one is served while a
+background thread recomputes it. Hot channels are re-warmed after ingests.
+Everything is bypassed unless YOUTUBE_ANALYTICS_CACHE['ENABLED'] (a shared cache).
+"""
+import functools
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.db import connections
+from django.urls import resolve
+from rest_framework.response import Response
+from ..services.analytics_cache import (
+    ALL_SCOPE, VERSION_KEY, get_analytics_cache, get_versions, channel_scope, invalidate_channels
+)
+
+ENTRY_KEY = 'analytics:response:{}'
+REVALIDATING_KEY = 'analytics:revalidating:{}'
+HITS_KEY = 'analytics:hits:{}'
+URLS_KEY = 'analytics:urls:{}'
+# hit / stale / miss, for clients and load tests
+CACHE_HEADER = 'X-Analytics-Cache'
+
+_lock = threading.Lock()
+_revalidator = None
+
+
+def _get_revalidator() -> ThreadPoolExecutor:
+    global _revalidator
+    with _lock:
+        if _revalidator is None:
+            _revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix='analytics-revalidate')
+    return _revalidator
+
+
+def _store(key: str, version: int, data) -> None:
+    get_analytics_cache().set(
+        key, {'version': version, 'data': data}, timeout=settings.YOUTUBE_ANALYTICS_CACHE['TIMEOUT']
+    )
+
+
+def _record_request(scope: str, url: str) -> None:
+    """Count requests per scope and remember its recent URLs, for warming"""
+    config = settings.YOUTUBE_ANALYTICS_CACHE
+    cache = get_analytics_cache()
+    hits_key = HITS_KEY.format(scope)
+    cache.add(hits_key, 0, timeout=config['WARM_WINDOW'])
+    try:
+        cache.incr(hits_key)
+    except ValueError:
+        # Expired between add and incr
+        pass
+    urls = cache.get(URLS_KEY.format(scope)) or []
+    if url not in urls:
+        cache.set(URLS_KEY.format(scope), [url] + urls[:config['WARM_MAX_PATHS'] - 1], timeout=config['TIMEOUT'])
+
+
+def _revalidate(key: str, version: int, compute: Callable[[], Response]) -> None:
+    try:
+        response = compute()
+        if response.status_code == 200:
+            _store(key, version, response.data)
+    except Exception as e:
+        print(f"Error revalidating analytics cache: {str(e)}")
+    finally:
+        get_analytics_cache().delete(REVALIDATING_KEY.format(key))
+        connections.close_all()
+
+
+def cached_response(request, get_scope: Callable[[], Optional[str]], compute: Callable[[], Response]) -> Response:
+    """Serve a GET from the analytics cache, computing (and caching) it when its data version changed"""
+    if not settings.YOUTUBE_ANALYTICS_CACHE['ENABLED'] or request.method != 'GET':
+        return compute()
+    scope = get_scope()
+    if scope is None:
+        return compute()
+
+    cache = get_analytics_cache()
+    url = request.build_absolute_uri()
+    key = ENTRY_KEY.format(hashlib.sha256(f'{scope}|{url}'.encode()).hexdigest())
+    version_key = VERSION_KEY.format(scope)
+    found = cache.get_many([version_key, key])
+    version = found.get(version_key) or get_versions([scope])[scope]
+    entry = found.get(key)
+    warming = getattr(request._request, 'analytics_warming', False)
+    if not warming:
+        _record_request(scope, url)
+
+    if entry and entry['version'] == version:
+        return Response(entry['data'], headers={CACHE_HEADER: 'hit'})
+
+    if entry and settings.YOUTUBE_ANALYTICS_CACHE['STALE_WHILE_REVALIDATE'] and not warming:
+        if cache.add(REVALIDATING_KEY.format(key), True, timeout=settings.YOUTUBE_ANALYTICS_CACHE['REVALIDATE_TIMEOUT']):
+            _get_revalidator().submit(_revalidate, key, version, compute)
+        return Response(entry['data'], headers={CACHE_HEADER: 'stale'})
+
+    response = compute()
+    if response.status_code == 200:
+        _store(key, version, response.data)
+    response[CACHE_HEADER] = 'miss'
+    return response
+
+
+def cached_analytics(handler):
+    """Cache a viewset handler under the scope given by the viewset's analytics_scope(pk)"""
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            lambda: self.analytics_scope(kwargs.get('pk')),
+            lambda: handler(self, request, *args, **kwargs)
+        )
+    return wrapper
+
+
+class CachedAnalyticsMixin:
+    """
+    Caches list/retrieve (decorate extra actions with @cached_analytics) and
+    invalidates the affected channel on writes through the viewset.
+    """
+
+    def analytics_scope(self, pk) -> Optional[str]:
+        """Scope for a request: ALL_SCOPE for lists, the owning channel's scope for details"""
+        if pk is None:
+            return ALL_SCOPE
+        channel_id = self.analytics_channel_id(pk)
+        return channel_scope(channel_id) if channel_id is not None else None
+
+    def analytics_channel_id(self, pk) -> Optional[int]:
+        raise NotImplementedError
+
+    def instance_channel_id(self, instance) -> int:
+        raise NotImplementedError
+
+    @cached_analytics
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_analytics
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        invalidate_channels([self.instance_channel_id(serializer.instance)])
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_channels([self.instance_channel_id(serializer.instance)])
+
+    def perform_destroy(self, instance):
+        channel_id = self.instance_channel_id(instance)
+        super().perform_destroy(instance)
+        invalidate_channels([channel_id])
+
+
+def warm_channels(channel_ids: Iterable[int]) -> int:
+    """
+    Recompute the recently requested analytics URLs of hot channels (and of the
+    list endpoints) so the first dashboard request after an ingest is a hit.
+    Returns the number of URLs warmed.
+    """
+    from django.test import RequestFactory
+
+    config = settings.YOUTUBE_ANALYTICS_CACHE
+    if not config['ENABLED']:
+        return 0
+    cache = get_analytics_cache()
+    scopes = [channel_scope(channel_id) for channel_id in channel_ids] + [ALL_SCOPE]
+    hits = cache.get_many([HITS_KEY.format(scope) for scope in scopes])
+    factory = RequestFactory()
+
+    warmed = 0
+    for scope in scopes:
+        if hits.get(HITS_KEY.format(scope), 0) < config['WARM_MIN_HITS']:
+            continue
+        for url in cache.get(URLS_KEY.format(scope)) or []:
+            parts = urlsplit(url)
+            request = factory.get(
+                f"{parts.path}?{parts.query}" if parts.query else parts.path,
+                HTTP_HOST=parts.netloc,
+                HTTP_ACCEPT='application/json',
+                secure=parts.scheme == 'https'
+            )
+            request.analytics_warming = True
+            try:
+                match = resolve(parts.path)
+                match.func(request, *match.args, **match.kwargs)
+                warmed += 1
+            except Exception as e:
+                print(f"Error warming {url}: {str(e)}")
+    return warmed
@@ -1,7 +1,7 @@
+from django.db import models
 from rest_framework import serializers
-from ..models import Channel, Video, VideoMetrics, Transcript
-from django.db.models import Avg, Count, Sum
-from django.db.models.functions import TruncDate
+from ..models import Channel, ChannelStats, Video
+from ..services.channel_stats import rebuild_channel_stats
 
 class ChannelGrowthSerializer(serializers.ModelSerializer):
     total_videos = serializers.IntegerField()
@@ -35,54 +35,88 @@ class VideoEngagementSerializer(serializers.ModelSerializer):
             'latest_metrics'
         ]
         
+def _attach_stats(channels):
+    """
+    Cache each channel's ChannelStats row on it. Rows that don't exist yet are
+    built for the whole page in one go and saved, so the next request reads them.
+    """
+    missing = []
+    for channel in channels:
+        if hasattr(channel, '_analytics_stats'):
+            continue
+        try:
+            channel._analytics_stats = channel.stats
+        except ChannelStats.DoesNotExist:
+            missing.append(channel)
+    if missing:
+        built = {stats.channel_id: stats for stats in rebuild_channel_stats([channel.pk for channel in missing])}
+        for channel in missing:
+            channel._analytics_stats = built[channel.pk]
+
+
+class ChannelAnalyticsListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        channels = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        _attach_stats(channels)
+        return super().to_representation(channels)
+
+
 # youtube/api/analytics_serializers.py
 class ChannelAnalyticsSerializer(serializers.ModelSerializer):
+    stored_video_count = serializers.SerializerMethodField()
     total_view_count = serializers.SerializerMethodField()
+    total_like_count = serializers.SerializerMethodField()
     avg_view_count = serializers.SerializerMethodField()
+    last_upload_at = serializers.SerializerMethodField()
     publishing_dates = serializers.SerializerMethodField()
     top_videos = serializers.SerializerMethodField()
 
     class Meta:
         model = Channel
+        list_serializer_class = ChannelAnalyticsListSerializer
         fields = [
             'youtube_id',
             'title',
             'video_count',
+            'stored_video_count',
             'total_view_count',
+            'total_like_count',
             'avg_view_count',
+            'last_upload_at',
             'publishing_dates',
             'top_videos',
             'created_at',
             'updated_at'
         ]
 
+    def _stats(self, obj):
+        """The channel's ChannelStats row, built and saved first when it doesn't exist yet"""
+        _attach_stats([obj])
+        return obj._analytics_stats
+
+    def get_stored_video_count(self, obj):
+        return self._stats(obj).video_count
+
     def get_total_view_count(self, obj):
-        return obj.videos.aggregate(total_views=Sum('view_count'))['total_views'] or 0
+        return self._stats(obj).total_views
+
+    def get_total_like_count(self, obj):
+        return self._stats(obj).total_likes
 
     def get_avg_view_count(self, obj):
-        total_views = self.get_total_view_count(obj)
-        video_count = obj.videos.count()
-        return total_views / video_count if video_count else 0
+        return self._stats(obj).avg_views
+
+    def get_last_upload_at(self, obj):
+        return self._stats(obj).last_upload_at
 
     def get_publishing_dates(self, obj):
-        return list(
-            obj.videos.annotate(
-                date=TruncDate('published_at')
-            ).values('date').annotate(
-                count=Count('id')
-            ).order_by('date').values('date', 'count')
-        )
+        return [
+            {'date': date, 'count': count}
+            for date, count in sorted(self._stats(obj).publishing_dates.items())
+        ]
 
     def get_top_videos(self, obj):
-        return list(
-            obj.videos.order_by('-view_count')[:5].values(
-                'youtube_id',
-                'title', 
-                'view_count', 
-                'like_count', 
-                'published_at'
-            )
-        )
+        return self._stats(obj).top_videos
 
 
 class VideoAnalyticsSerializer(serializers.Serializer):
@@ -93,4 +127,6 @@ class VideoAnalyticsSerializer(serializers.Serializer):
     view_count = serializers.IntegerField()
     like_count = serializers.IntegerField()
     created_at = serializers.DateTimeField()
-    updated_at = serializers.DateTimeField()
\ No newline at end of file
+    updated_at = serializers.DateTimeField()
+    granularity = serializers.CharField(required=False)
+    history = serializers.ListField(child=serializers.DictField(), required=False)
@@ -0,0 +1,130 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with a WHERE on the ordering columns of the last row seen
+instead of an OFFSET, and no COUNT(*) is run, so every page costs one index
+range scan however deep it is. The ordering must end in a unique column (id)
+and use one direction throughout; each endpoint's ordering has a matching index.
+"""
+import base64
+import json
+from typing import List, Optional, Sequence
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+VIDEO_ORDERING = ('-published_at', '-id')
+METRICS_ORDERING = ('-captured_at', '-id')
+DEFAULT_ORDERING = ('-id',)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates by `view.keyset_ordering` (or the ordering passed to
+    paginate_queryset). Query params: cursor (opaque) and page_size (capped at
+    YOUTUBE_API_MAX_PAGE_SIZE).
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def paginate_queryset(self, queryset, request, view=None, ordering: Optional[Sequence[str]] = None):
+        self.request = request
+        self.ordering = tuple(ordering or getattr(view, 'keyset_ordering', DEFAULT_ORDERING))
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        descending = self.ordering[0].startswith('-')
+        if any(field.startswith('-') != descending for field in self.ordering):
+            raise ValueError('Keyset orderings must use a single direction')
+        page_size = self.get_page_size(request)
+        position, backwards = self.decode_cursor(request, queryset.model)
+
+        # Walking backwards flips the ordering and the comparison, then the page is reversed
+        walk_descending = descending != backwards
+        if position is not None:
+            queryset = queryset.filter(self._after(position, descending=walk_descending))
+        order = [f'-{field}' if walk_descending else field for field in self.fields]
+        rows = list(queryset.order_by(*order)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not backwards else True
+        self.has_previous = has_more if backwards else position is not None
+        return rows
+
+    def get_page_size(self, request) -> int:
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+            if requested > 0:
+                page_size = requested
+        except (KeyError, ValueError):
+            pass
+        return min(page_size, settings.YOUTUBE_API_MAX_PAGE_SIZE)
+
+    def _after(self, position: List, descending: bool) -> Q:
+        """Rows strictly after `position` in the ordering: a row-value comparison spelled out as ORs"""
+        lookup = 'lt' if descending else 'gt'
+        condition = Q()
+        for index, field in enumerate(self.fields):
+            equal = {name: value for name, value in zip(self.fields[:index], position[:index])}
+            condition |= Q(**equal, **{f'{field}__{lookup}': position[index]})
+        return condition
+
+    def _position(self, row) -> List:
+        return [row[field] if isinstance(row, dict) else getattr(row, field) for field in self.fields]
+
+    def encode_cursor(self, row, backwards: bool) -> str:
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in self._position(row)]
+        payload = json.dumps({'p': values, 'b': int(backwards)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(payload['p']) != len(self.fields):
+                raise ValueError('cursor does not match the ordering')
+            position = [
+                model._meta.get_field(field).to_python(value) for field, value in zip(self.fields, payload['p'])
+            ]
+            return position, bool(payload['b'])
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound('Invalid cursor')
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], backwards=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], backwards=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
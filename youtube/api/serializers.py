@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from ..models import Channel, Video, VideoMetrics, Transcript
+from ..models import Channel, Video, VideoMetrics, Transcript, IngestionJob
 
 class ChannelSerializer(serializers.ModelSerializer):
     class Meta:
@@ -23,4 +23,18 @@ class TranscriptSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transcript
         fields = '__all__'
-        read_only_fields = ('created_at',)
\ No newline at end of file
+        read_only_fields = ('created_at', 'content_size')
+
+class TranscriptListSerializer(serializers.ModelSerializer):
+    """Transcript metadata without content, for list pages"""
+    compressed_size = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Transcript
+        exclude = ('content',)
+        read_only_fields = ('created_at', 'content_size')
+
+class IngestionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IngestionJob
+        fields = '__all__'
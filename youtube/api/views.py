@@ -1,22 +1,34 @@
+import math
+from datetime import datetime, time
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Length
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.conf import settings
-from ..models import Channel, Video
-from .serializers import (
-    ChannelSerializer, VideoSerializer,
-    VideoMetricsSerializer, TranscriptSerializer
+from ..models import Channel, Video, VideoMetrics, Transcript, IngestionJob
+from ..services.analytics_cache import invalidate_channels
+from ..services.channel_stats import apply_video_changes
+from ..services.export import CONTENT_TYPES as EXPORT_CONTENT_TYPES, FORMATS as EXPORT_FORMATS, export_channel
+from ..services.minhash import duplicate_clusters, similar_videos
+from ..services.quota import QuotaExceeded, get_quota_usage
+from ..services.response_cache import get_response_cache_stats
+from ..services.rollups import apply_snapshots
+from ..services.search import search_transcripts
+from ..services.transcripts import (
+    compressed_content, create_transcripts, iter_chunks, iter_decompressed, segments_between, timestamps_for_hits
 )
-from rest_framework.decorators import api_view
-from ..services.youtube import YouTubeService
-from rest_framework.decorators import action
-from rest_framework.response import Response
-from ..models import Channel, Video, VideoMetrics, Transcript
+from ..tasks import ingest_channel, ingest_playlist
+from .pagination import METRICS_ORDERING, VIDEO_ORDERING
 from .serializers import (
     ChannelSerializer, VideoSerializer,
-    VideoMetricsSerializer, TranscriptSerializer
+    VideoMetricsSerializer, TranscriptSerializer,
+    TranscriptListSerializer, IngestionJobSerializer
 )
-from asgiref.sync import async_to_sync
 
 class PlaylistViewSet(viewsets.ViewSet):
     """
@@ -24,22 +36,23 @@ class PlaylistViewSet(viewsets.ViewSet):
     """
     @action(detail=False, methods=['post'], url_path='(?P<playlist_id>[^/.]+)')
     def process_playlist(self, request, playlist_id=None):
-        """Process a YouTube playlist and save its videos"""
+        """Queue a background job that processes a YouTube playlist and saves its videos"""
         try:
-            youtube_service = YouTubeService(settings.YOUTUBE_API_KEY)
-            videos = youtube_service.save_playlist_videos(playlist_id)
-            
-            serializer = VideoSerializer(videos, many=True)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            job = IngestionJob.objects.create(
+                kind=IngestionJob.KIND_PLAYLIST,
+                identifier=playlist_id
+            )
+            ingest_playlist.delay(job.id)
+            job.refresh_from_db()
             
-        except ValueError as e:
             return Response(
-                {'error': str(e)}, 
-                status=status.HTTP_404_NOT_FOUND
+                IngestionJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
             )
+            
         except Exception as e:
             return Response(
-                {'error': f'Failed to process playlist: {str(e)}'},
+                {'error': f'Failed to queue playlist: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
@@ -56,13 +69,19 @@ class ChannelViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            youtube_service = YouTubeService(settings.YOUTUBE_API_KEY)
-            # Use save_channel_with_videos instead of separate calls
-            channel = youtube_service.save_channel_with_videos(identifier)
+            # Import runs in the background; poll /api/jobs/<id>/ for progress.
+            # ?incremental=true only ingests new uploads and refreshes known ones.
+            incremental = request.query_params.get('incremental', '').lower() in ('1', 'true', 'yes')
+            job = IngestionJob.objects.create(
+                kind=IngestionJob.KIND_CHANNEL,
+                identifier=identifier
+            )
+            ingest_channel.delay(job.id, incremental=incremental)
+            job.refresh_from_db()
             
             return Response(
-                self.serializer_class(channel).data,
-                status=status.HTTP_201_CREATED
+                IngestionJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
             )
 
         except Exception as e:
@@ -71,12 +90,128 @@ class ChannelViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=True, methods=['post'])
+    def refresh_metrics(self, request, pk=None):
+        """Refresh view and like counts for all of a channel's videos in 50-ID batches"""
+        channel = self.get_object()
+        try:
+            from ..services.youtube import get_youtube_service
+
+            youtube_service = get_youtube_service()
+            refreshed = youtube_service.refresh_channel_metrics(channel)
+            
+            return Response(
+                {'channel': channel.id, 'refreshed': refreshed},
+                status=status.HTTP_200_OK
+            )
+            
+        except QuotaExceeded as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to refresh channel metrics: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     @action(detail=True, methods=['get'])
     def videos(self, request, pk=None):
         channel = self.get_object()
         videos = Video.objects.filter(channel=channel)
-        serializer = VideoSerializer(videos, many=True)
-        return Response(serializer.data)
+        page = self.paginator.paginate_queryset(videos, request, view=self, ordering=VIDEO_ORDERING)
+        serializer = VideoSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Stream all of the channel's videos as a file, in constant memory.
+
+        Query params: output (ndjson or csv, default ndjson) and metrics=1 to
+        include each video's VideoMetrics history. (Not `format`, which DRF
+        reserves for choosing a renderer.)
+        """
+        channel = self.get_object()
+        output_format = request.query_params.get('output', 'ndjson')
+        if output_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        include_metrics = request.query_params.get('metrics', '') in ('1', 'true')
+
+        response = StreamingHttpResponse(
+            export_channel(channel.id, output_format, include_metrics),
+            content_type=EXPORT_CONTENT_TYPES[output_format]
+        )
+        suffix = '-metrics' if include_metrics else ''
+        response['Content-Disposition'] = f'attachment; filename="{channel.youtube_id}-videos{suffix}.{output_format}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def duplicates(self, request, pk=None):
+        """
+        Clusters of near-duplicate transcripts involving this channel's videos
+        (re-uploads, clips, cross-posts), including copies on other channels.
+
+        Query params: threshold (estimated Jaccard similarity, 0-1).
+        """
+        channel = self.get_object()
+        try:
+            threshold = _parse_threshold(request.query_params.get('threshold'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        clusters = duplicate_clusters(channel.id, threshold)
+        return Response({'channel': channel.id, 'threshold': threshold, 'clusters': clusters})
+
+class QuotaViewSet(viewsets.ViewSet):
+    """
+    ViewSet reporting today's YouTube Data API quota usage.
+    """
+    def list(self, request):
+        return Response(get_quota_usage())
+
+class ResponseCacheViewSet(viewsets.ViewSet):
+    """
+    ViewSet reporting YouTube API response cache hit, miss and 304 counters.
+    """
+    def list(self, request):
+        return Response(get_response_cache_stats())
+
+class IngestionJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for polling background ingestion jobs.
+    """
+    queryset = IngestionJob.objects.all()
+    serializer_class = IngestionJobSerializer
+
+def _parse_moment(value):
+    """Parse an ISO date or datetime query param into an aware datetime (None when absent)"""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _parse_threshold(value):
+    """Similarity threshold query param (default YOUTUBE_DUPLICATE_THRESHOLD)"""
+    if value is None:
+        return settings.YOUTUBE_DUPLICATE_THRESHOLD
+    threshold = float(value)
+    if not 0 < threshold <= 1:
+        raise ValueError('threshold must be between 0 and 1')
+    return threshold
+
 
 class TranscriptViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -90,8 +225,126 @@ class TranscriptViewSet(viewsets.ReadOnlyModelViewSet):
         video_id = self.request.query_params.get('video_id', None)
         if video_id is not None:
             queryset = queryset.filter(video_id=video_id)
+        if self.action == 'list':
+            # Lists return metadata only; content is fetched per transcript via retrieve or download
+            queryset = queryset.defer('content').annotate(compressed_size=Length('content'))
         return queryset
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return TranscriptListSerializer
+        return TranscriptSerializer
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        Stream a transcript's text as a file. Clients that accept gzip get the stored
+        compressed bytes as they are; others get it decompressed chunk by chunk.
+        """
+        try:
+            found = compressed_content(self.get_queryset(), int(pk))
+        except ValueError:
+            found = None
+        if found is None:
+            return Response(
+                {'detail': 'Transcript not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        data, youtube_id, language = found
+        chunk_size = settings.YOUTUBE_TRANSCRIPT_DOWNLOAD_CHUNK_SIZE
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = StreamingHttpResponse(iter_chunks(data, chunk_size), content_type='text/plain; charset=utf-8')
+            response['Content-Encoding'] = 'gzip'
+            response['Content-Length'] = str(len(data))
+        else:
+            response = StreamingHttpResponse(
+                iter_decompressed(data, chunk_size), content_type='text/plain; charset=utf-8'
+            )
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response['Content-Disposition'] = f'attachment; filename="{youtube_id}.{language}.txt"'
+        return response
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over transcripts, best matches first.
+
+        Query params: q (required), channel, published_after, published_before
+        (ISO dates or datetimes), limit (default 20, max 100) and offset.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter q is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            channel_id = request.query_params.get('channel')
+            published_after = _parse_moment(request.query_params.get('published_after'))
+            published_before = _parse_moment(request.query_params.get('published_before'))
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+            offset = int(request.query_params.get('offset', 0))
+            if limit < 1 or offset < 0:
+                raise ValueError('limit must be positive and offset non-negative')
+            results = search_transcripts(
+                query,
+                channel_id=int(channel_id) if channel_id else None,
+                published_after=published_after,
+                published_before=published_before,
+                # One extra row tells whether there is a next page
+                limit=limit + 1,
+                offset=offset
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results, has_more = results[:limit], len(results) > limit
+        timestamps = timestamps_for_hits([result['id'] for result in results], query)
+        for result in results:
+            result['timestamps'] = timestamps.get(result['id'], [])
+
+        return Response({
+            'query': query,
+            'results': results,
+            'has_more': has_more,
+        })
+
+    @action(detail=True, methods=['get'])
+    def segments(self, request, pk=None):
+        """
+        Timed segments of a transcript overlapping a window, read from the segment index.
+
+        Query params: start and end in seconds (default: from the beginning to the end).
+        """
+        try:
+            transcript_id = int(pk)
+            start = float(request.query_params.get('start', 0))
+            end = request.query_params.get('end')
+            end = float(end) if end is not None else None
+            if not math.isfinite(start) or (end is not None and not math.isfinite(end)):
+                raise ValueError('start and end must be numbers of seconds')
+            if start < 0 or (end is not None and end <= start):
+                raise ValueError('start must be non-negative and end after start')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not self.get_queryset().filter(pk=transcript_id).exists():
+            return Response(
+                {'detail': 'Transcript not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({
+            'transcript': transcript_id,
+            'start': start,
+            'end': end,
+            'segments': segments_between(
+                transcript_id, round(start * 1000), round(end * 1000) if end is not None else None
+            ),
+        })
+
 # class VideoViewSet(viewsets.ReadOnlyModelViewSet):
 #     queryset = Video.objects.all()
 #     serializer_class = VideoSerializer
@@ -119,6 +372,7 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = Video.objects.all()
     serializer_class = VideoSerializer
+    keyset_ordering = VIDEO_ORDERING
 
     @action(detail=False, methods=['post'], url_path='add_by_id/(?P<youtube_id>[^/.]+)')
     def add_by_youtube_id(self, request, youtube_id=None):
@@ -146,13 +400,20 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
                     status=status.HTTP_200_OK
                 )
 
-            youtube_service = YouTubeService(settings.YOUTUBE_API_KEY)
+            # The YouTube client libraries are only loaded on the paths that call the API
+            from ..services.quota import api_execute
+            from ..services.youtube import get_youtube_service
+
+            youtube_service = get_youtube_service()
             
             # Get video details from YouTube API
-            video_response = youtube_service.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=youtube_id
-            ).execute()
+            video_response = api_execute(
+                youtube_service.youtube.videos().list(
+                    part="snippet,contentDetails,statistics",
+                    id=youtube_id
+                ),
+                'videos.list'
+            )
 
             if not video_response.get('items'):
                 return Response(
@@ -175,47 +436,71 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
                 }
             )
 
-            # Create video object
-            video = Video.objects.create(
-                youtube_id=youtube_id,
-                channel=channel,
-                title=video_data['snippet']['title'],
-                description=video_data['snippet']['description'],
-                published_at=video_data['snippet']['publishedAt'],
-                view_count=int(video_data['statistics'].get('viewCount', 0)),
-                like_count=int(video_data['statistics'].get('likeCount', 0)),
-                duration=youtube_service._parse_duration(video_data['contentDetails']['duration'])
-            )
-
-            # Create initial metrics record
-            VideoMetrics.objects.create(
-                video=video,
-                view_count=video.view_count,
-                like_count=video.like_count
-            )
+            with transaction.atomic():
+                # Create video object
+                video = Video.objects.create(
+                    youtube_id=youtube_id,
+                    channel=channel,
+                    title=video_data['snippet']['title'],
+                    description=video_data['snippet']['description'],
+                    published_at=video_data['snippet']['publishedAt'],
+                    view_count=int(video_data['statistics'].get('viewCount', 0)),
+                    like_count=int(video_data['statistics'].get('likeCount', 0)),
+                    duration=youtube_service._parse_duration(video_data['contentDetails']['duration'])
+                )
+                apply_video_changes([video], {})
+                invalidate_channels([channel.id])
 
-            # Attempt to fetch transcript asynchronously
-            async def fetch_transcript():
-                transcript_data = await youtube_service._fetch_transcript(youtube_id)
-                if transcript_data:
-                    Transcript.objects.create(
-                        video=video,
-                        **transcript_data
-                    )
+                # Create initial metrics record
+                apply_snapshots([VideoMetrics.objects.create(
+                    video=video,
+                    view_count=video.view_count,
+                    like_count=video.like_count
+                )])
 
-            async_to_sync(fetch_transcript)()
+            # Attempt to fetch transcript on the shared transcript executor
+            transcript_data = youtube_service.fetch_transcript(youtube_id)
+            if transcript_data:
+                create_transcripts([(video, transcript_data)])
 
             return Response(
                 self.serializer_class(video).data,
                 status=status.HTTP_201_CREATED
             )
 
+        except QuotaExceeded as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Videos whose transcripts are near-duplicates of this video's, most similar first.
+
+        Query params: threshold (estimated Jaccard similarity, 0-1) and limit (default 20, max 100).
+        """
+        video = self.get_object()
+        try:
+            threshold = _parse_threshold(request.query_params.get('threshold'))
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        videos = similar_videos(video.id, threshold, limit)
+        if videos is None:
+            return Response(
+                {'detail': 'No transcript signature for this video'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'video': video.id, 'threshold': threshold, 'similar': videos})
+
     @action(detail=True, methods=['get'])
     def transcript(self, request, pk=None):
         """
@@ -251,9 +536,10 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
         """
         video = self.get_object()
         try:
-            metrics = VideoMetrics.objects.filter(video=video).order_by('-captured_at')
-            serializer = VideoMetricsSerializer(metrics, many=True)
-            return Response(serializer.data)
+            metrics = VideoMetrics.objects.filter(video=video)
+            page = self.paginator.paginate_queryset(metrics, request, view=self, ordering=METRICS_ORDERING)
+            serializer = VideoMetricsSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         except VideoMetrics.DoesNotExist:
             return Response(
                 {'detail': 'No metrics found for this video'},
@@ -273,13 +559,20 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
         """
         video = self.get_object()
         try:
-            youtube_service = YouTubeService(settings.YOUTUBE_API_KEY)
+            # The YouTube client libraries are only loaded on the paths that call the API
+            from ..services.quota import api_execute
+            from ..services.youtube import get_youtube_service
+
+            youtube_service = get_youtube_service()
             
             # Get fresh video data
-            video_response = youtube_service.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=video.youtube_id
-            ).execute()
+            video_response = api_execute(
+                youtube_service.youtube.videos().list(
+                    part="snippet,contentDetails,statistics",
+                    id=video.youtube_id
+                ),
+                'videos.list'
+            )
 
             if not video_response.get('items'):
                 return Response(
@@ -289,35 +582,38 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
 
             video_data = video_response['items'][0]
             
-            # Update video metrics
-            video.view_count = int(video_data['statistics'].get('viewCount', 0))
-            video.like_count = int(video_data['statistics'].get('likeCount', 0))
-            video.save()
-
-            # Create new metrics record
-            VideoMetrics.objects.create(
-                video=video,
-                view_count=video.view_count,
-                like_count=video.like_count
-            )
+            with transaction.atomic():
+                # Update video metrics
+                previous = {video.youtube_id: (video.view_count, video.like_count)}
+                video.view_count = int(video_data['statistics'].get('viewCount', 0))
+                video.like_count = int(video_data['statistics'].get('likeCount', 0))
+                video.save()
+                apply_video_changes([video], previous)
+                invalidate_channels([video.channel_id])
 
-            # Try to update/fetch transcript if it doesn't exist
-            if not hasattr(video, 'transcript'):
-                async def fetch_transcript():
-                    transcript_data = await youtube_service._fetch_transcript(video.youtube_id)
-                    if transcript_data:
-                        Transcript.objects.create(
-                            video=video,
-                            **transcript_data
-                        )
+                # Create new metrics record
+                apply_snapshots([VideoMetrics.objects.create(
+                    video=video,
+                    view_count=video.view_count,
+                    like_count=video.like_count
+                )])
 
-                async_to_sync(fetch_transcript)()
+            # Try to update/fetch transcript if it doesn't exist
+            if not video.transcripts.exists():
+                transcript_data = youtube_service.fetch_transcript(video.youtube_id)
+                if transcript_data:
+                    create_transcripts([(video, transcript_data)])
 
             return Response(
                 self.serializer_class(video).data,
                 status=status.HTTP_200_OK
             )
 
+        except QuotaExceeded as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
         except Exception as e:
             return Response(
                 {'error': f'Failed to refresh video data: {str(e)}'},
@@ -337,4 +633,4 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
         if channel_id is not None:
             queryset = queryset.filter(channel__youtube_id=channel_id)
             
-        return queryset.order_by('-published_at')
\ No newline at end of file
+        return queryset.order_by(*VIDEO_ORDERING)
\ No newline at end of file
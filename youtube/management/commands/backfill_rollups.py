@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Video, VideoMetricsRollup
+from ...services.analytics_cache import invalidate_channels
+from ...services.rollups import GRANULARITIES, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild daily/weekly VideoMetrics rollups from raw snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument('videos', nargs='*', help="YouTube video IDs to rebuild (default: all videos)")
+        parser.add_argument(
+            '--granularity',
+            choices=dict(VideoMetricsRollup.GRANULARITY_CHOICES),
+            action='append',
+            help="Only rebuild these granularities"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.YOUTUBE_BULK_BATCH_SIZE,
+            help="Videos rebuilt per transaction"
+        )
+
+    def handle(self, *args, **options):
+        videos = Video.objects.order_by('pk')
+        if options['videos']:
+            videos = videos.filter(youtube_id__in=options['videos'])
+            missing = set(options['videos']) - set(videos.values_list('youtube_id', flat=True))
+            if missing:
+                raise CommandError(f"Unknown videos: {', '.join(sorted(missing))}")
+
+        granularities = options['granularity'] or GRANULARITIES
+        video_ids = list(videos.values_list('pk', 'channel_id'))
+        written = 0
+        for start in range(0, len(video_ids), options['batch_size']):
+            batch = video_ids[start:start + options['batch_size']]
+            written += rebuild_rollups([video_id for video_id, _ in batch], granularities)
+            invalidate_channels({channel_id for _, channel_id in batch})
+            self.stdout.write(f"  {min(start + len(batch), len(video_ids))}/{len(video_ids)} videos")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} {'/'.join(granularities)} rollups for {len(video_ids)} videos"
+        ))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Channel
+from ...services.minhash import duplicate_clusters
+
+
+class Command(BaseCommand):
+    help = "Report clusters of near-duplicate transcripts involving a channel's videos"
+
+    def add_arguments(self, parser):
+        parser.add_argument('channel', help="YouTube channel ID")
+        parser.add_argument('--threshold', type=float, help="Estimated Jaccard similarity (default YOUTUBE_DUPLICATE_THRESHOLD)")
+
+    def handle(self, *args, **options):
+        channel = Channel.objects.filter(youtube_id=options['channel']).first()
+        if channel is None:
+            raise CommandError(f"Unknown channel: {options['channel']}")
+
+        clusters = duplicate_clusters(channel.id, options['threshold'])
+        for number, cluster in enumerate(clusters, 1):
+            self.stdout.write(
+                f"Cluster {number}: {len(cluster['videos'])} videos, "
+                f"similarity {cluster['min_similarity']:.2f}-{cluster['max_similarity']:.2f}"
+            )
+            for video in cluster['videos']:
+                marker = ' ' if video['channel_id'] == channel.id else '*'
+                self.stdout.write(f"  {marker} {video['youtube_id']}  {video['published_at']:%Y-%m-%d}  {video['title']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(clusters)} clusters for {channel.title} (* = video on another channel)"
+        ))
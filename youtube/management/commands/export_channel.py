@@ -0,0 +1,32 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Channel
+from ...services.export import FORMATS, export_channel
+
+
+class Command(BaseCommand):
+    help = "Stream a channel's videos (optionally with their metrics history) to a file or stdout as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('channel', help="YouTube channel ID")
+        parser.add_argument('--output-format', choices=FORMATS, default='ndjson', help="Default: ndjson")
+        parser.add_argument('--metrics', action='store_true', help="Include each video's VideoMetrics history")
+        parser.add_argument('--output', '-o', help="File to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        channel = Channel.objects.filter(youtube_id=options['channel']).first()
+        if channel is None:
+            raise CommandError(f"Unknown channel: {options['channel']}")
+
+        chunks = export_channel(channel.id, options['output_format'], options['metrics'])
+        if options['output']:
+            written = 0
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+                    written += len(chunk)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Channel, MinHashBucket, Transcript, TranscriptSignature
+from ...services.analytics_cache import invalidate_channels
+from ...services.minhash import index_transcript_signatures
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures and LSH buckets of stored transcripts for near-duplicate detection"
+
+    def add_arguments(self, parser):
+        parser.add_argument('channels', nargs='*', help="YouTube channel IDs to index (default: all channels)")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help="Transcripts decompressed and signed per batch"
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help="Delete the signatures of the indexed channels (every signature without channels) first; "
+                 "needed after changing the MinHash settings"
+        )
+
+    def handle(self, *args, **options):
+        transcripts = Transcript.objects.select_related('video').order_by('pk')
+        if options['channels']:
+            known = set(Channel.objects.filter(youtube_id__in=options['channels']).values_list('youtube_id', flat=True))
+            missing = set(options['channels']) - known
+            if missing:
+                raise CommandError(f"Unknown channels: {', '.join(sorted(missing))}")
+            transcripts = transcripts.filter(video__channel__youtube_id__in=options['channels'])
+
+        if options['rebuild']:
+            signatures = TranscriptSignature.objects.all()
+            buckets = MinHashBucket.objects.all()
+            if options['channels']:
+                signatures = signatures.filter(video__channel__youtube_id__in=options['channels'])
+                buckets = buckets.filter(video__channel__youtube_id__in=options['channels'])
+            buckets.delete()
+            signatures.delete()
+
+        total = transcripts.count()
+        indexed = 0
+        done = 0
+        last_id = 0
+        while True:
+            batch = list(transcripts.filter(pk__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            indexed += index_transcript_signatures((transcript.video, transcript.content) for transcript in batch)
+            invalidate_channels({transcript.video.channel_id for transcript in batch})
+            done += len(batch)
+            last_id = batch[-1].pk
+            self.stdout.write(f"  {done}/{total} transcripts")
+
+        self.stdout.write(self.style.SUCCESS(f"Signed {indexed} transcripts ({done - indexed} had no words)"))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Channel, Transcript
+from ...services.analytics_cache import invalidate_channels
+from ...services.terms import index_transcript_terms
+
+
+class Command(BaseCommand):
+    help = "Tokenize stored transcripts into the per-video term counts used by the term trends endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument('channels', nargs='*', help="YouTube channel IDs to index (default: all channels)")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help="Transcripts decompressed and tokenized per batch"
+        )
+
+    def handle(self, *args, **options):
+        transcripts = Transcript.objects.select_related('video').order_by('pk')
+        if options['channels']:
+            known = set(Channel.objects.filter(youtube_id__in=options['channels']).values_list('youtube_id', flat=True))
+            missing = set(options['channels']) - known
+            if missing:
+                raise CommandError(f"Unknown channels: {', '.join(sorted(missing))}")
+            transcripts = transcripts.filter(video__channel__youtube_id__in=options['channels'])
+
+        total = transcripts.count()
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = list(transcripts.filter(pk__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            indexed += index_transcript_terms((transcript.video, transcript.content) for transcript in batch)
+            invalidate_channels({transcript.video.channel_id for transcript in batch})
+            last_id = batch[-1].pk
+            self.stdout.write(f"  {indexed}/{total} transcripts")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed terms of {indexed} transcripts"))
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from ...services import partitions
+
+
+class Command(BaseCommand):
+    help = "Maintain monthly VideoMetrics partitions on PostgreSQL (create upcoming months, convert, detach old ones)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=settings.YOUTUBE_METRICS_PARTITIONS_AHEAD,
+            help="Future months to keep created"
+        )
+        parser.add_argument('--convert', action='store_true', help="Partition the table if it isn't already")
+        parser.add_argument('--detach-before', metavar='YYYY-MM', help="Detach monthly partitions older than this month")
+        parser.add_argument('--list', action='store_true', help="List partitions with estimated row counts")
+
+    def handle(self, *args, **options):
+        if not partitions.is_postgres(connection):
+            self.stdout.write(f"VideoMetrics partitioning needs PostgreSQL; nothing to do on {connection.vendor}")
+            return
+
+        if options['convert']:
+            if partitions.convert_to_partitioned(connection, options['ahead']):
+                self.stdout.write(self.style.SUCCESS("Converted VideoMetrics to monthly partitions"))
+            else:
+                self.stdout.write("VideoMetrics is already partitioned")
+
+        if not partitions.is_partitioned(connection):
+            raise CommandError("VideoMetrics isn't partitioned; run with --convert or set YOUTUBE_METRICS_PARTITIONING=1 before migrating")
+
+        created = partitions.ensure_partitions(connection, options['ahead'])
+        for name in created:
+            self.stdout.write(self.style.SUCCESS(f"Created {name}"))
+
+        if options['detach_before']:
+            try:
+                month = datetime.strptime(options['detach_before'], '%Y-%m').replace(tzinfo=timezone.utc)
+            except ValueError:
+                raise CommandError("--detach-before must look like YYYY-MM")
+            for name in partitions.detach_partitions_before(month, connection):
+                self.stdout.write(self.style.WARNING(f"Detached {name} (table kept)"))
+
+        if options['list']:
+            for name, bounds, rows in partitions.list_partitions(connection):
+                self.stdout.write(f"{name:40} {rows:>12} rows  {bounds}")
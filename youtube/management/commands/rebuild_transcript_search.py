@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from ...models import Transcript
+from ...services.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the transcript full-text search index and reindex every transcript"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help="Transcripts decompressed and indexed per query")
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(Transcript.objects, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} transcripts"))
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from ...models import Channel, ChannelStats
+from ...services.analytics_cache import invalidate_channels
+from ...services.channel_stats import STATS_FIELDS, rebuild_channel_stats
+
+# Fields compared to report drift (updated_at always changes)
+COMPARED_FIELDS = [field for field in STATS_FIELDS if field != 'updated_at']
+
+
+class Command(BaseCommand):
+    help = "Rebuild ChannelStats from the stored videos and report channels whose stats had drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('channels', nargs='*', help="YouTube channel IDs to rebuild (default: all channels)")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.YOUTUBE_BULK_BATCH_SIZE,
+            help="Channels rebuilt per transaction"
+        )
+
+    def handle(self, *args, **options):
+        channels = Channel.objects.order_by('pk')
+        if options['channels']:
+            channels = channels.filter(youtube_id__in=options['channels'])
+            missing = set(options['channels']) - set(channels.values_list('youtube_id', flat=True))
+            if missing:
+                raise CommandError(f"Unknown channels: {', '.join(sorted(missing))}")
+
+        channel_ids = list(channels.values_list('pk', flat=True))
+        drifted = 0
+        for start in range(0, len(channel_ids), options['batch_size']):
+            batch = channel_ids[start:start + options['batch_size']]
+            with transaction.atomic():
+                before = ChannelStats.objects.select_for_update().in_bulk(batch)
+                for stats in rebuild_channel_stats(batch):
+                    old = before.get(stats.channel_id)
+                    if old is None or any(
+                        _normalized(getattr(old, field)) != _normalized(getattr(stats, field))
+                        for field in COMPARED_FIELDS
+                    ):
+                        drifted += 1
+                invalidate_channels(batch)
+            self.stdout.write(f"  {min(start + len(batch), len(channel_ids))}/{len(channel_ids)} channels")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt stats for {len(channel_ids)} channels ({drifted} missing or out of date)"
+        ))
+
+
+def _normalized(value):
+    # Floats are recomputed from the totals, so compare them rounded
+    return round(value, 6) if isinstance(value, float) else value
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Channel
+
+
+class Command(BaseCommand):
+    help = "Refresh view and like counts for all videos of one or more channels"
+
+    def add_arguments(self, parser):
+        parser.add_argument('channels', nargs='*', help="YouTube channel IDs to refresh")
+        parser.add_argument('--all', action='store_true', help="Refresh every stored channel")
+
+    def handle(self, *args, **options):
+        if options['all']:
+            channels = Channel.objects.all()
+        elif options['channels']:
+            channels = Channel.objects.filter(youtube_id__in=options['channels'])
+            missing = set(options['channels']) - set(channels.values_list('youtube_id', flat=True))
+            if missing:
+                raise CommandError(f"Unknown channels: {', '.join(sorted(missing))}")
+        else:
+            raise CommandError("Pass one or more channel IDs, or --all")
+
+        from ...services.youtube import get_youtube_service
+
+        youtube_service = get_youtube_service()
+        for channel in channels:
+            refreshed = youtube_service.refresh_channel_metrics(channel)
+            self.stdout.write(self.style.SUCCESS(f"{channel.title}: refreshed {refreshed} videos"))
@@ -0,0 +1,28 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Snapshot metrics for videos that are due in their age tier (use --loop to keep running)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget', type=int, default=None, help="API units to spend per run")
+        parser.add_argument('--loop', action='store_true', help="Keep running, one run per interval")
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.YOUTUBE_SNAPSHOT_INTERVAL,
+            help="Seconds between runs with --loop"
+        )
+
+    def handle(self, *args, **options):
+        from ...services.youtube import get_youtube_service
+
+        youtube_service = get_youtube_service()
+        while True:
+            snapshotted = youtube_service.snapshot_due_metrics(options['budget'])
+            self.stdout.write(self.style.SUCCESS(f"Snapshotted {snapshotted} videos"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
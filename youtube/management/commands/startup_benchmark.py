@@ -0,0 +1,147 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: set up Django, then either serve one request through the
+# WSGI handler (web) or load every youtube management command (cli). The API root is used
+# for the request because it resolves the whole URLconf without touching the database.
+SCENARIO_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+scenario = sys.argv[1]
+if scenario == 'web':
+    from wsgiref.util import setup_testing_defaults
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+    ready = time.perf_counter()
+    environ = {'PATH_INFO': '/api/', 'HTTP_HOST': 'localhost', 'HTTP_ACCEPT': 'application/json'}
+    setup_testing_defaults(environ)
+    statuses = []
+    b''.join(application(environ, lambda status, headers: statuses.append(status)))
+    status = statuses[0]
+else:
+    from django.core.management import get_commands, load_command_class
+    for name, app in get_commands().items():
+        if app == 'youtube':
+            load_command_class(app, name)
+    ready = time.perf_counter()
+    status = None
+done = time.perf_counter()
+print(json.dumps({
+    'ready_ms': (ready - start) * 1000,
+    'first_request_ms': (done - start) * 1000,
+    'status': status,
+    'lazy_modules_loaded': [m for m in sys.argv[2:] if m in sys.modules],
+}))
+"""
+
+SCENARIOS = ('web', 'cli')
+
+
+def _run(scenario: str, importtime: bool = False):
+    """Run a scenario in a new interpreter; return (measurements, wall ms, stderr)"""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', SCENARIO_SCRIPT, scenario] + list(settings.STARTUP_LAZY_MODULES)
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise CommandError(f"{scenario} scenario failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), wall_ms, result.stderr
+
+
+def _parse_importtime(stderr: str):
+    """Top-level imports from `-X importtime` output as (module, cumulative ms), slowest first"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under their parent; only count top-level ones
+        if not name.startswith('  '):
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda module: module[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start import time and time to first request, optionally against the startup budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters per scenario (median is reported)")
+        parser.add_argument('--top', type=int, default=15, help="Slowest top-level imports to list")
+        parser.add_argument('--scenario', choices=SCENARIOS, action='append', help="Only run these scenarios")
+        parser.add_argument('--check', action='store_true', help="Exit with an error when over budget")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        report = {}
+        for scenario in options['scenario'] or SCENARIOS:
+            runs = [_run(scenario) for _ in range(options['runs'])]
+            profile, _, stderr = _run(scenario, importtime=True)
+            report[scenario] = {
+                'runs': len(runs),
+                'interpreter_ms': statistics.median(wall for _, wall, _ in runs),
+                'ready_ms': statistics.median(measured['ready_ms'] for measured, _, _ in runs),
+                'first_request_ms': statistics.median(measured['first_request_ms'] for measured, _, _ in runs),
+                'status': runs[0][0]['status'],
+                'lazy_modules_loaded': profile['lazy_modules_loaded'],
+                'slowest_imports': _parse_importtime(stderr)[:options['top']],
+            }
+
+        failures = self._check_budget(report)
+        if options['json']:
+            self.stdout.write(json.dumps({'scenarios': report, 'over_budget': failures}, indent=2))
+        else:
+            self._print_report(report)
+
+        if failures:
+            message = "Startup budget exceeded:\n  " + "\n  ".join(failures)
+            if options['check']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        elif not options['json']:
+            self.stdout.write(self.style.SUCCESS("Within startup budget"))
+
+    def _check_budget(self, report):
+        failures = []
+        for scenario, result in report.items():
+            # Budgets are measured from interpreter start, so add the time before django.setup()
+            startup_ms = result['interpreter_ms'] - result['first_request_ms']
+            if startup_ms + result['ready_ms'] > settings.STARTUP_BUDGET_READY_MS:
+                failures.append(
+                    f"{scenario}: ready after {startup_ms + result['ready_ms']:.0f}ms "
+                    f"(budget {settings.STARTUP_BUDGET_READY_MS}ms)"
+                )
+            if scenario == 'web':
+                if result['interpreter_ms'] > settings.STARTUP_BUDGET_FIRST_REQUEST_MS:
+                    failures.append(
+                        f"{scenario}: first response after {result['interpreter_ms']:.0f}ms "
+                        f"(budget {settings.STARTUP_BUDGET_FIRST_REQUEST_MS}ms)"
+                    )
+                if result['status'] and not result['status'].startswith('200'):
+                    failures.append(f"{scenario}: first request returned {result['status']}")
+            if result['lazy_modules_loaded']:
+                failures.append(f"{scenario}: imported {', '.join(result['lazy_modules_loaded'])} at startup")
+        return failures
+
+    def _print_report(self, report):
+        for scenario, result in report.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{scenario} ({result['runs']} runs, median)"))
+            self.stdout.write(f"  interpreter total:  {result['interpreter_ms']:.0f}ms")
+            self.stdout.write(f"  django ready:       {result['ready_ms']:.0f}ms")
+            if scenario == 'web':
+                self.stdout.write(f"  first response:     {result['first_request_ms']:.0f}ms ({result['status']})")
+            self.stdout.write("  slowest top-level imports (cumulative):")
+            for module, cumulative_ms in result['slowest_imports']:
+                self.stdout.write(f"    {cumulative_ms:8.1f}ms  {module}")
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BRIN_INDEX = 'videometrics_captured_brin'
+
+
+def add_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {BRIN_INDEX} ON youtube_videometrics USING brin (captured_at)")
+
+
+def remove_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {BRIN_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0003_ingestionjob_transcripts_failed'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='videometrics',
+            options={'verbose_name_plural': 'Video metrics'},
+        ),
+        migrations.AddIndex(
+            model_name='videometrics',
+            index=models.Index(fields=['video', 'captured_at'], name='videometrics_video_captured'),
+        ),
+        # The composite index leads with video_id, so the plain FK index is redundant
+        migrations.AlterField(
+            model_name='videometrics',
+            name='video',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='youtube.video'),
+        ),
+        # BRIN on captured_at (PostgreSQL only) for time-window scans across all videos
+        migrations.RunPython(add_brin_index, remove_brin_index),
+    ]
@@ -0,0 +1,90 @@
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+# The layout as of this migration, kept here so later changes to
+# youtube/services/partitions.py can't change what it does
+TABLE = 'youtube_videometrics'
+LEGACY_TABLE = 'youtube_videometrics_legacy'
+DEFAULT_PARTITION = 'youtube_videometrics_default'
+SEQUENCE = 'youtube_videometrics_id_seq'
+COMPOSITE_INDEX = 'videometrics_video_captured'
+BRIN_INDEX = 'videometrics_captured_brin'
+
+
+def _month_after(value: datetime) -> datetime:
+    index = value.year * 12 + value.month
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_video_metrics(apps, schema_editor):
+    """
+    Monthly range partitioning on PostgreSQL when YOUTUBE_METRICS_PARTITIONING is on.
+
+    Existing rows stay in the old table, attached as one partition covering
+    everything before next month (or the month after the newest row); later rows
+    go to the default partition until the maintain_metrics_partitions task
+    creates their monthly partitions.
+    """
+    connection = schema_editor.connection
+    if not settings.YOUTUBE_METRICS_PARTITIONING or connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid))",
+            [TABLE]
+        )
+        if cursor.fetchone()[0]:
+            return
+
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"SELECT max(captured_at), coalesce(max(id), 0) FROM {TABLE}")
+        latest, max_id = cursor.fetchone()
+        now = timezone.now()
+        boundary = datetime(now.year, now.month, 1, tzinfo=dt_timezone.utc)
+        if latest is not None:
+            boundary = max(boundary, _month_after(latest))
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+        for index in (f"{TABLE}_pkey", COMPOSITE_INDEX, BRIN_INDEX):
+            cursor.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_legacy")
+
+        cursor.execute(f"ALTER TABLE {LEGACY_TABLE} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        cursor.execute(f"ALTER TABLE {LEGACY_TABLE} ALTER COLUMN id DROP DEFAULT")
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}")
+        cursor.execute("SELECT setval(%s, %s, false)", [SEQUENCE, max_id + 1])
+
+        # PostgreSQL requires the partition key in unique constraints, hence the (id, captured_at) key
+        cursor.execute(f"""
+            CREATE TABLE {TABLE} (
+                id bigint NOT NULL DEFAULT nextval('{SEQUENCE}'),
+                view_count integer NOT NULL,
+                like_count integer NOT NULL,
+                captured_at timestamp with time zone NOT NULL,
+                video_id bigint NOT NULL REFERENCES youtube_video (id) DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY (id, captured_at)
+            ) PARTITION BY RANGE (captured_at)
+        """)
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY_TABLE} FOR VALUES FROM (MINVALUE) TO (%s)",
+            [boundary]
+        )
+        cursor.execute(f"CREATE INDEX {COMPOSITE_INDEX} ON {TABLE} (video_id, captured_at)")
+        cursor.execute(f"CREATE INDEX {BRIN_INDEX} ON {TABLE} USING brin (captured_at)")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0004_videometrics_timeseries_indexes'),
+    ]
+
+    operations = [
+        # Irreversible in place; a partitioned table works the same for the ORM
+        migrations.RunPython(partition_video_metrics, migrations.RunPython.noop),
+    ]
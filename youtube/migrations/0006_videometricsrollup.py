@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0005_videometrics_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoMetricsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=10)),
+                ('bucket', models.DateField()),
+                ('min_views', models.IntegerField()),
+                ('max_views', models.IntegerField()),
+                ('last_views', models.IntegerField()),
+                ('min_likes', models.IntegerField()),
+                ('max_likes', models.IntegerField()),
+                ('last_likes', models.IntegerField()),
+                ('open_views', models.IntegerField()),
+                ('open_likes', models.IntegerField()),
+                ('view_delta', models.IntegerField(default=0)),
+                ('like_delta', models.IntegerField(default=0)),
+                ('samples', models.IntegerField(default=0)),
+                ('last_captured_at', models.DateTimeField()),
+                ('video', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='youtube.video')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='videometricsrollup',
+            constraint=models.UniqueConstraint(fields=('video', 'granularity', 'bucket'), name='unique_video_rollup_bucket'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 500
+
+
+def backfill_channel_stats(apps, schema_editor):
+    """Build the rows of existing channels; ingests keep them current from here on"""
+    # Imported here so loading the migration doesn't import the services
+    from youtube.services.channel_stats import rebuild_channel_stats
+
+    Channel = apps.get_model('youtube', 'Channel')
+    channel_ids = list(Channel.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(channel_ids), BATCH_SIZE):
+        rebuild_channel_stats(channel_ids[start:start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0006_videometricsrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChannelStats',
+            fields=[
+                ('channel', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='youtube.channel')),
+                ('video_count', models.IntegerField(default=0)),
+                ('total_views', models.BigIntegerField(default=0)),
+                ('total_likes', models.BigIntegerField(default=0)),
+                ('avg_views', models.FloatField(default=0)),
+                ('last_upload_at', models.DateTimeField(blank=True, null=True)),
+                ('top_videos', models.JSONField(default=list)),
+                ('publishing_dates', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Channel stats',
+            },
+        ),
+        migrations.RunPython(backfill_channel_stats, migrations.RunPython.noop),
+    ]
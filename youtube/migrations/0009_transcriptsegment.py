@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0008_transcript_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_ms', models.PositiveIntegerField()),
+                ('duration_ms', models.PositiveIntegerField()),
+                ('text', models.TextField()),
+                ('transcript', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='segments', to='youtube.transcript')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['transcript', 'start_ms'], name='segment_transcript_start')],
+            },
+        ),
+    ]
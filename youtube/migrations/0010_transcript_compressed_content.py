@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.db import migrations, models
+import youtube.models
+
+TRANSCRIPT_TABLE = 'youtube_transcript'
+GIN_INDEX = 'transcript_search_gin'
+FTS_TABLE = 'youtube_transcript_fts'
+
+
+def drop_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+        schema_editor.execute(f"ALTER TABLE {TRANSCRIPT_TABLE} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def restore_plain_search(apps, schema_editor):
+    """The index of 0008, generated from the plain text column"""
+    config = settings.YOUTUBE_TRANSCRIPT_SEARCH_CONFIG
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"ALTER TABLE {TRANSCRIPT_TABLE} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{config}'::regconfig, coalesce(content, ''))) STORED"
+        )
+        schema_editor.execute(f"CREATE INDEX {GIN_INDEX} ON {TRANSCRIPT_TABLE} USING gin (search_vector)")
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"content, content='{TRANSCRIPT_TABLE}', content_rowid='id', tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TRANSCRIPT_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TRANSCRIPT_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF content ON {TRANSCRIPT_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); "
+            f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END"
+        )
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+    """
+    Schema for compressed transcripts, step 1 of 4: the new columns next to the
+    old ones. 0014 copies the data in batches, 0015 drops the old columns and
+    creates the new search index, 0016 fills it.
+    """
+
+    dependencies = [
+        ('youtube', '0009_transcriptsegment'),
+    ]
+
+    operations = [
+        # The old index is generated from the plain text column
+        migrations.RunPython(drop_search, restore_plain_search),
+        migrations.RenameField(
+            model_name='transcript',
+            old_name='content',
+            new_name='content_plain',
+        ),
+        # Nullable so that 0015 can be reversed on existing rows
+        migrations.AlterField(
+            model_name='transcript',
+            name='content_plain',
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='content',
+            field=youtube.models.CompressedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='content_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='transcriptsegment',
+            name='char_offset',
+            field=models.PositiveIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='transcriptsegment',
+            name='char_length',
+            field=models.PositiveIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='transcriptsegment',
+            name='text',
+            field=models.TextField(null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0010_transcript_compressed_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VideoTermCounts',
+            fields=[
+                ('video', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='term_counts', serialize=False, to='youtube.video')),
+                ('published_at', models.DateTimeField()),
+                ('total_terms', models.PositiveIntegerField()),
+                ('term_ids', models.BinaryField()),
+                ('counts', models.BinaryField()),
+                ('channel', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='youtube.channel')),
+            ],
+            options={
+                'verbose_name_plural': 'Video term counts',
+                'indexes': [models.Index(fields=['channel', 'published_at'], name='termcounts_channel_published')],
+            },
+        ),
+    ]
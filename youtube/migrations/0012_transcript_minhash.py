@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0011_term_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptSignature',
+            fields=[
+                ('video', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='youtube.video')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MinHashBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='youtube.video')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='minhashbucket_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('youtube', '0012_transcript_minhash'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='videometrics',
+            name='videometrics_video_captured',
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['published_at', 'id'], name='video_published_id'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['channel', 'published_at', 'id'], name='video_channel_published_id'),
+        ),
+        migrations.AddIndex(
+            model_name='videometrics',
+            index=models.Index(fields=['video', 'captured_at', 'id'], name='videometrics_video_captured'),
+        ),
+    ]
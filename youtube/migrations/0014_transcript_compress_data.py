@@ -0,0 +1,80 @@
+from collections import defaultdict
+from django.db import migrations, transaction
+
+# Transcripts compressed per transaction; each is up to a few hundred KB with
+# a few thousand segments
+BATCH_SIZE = 50
+SEGMENT_BATCH_SIZE = 1000
+
+
+def _batches(Transcript, fields):
+    last_id = 0
+    while True:
+        batch = list(Transcript.objects.filter(pk__gt=last_id).order_by('pk').only(*fields)[:BATCH_SIZE])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].pk
+
+
+def _segments(TranscriptSegment, batch, fields):
+    segments = defaultdict(list)
+    for segment in TranscriptSegment.objects.filter(transcript_id__in=[transcript.pk for transcript in batch]).order_by('pk').only('transcript', *fields):
+        segments[segment.transcript_id].append(segment)
+    return segments
+
+
+def compress_contents(apps, schema_editor):
+    """Compress each transcript and point its segments at their text in it"""
+    Transcript = apps.get_model('youtube', 'Transcript')
+    TranscriptSegment = apps.get_model('youtube', 'TranscriptSegment')
+    for batch in _batches(Transcript, ['content_plain']):
+        segments = _segments(TranscriptSegment, batch, ['text'])
+        updated = []
+        for transcript in batch:
+            transcript.content = transcript.content_plain
+            transcript.content_size = len(transcript.content_plain.encode('utf-8'))
+            position = 0
+            for segment in segments[transcript.pk]:
+                offset = transcript.content_plain.find(segment.text, position)
+                if offset < 0:
+                    segment.char_offset, segment.char_length = position, 0
+                else:
+                    segment.char_offset, segment.char_length = offset, len(segment.text)
+                    position = offset + len(segment.text)
+                updated.append(segment)
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Transcript.objects.bulk_update(batch, ['content', 'content_size'])
+            TranscriptSegment.objects.bulk_update(
+                updated, ['char_offset', 'char_length'], batch_size=SEGMENT_BATCH_SIZE
+            )
+
+
+def decompress_contents(apps, schema_editor):
+    Transcript = apps.get_model('youtube', 'Transcript')
+    TranscriptSegment = apps.get_model('youtube', 'TranscriptSegment')
+    for batch in _batches(Transcript, ['content']):
+        segments = _segments(TranscriptSegment, batch, ['char_offset', 'char_length'])
+        updated = []
+        for transcript in batch:
+            transcript.content_plain = transcript.content
+            for segment in segments[transcript.pk]:
+                segment.text = transcript.content[segment.char_offset:segment.char_offset + segment.char_length]
+                updated.append(segment)
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Transcript.objects.bulk_update(batch, ['content_plain'])
+            TranscriptSegment.objects.bulk_update(updated, ['text'], batch_size=SEGMENT_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    """Compressed transcripts, step 2 of 4: the batched data copy (see 0010)"""
+    # Each batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('youtube', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(compress_contents, decompress_contents),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+import youtube.models
+
+TRANSCRIPT_TABLE = 'youtube_transcript'
+GIN_INDEX = 'transcript_search_gin'
+FTS_TABLE = 'youtube_transcript_fts'
+
+
+def create_search(apps, schema_editor):
+    """
+    A search index the application fills in (the database can't read the compressed
+    column): a plain tsvector column on PostgreSQL, a standalone FTS5 table on SQLite.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f"ALTER TABLE {TRANSCRIPT_TABLE} ADD COLUMN search_vector tsvector")
+        schema_editor.execute(f"CREATE INDEX {GIN_INDEX} ON {TRANSCRIPT_TABLE} USING gin (search_vector)")
+    elif vendor == 'sqlite':
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(content, tokenize='porter unicode61')")
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TRANSCRIPT_TABLE} BEGIN "
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END"
+        )
+
+
+def drop_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+        schema_editor.execute(f"ALTER TABLE {TRANSCRIPT_TABLE} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == 'sqlite':
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    """Compressed transcripts, step 3 of 4: drop the plain text columns (see 0010)"""
+
+    dependencies = [
+        ('youtube', '0014_transcript_compress_data'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='transcript',
+            name='content_plain',
+        ),
+        migrations.AlterField(
+            model_name='transcript',
+            name='content',
+            field=youtube.models.CompressedTextField(),
+        ),
+        migrations.RemoveField(
+            model_name='transcriptsegment',
+            name='text',
+        ),
+        # After the table rebuilds above, which would drop the SQLite trigger
+        migrations.RunPython(create_search, drop_search),
+    ]
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import migrations, transaction
+
+# Transcripts indexed per transaction
+BATCH_SIZE = 200
+TRANSCRIPT_TABLE = 'youtube_transcript'
+FTS_TABLE = 'youtube_transcript_fts'
+
+
+def index_contents(apps, schema_editor):
+    """Index existing transcripts from their decompressed content"""
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        sql = (
+            f"UPDATE {TRANSCRIPT_TABLE} SET search_vector = "
+            f"to_tsvector('{settings.YOUTUBE_TRANSCRIPT_SEARCH_CONFIG}'::regconfig, %s) WHERE id = %s"
+        )
+    elif connection.vendor == 'sqlite':
+        sql = f"INSERT INTO {FTS_TABLE}(content, rowid) VALUES (%s, %s)"
+    else:
+        return
+
+    Transcript = apps.get_model('youtube', 'Transcript')
+    last_id = 0
+    while True:
+        batch = list(Transcript.objects.filter(pk__gt=last_id).order_by('pk').only('content')[:BATCH_SIZE])
+        if not batch:
+            return
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.executemany(sql, [(transcript.content, transcript.pk) for transcript in batch])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+    """Compressed transcripts, step 4 of 4: fill the search index (see 0010)"""
+    # Each batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('youtube', '0015_transcript_drop_plain_content'),
+    ]
+
+    operations = [
+        # Reversing 0015 drops the index with its rows
+        migrations.RunPython(index_contents, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+import gzip
+from django.conf import settings
+from django.db import models, transaction
 
 class Channel(models.Model):
     youtube_id = models.CharField(max_length=255, unique=True)
@@ -24,28 +26,252 @@ class Video(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Keyset pagination orders by (published_at, id), across all videos or within a channel
+        indexes = [
+            models.Index(fields=['published_at', 'id'], name='video_published_id'),
+            models.Index(fields=['channel', 'published_at', 'id'], name='video_channel_published_id'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.youtube_id})"
 
+class ChannelStats(models.Model):
+    """Per-channel aggregates over stored videos, kept current by services/channel_stats.py"""
+    channel = models.OneToOneField(Channel, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    video_count = models.IntegerField(default=0)
+    total_views = models.BigIntegerField(default=0)
+    total_likes = models.BigIntegerField(default=0)
+    avg_views = models.FloatField(default=0)
+    last_upload_at = models.DateTimeField(null=True, blank=True)
+    # [{youtube_id, title, view_count, like_count, published_at}], most viewed first
+    top_videos = models.JSONField(default=list)
+    # {"YYYY-MM-DD": uploads that day}
+    publishing_dates = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Channel stats"
+
+    def __str__(self):
+        return f"Stats for {self.channel_id}"
+
 class VideoMetrics(models.Model):
-    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='metrics')
+    # Time series: (video, captured_at) replaces the FK index and serves per-video history;
+    # BRIN and optional monthly partitions on PostgreSQL live in services/partitions.py.
+    # No default ordering, so unordered scans and aggregates skip the sort.
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='metrics', db_index=False)
     view_count = models.IntegerField()
     like_count = models.IntegerField()
     captured_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name_plural = "Video metrics"
-        ordering = ['-captured_at']
+        indexes = [
+            models.Index(fields=['video', 'captured_at', 'id'], name='videometrics_video_captured'),
+        ]
 
     def __str__(self):
         return f"Metrics for {self.video.title} at {self.captured_at}"
 
+class VideoMetricsRollup(models.Model):
+    """Per-day or per-week summary of a video's snapshots, maintained by services/rollups.py"""
+    GRANULARITY_DAY = 'day'
+    GRANULARITY_WEEK = 'week'
+    GRANULARITY_CHOICES = [
+        (GRANULARITY_DAY, 'Day'),
+        (GRANULARITY_WEEK, 'Week'),
+    ]
+
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='rollups', db_index=False)
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    # First day of the bucket (UTC); weeks start on Monday
+    bucket = models.DateField()
+    min_views = models.IntegerField()
+    max_views = models.IntegerField()
+    last_views = models.IntegerField()
+    min_likes = models.IntegerField()
+    max_likes = models.IntegerField()
+    last_likes = models.IntegerField()
+    # Closing values of the previous bucket (or the bucket's first snapshot); deltas are last - open
+    open_views = models.IntegerField()
+    open_likes = models.IntegerField()
+    view_delta = models.IntegerField(default=0)
+    like_delta = models.IntegerField(default=0)
+    samples = models.IntegerField(default=0)
+    last_captured_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['video', 'granularity', 'bucket'], name='unique_video_rollup_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} rollup for {self.video_id} at {self.bucket}"
+
+class CompressedTextField(models.BinaryField):
+    """
+    Text stored gzip-compressed and decoded transparently on load.
+
+    gzip rather than a bare zlib stream so the stored bytes can be sent as-is
+    with Content-Encoding: gzip.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        return gzip.decompress(bytes(value)).decode('utf-8')
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, str):
+            value = gzip.compress(
+                value.encode('utf-8'), compresslevel=settings.YOUTUBE_TRANSCRIPT_COMPRESSION_LEVEL, mtime=0
+            )
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
 class Transcript(models.Model):
     video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='transcripts')
-    content = models.TextField()
+    content = CompressedTextField()
+    # Uncompressed UTF-8 size of content, so listings don't need to load it
+    content_size = models.PositiveIntegerField(default=0)
     language = models.CharField(max_length=10)
     is_generated = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Transcript for {self.video.title} ({self.language})"
\ No newline at end of file
+        return f"Transcript for {self.video.title} ({self.language})"
+
+    def save(self, *args, **kwargs):
+        self.content_size = len(self.content.encode('utf-8'))
+        super().save(*args, **kwargs)
+
+class TranscriptSegment(models.Model):
+    """
+    One timed caption entry of a transcript; times are milliseconds from the start
+    of the video. Its text is the span [char_offset, char_offset + char_length) of
+    the transcript's content, so it is only stored once, compressed.
+    """
+    transcript = models.ForeignKey(Transcript, on_delete=models.CASCADE, related_name='segments', db_index=False)
+    start_ms = models.PositiveIntegerField()
+    duration_ms = models.PositiveIntegerField()
+    char_offset = models.PositiveIntegerField()
+    char_length = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['transcript', 'start_ms'], name='segment_transcript_start'),
+        ]
+
+    def __str__(self):
+        return f"Segment of transcript {self.transcript_id} at {self.start_ms}ms"
+
+class Term(models.Model):
+    """Vocabulary of the term-count matrix: one row per distinct word or n-gram"""
+    text = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.text
+
+class VideoTermCounts(models.Model):
+    """
+    One row of a channel's sparse term-count matrix, built from the video's
+    transcript at ingest by services/terms.py. term_ids and counts are packed
+    little-endian uint32 arrays of equal length, sorted by term id.
+    """
+    video = models.OneToOneField(Video, on_delete=models.CASCADE, primary_key=True, related_name='term_counts')
+    channel = models.ForeignKey(Channel, on_delete=models.CASCADE, related_name='+', db_index=False)
+    # Copied from the video so a channel's rows load in time order from one index
+    published_at = models.DateTimeField()
+    total_terms = models.PositiveIntegerField()
+    term_ids = models.BinaryField()
+    counts = models.BinaryField()
+
+    class Meta:
+        verbose_name_plural = "Video term counts"
+        indexes = [
+            models.Index(fields=['channel', 'published_at'], name='termcounts_channel_published'),
+        ]
+
+    def __str__(self):
+        return f"Term counts for video {self.video_id}"
+
+class TranscriptSignature(models.Model):
+    """MinHash signature of a video's transcript: packed little-endian uint32 values, one per permutation"""
+    video = models.OneToOneField(Video, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f"Signature of video {self.video_id}"
+
+class MinHashBucket(models.Model):
+    """LSH band bucket of a signature; videos sharing any bucket are near-duplicate candidates"""
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='+')
+    # Hash of the band number and the band's signature values
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['bucket'], name='minhashbucket_bucket'),
+        ]
+
+    def __str__(self):
+        return f"Bucket {self.bucket} of video {self.video_id}"
+
+class IngestionJob(models.Model):
+    KIND_CHANNEL = 'channel'
+    KIND_PLAYLIST = 'playlist'
+    KIND_CHOICES = [
+        (KIND_CHANNEL, 'Channel'),
+        (KIND_PLAYLIST, 'Playlist'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    identifier = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    channel = models.ForeignKey(Channel, on_delete=models.SET_NULL, null=True, blank=True, related_name='ingestion_jobs')
+    pages_fetched = models.IntegerField(default=0)
+    videos_saved = models.IntegerField(default=0)
+    transcripts_found = models.IntegerField(default=0)
+    transcripts_failed = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} job for {self.identifier} ({self.status})"
+
+    def record_progress(self, pages=0, videos=0, transcripts=0, transcripts_failed=0, errors=None):
+        """Atomically add to the progress counters and append any error messages"""
+        IngestionJob.objects.filter(pk=self.pk).update(
+            pages_fetched=models.F('pages_fetched') + pages,
+            videos_saved=models.F('videos_saved') + videos,
+            transcripts_found=models.F('transcripts_found') + transcripts,
+            transcripts_failed=models.F('transcripts_failed') + transcripts_failed,
+        )
+        if errors:
+            with transaction.atomic():
+                job = IngestionJob.objects.select_for_update().get(pk=self.pk)
+                job.errors = (job.errors or []) + list(errors)
+                job.save(update_fields=['errors'])
@@ -0,0 +1,32 @@
+from collections import defaultdict
+from typing import Dict, List
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber, TruncDate
+from ..models import Video
+
+TOP_VIDEOS = 5
+TOP_VIDEO_FIELDS = ('youtube_id', 'title', 'view_count', 'like_count', 'published_at')
+
+
+def top_videos_by_channel(channel_ids: List[int]) -> Dict[int, List[Dict]]:
+    """Most viewed videos of each channel (ties by youtube_id), in one query with ROW_NUMBER() per channel"""
+    top_videos = defaultdict(list)
+    ranked = Video.objects.filter(channel_id__in=channel_ids).annotate(
+        rank=Window(
+            RowNumber(), partition_by=F('channel_id'), order_by=[F('view_count').desc(), F('youtube_id').asc()]
+        )
+    ).filter(rank__lte=TOP_VIDEOS).order_by('channel_id', 'rank').values('channel_id', *TOP_VIDEO_FIELDS)
+    for video in ranked:
+        top_videos[video.pop('channel_id')].append(video)
+    return top_videos
+
+
+def publishing_dates_by_channel(channel_ids: List[int]) -> Dict[int, List[Dict]]:
+    """Uploads per day of each channel, in one grouped query"""
+    publishing_dates = defaultdict(list)
+    per_day = Video.objects.filter(channel_id__in=channel_ids).annotate(
+        date=TruncDate('published_at')
+    ).values('channel_id', 'date').annotate(count=Count('id')).order_by('channel_id', 'date')
+    for row in per_day:
+        publishing_dates[row['channel_id']].append({'date': row['date'], 'count': row['count']})
+    return publishing_dates
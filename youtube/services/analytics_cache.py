@@ -0,0 +1,66 @@
+"""
+Data versions for the analytics response cache (youtube/api/analytics_cache.py).
+
+Every channel has a version that write paths bump once their transaction commits.
+Cached analytics responses record the version they were computed at, so a
+response is current exactly when its version still matches. List endpoints span
+all channels and use the ALL_SCOPE version, which every bump also changes.
+"""
+import time
+from typing import Dict, Iterable, List
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+ALL_SCOPE = 'all'
+VERSION_KEY = 'analytics:version:{}'
+# Owning channel of a video, cached by the video analytics scope lookup
+VIDEO_CHANNEL_KEY = 'analytics:video-channel:{}'
+
+
+def get_analytics_cache():
+    return caches[settings.YOUTUBE_ANALYTICS_CACHE['ALIAS']]
+
+
+def channel_scope(channel_id) -> str:
+    return f'channel:{channel_id}'
+
+
+def new_version() -> int:
+    # Time-based rather than a counter, so a version key that gets evicted can never
+    # come back with a value some cached response was computed at
+    return time.time_ns()
+
+
+def get_versions(scopes: List[str]) -> Dict[str, int]:
+    """Current version of each scope, starting a version for scopes that have none"""
+    cache = get_analytics_cache()
+    keys = {scope: VERSION_KEY.format(scope) for scope in scopes}
+    found = cache.get_many(list(keys.values()))
+    versions = {}
+    for scope, key in keys.items():
+        if key not in found:
+            cache.add(key, new_version(), timeout=None)
+            found[key] = cache.get(key)
+        versions[scope] = found[key]
+    return versions
+
+
+def bump_versions(channel_ids: Iterable[int]) -> None:
+    version = new_version()
+    scopes = [channel_scope(channel_id) for channel_id in set(channel_ids)] + [ALL_SCOPE]
+    get_analytics_cache().set_many({VERSION_KEY.format(scope): version for scope in scopes}, timeout=None)
+
+
+def invalidate_channels(channel_ids: Iterable[int]) -> None:
+    """Bump the data version of channels that were written, once the current transaction commits"""
+    channel_ids = list(channel_ids)
+    if channel_ids:
+        transaction.on_commit(lambda: bump_versions(channel_ids))
+
+
+def forget_video_channels(video_ids: Iterable[int]) -> None:
+    """Drop the cached owning channel of videos that moved, once the current transaction commits"""
+    keys = [VIDEO_CHANNEL_KEY.format(video_id) for video_id in video_ids]
+    if keys:
+        transaction.on_commit(lambda: get_analytics_cache().delete_many(keys))
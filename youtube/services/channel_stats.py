@@ -0,0 +1,167 @@
+"""
+ChannelStats maintenance. Ingestion and refresh paths fold the videos they write
+into their channels' rows inside the same transaction; build/rebuild_channel_stats
+recompute rows from Video for new channels and for the reconcile command.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ..models import ChannelStats, Video
+from .analytics import TOP_VIDEOS, publishing_dates_by_channel, top_videos_by_channel
+
+STATS_FIELDS = [
+    'video_count', 'total_views', 'total_likes', 'avg_views',
+    'last_upload_at', 'top_videos', 'publishing_dates', 'updated_at',
+]
+
+
+def _published_at(value) -> datetime:
+    # Freshly created instances may still hold the API's ISO string
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+def _top_entry(youtube_id: str, title: str, view_count: int, like_count: int, published_at) -> Dict:
+    return {
+        'youtube_id': youtube_id,
+        'title': title,
+        'view_count': view_count,
+        'like_count': like_count,
+        'published_at': _published_at(published_at).isoformat(),
+    }
+
+
+def build_channel_stats(channel_ids: List[int]) -> List[ChannelStats]:
+    """Unsaved ChannelStats computed from Video, with three grouped queries for all the channels"""
+    totals = {
+        row['channel_id']: row
+        for row in Video.objects.filter(channel_id__in=channel_ids).values('channel_id').annotate(
+            video_count=Count('id'),
+            total_views=Sum('view_count'),
+            total_likes=Sum('like_count'),
+            last_upload_at=Max('published_at')
+        ).order_by()
+    }
+    top_videos = top_videos_by_channel(channel_ids)
+    publishing_dates = publishing_dates_by_channel(channel_ids)
+
+    stats = []
+    for channel_id in channel_ids:
+        row = totals.get(channel_id, {})
+        video_count = row.get('video_count', 0)
+        total_views = row.get('total_views') or 0
+        stats.append(ChannelStats(
+            channel_id=channel_id,
+            video_count=video_count,
+            total_views=total_views,
+            total_likes=row.get('total_likes') or 0,
+            avg_views=total_views / video_count if video_count else 0,
+            last_upload_at=row.get('last_upload_at'),
+            top_videos=[_top_entry(**video) for video in top_videos[channel_id]],
+            publishing_dates={day['date'].isoformat(): day['count'] for day in publishing_dates[channel_id]},
+            updated_at=timezone.now()
+        ))
+    return stats
+
+
+def rebuild_channel_stats(channel_ids: List[int]) -> List[ChannelStats]:
+    """Recompute and upsert the ChannelStats rows of some channels"""
+    stats = build_channel_stats(channel_ids)
+    ChannelStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=['channel'],
+        update_fields=STATS_FIELDS
+    )
+    return stats
+
+
+def apply_video_changes(videos: Iterable[Video], previous: Dict[str, Tuple[int, int]],
+                        previous_channels: Optional[Dict[str, int]] = None) -> None:
+    """
+    Fold written videos into their channels' ChannelStats rows.
+
+    `previous` maps youtube_id to the (view_count, like_count) stored before the
+    write; videos missing from it are counted as new uploads. `previous_channels`
+    maps youtube_id to the channel a video belonged to before the write; videos
+    that moved are subtracted from their old channel and counted as new uploads
+    on their current one. Call it inside the transaction that wrote the videos.
+    Channels without a row yet are built from scratch. Top videos are merged with
+    the written ones, so a top video that loses views keeps its place until the
+    next reconcile; channels that lost videos get their top list and last upload
+    re-read from Video.
+    """
+    previous_channels = previous_channels or {}
+    by_channel = defaultdict(list)
+    moved_from = defaultdict(list)
+    for video in videos:
+        by_channel[video.channel_id].append(video)
+        old_channel_id = previous_channels.get(video.youtube_id, video.channel_id)
+        if old_channel_id != video.channel_id:
+            moved_from[old_channel_id].append(video)
+    if not by_channel:
+        return
+
+    with transaction.atomic():
+        stats = ChannelStats.objects.select_for_update().in_bulk(sorted(set(by_channel) | set(moved_from)))
+        # Rebuilt rows already reflect the write, so only existing rows get deltas
+        missing = [channel_id for channel_id in by_channel if channel_id not in stats]
+        if missing:
+            rebuild_channel_stats(missing)
+
+        # Moves are rare, so the old channels' top lists and last uploads are simply re-read
+        losing = [channel_id for channel_id in moved_from if channel_id in stats]
+        old_top_videos = top_videos_by_channel(losing) if losing else {}
+        old_last_uploads = dict(
+            Video.objects.filter(channel_id__in=losing).values('channel_id').annotate(
+                last_upload_at=Max('published_at')
+            ).order_by().values_list('channel_id', 'last_upload_at')
+        ) if losing else {}
+
+        now = timezone.now()
+        for channel_id, channel_stats in stats.items():
+            top = {entry['youtube_id']: entry for entry in channel_stats.top_videos}
+            if channel_id in moved_from:
+                top = {video['youtube_id']: _top_entry(**video) for video in old_top_videos.get(channel_id, [])}
+                channel_stats.last_upload_at = old_last_uploads.get(channel_id)
+            for video in moved_from[channel_id]:
+                old_views, old_likes = previous[video.youtube_id]
+                channel_stats.video_count -= 1
+                channel_stats.total_views -= old_views
+                channel_stats.total_likes -= old_likes
+                day = _published_at(video.published_at).date().isoformat()
+                remaining = channel_stats.publishing_dates.get(day, 0) - 1
+                if remaining > 0:
+                    channel_stats.publishing_dates[day] = remaining
+                else:
+                    channel_stats.publishing_dates.pop(day, None)
+            for video in by_channel[channel_id]:
+                published_at = _published_at(video.published_at)
+                if video.youtube_id in previous and previous_channels.get(video.youtube_id, channel_id) == channel_id:
+                    old_views, old_likes = previous[video.youtube_id]
+                else:
+                    old_views, old_likes = 0, 0
+                    channel_stats.video_count += 1
+                    day = published_at.date().isoformat()
+                    channel_stats.publishing_dates[day] = channel_stats.publishing_dates.get(day, 0) + 1
+                channel_stats.total_views += video.view_count - old_views
+                channel_stats.total_likes += video.like_count - old_likes
+                if channel_stats.last_upload_at is None or published_at > channel_stats.last_upload_at:
+                    channel_stats.last_upload_at = published_at
+                top[video.youtube_id] = _top_entry(
+                    video.youtube_id, video.title, video.view_count, video.like_count, published_at
+                )
+
+            # Same order as top_videos_by_channel, so ties match a rebuild
+            channel_stats.top_videos = sorted(
+                top.values(), key=lambda entry: (-entry['view_count'], entry['youtube_id'])
+            )[:TOP_VIDEOS]
+            channel_stats.avg_views = (
+                channel_stats.total_views / channel_stats.video_count if channel_stats.video_count else 0
+            )
+            channel_stats.updated_at = now
+
+        ChannelStats.objects.bulk_update(list(stats.values()), STATS_FIELDS)
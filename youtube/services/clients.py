@@ -0,0 +1,113 @@
+"""
+Process-wide resources shared by every YouTubeService call: a background event
+loop for the async ingestion code, one pooled aiohttp session per event loop,
+per-thread httplib2 connections for googleapiclient, per-thread
+youtube_transcript_api clients and the transcript executor. Everything is
+created lazily (so forked Celery workers get their own) and torn down at
+interpreter exit.
+"""
+import asyncio
+import atexit
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
+import aiohttp
+import httplib2
+from django.conf import settings
+from youtube_transcript_api import YouTubeTranscriptApi
+
+_lock = threading.Lock()
+_loop = None
+_loop_thread = None
+_sessions = weakref.WeakKeyDictionary()
+_thread_local = threading.local()
+_transcript_executor = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """The long-lived event loop that runs ingestion coroutines"""
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name='youtube-loop', daemon=True)
+            _loop_thread.start()
+    return _loop
+
+
+def run_async(coroutine: Coroutine) -> Any:
+    """
+    Run a coroutine to completion on the shared loop from synchronous code.
+
+    Unlike async_to_sync, which spins up a fresh loop per call, this keeps the
+    loop (and with it the pooled HTTP session) alive between calls.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, get_event_loop()).result()
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Pooled keep-alive aiohttp session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.YOUTUBE_HTTP_POOL_SIZE,
+            limit_per_host=settings.YOUTUBE_HTTP_POOL_SIZE_PER_HOST,
+            ttl_dns_cache=settings.YOUTUBE_HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.YOUTUBE_HTTP_KEEPALIVE_TIMEOUT
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings.YOUTUBE_REQUEST_TIMEOUT)
+        )
+        _sessions[loop] = session
+    return session
+
+
+def get_thread_http() -> httplib2.Http:
+    """httplib2 connections aren't thread-safe, so each thread gets its own for the shared client"""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = _thread_local.http = httplib2.Http(timeout=settings.YOUTUBE_REQUEST_TIMEOUT)
+    return http
+
+
+def get_thread_transcript_api() -> YouTubeTranscriptApi:
+    """Per-thread transcript client; each holds its own requests session"""
+    api = getattr(_thread_local, 'transcript_api', None)
+    if api is None:
+        api = _thread_local.transcript_api = YouTubeTranscriptApi()
+    return api
+
+
+def get_transcript_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool reserved for youtube_transcript_api calls"""
+    global _transcript_executor
+    with _lock:
+        if _transcript_executor is None:
+            _transcript_executor = ThreadPoolExecutor(
+                max_workers=settings.YOUTUBE_TRANSCRIPT_WORKERS,
+                thread_name_prefix='transcripts'
+            )
+    return _transcript_executor
+
+
+@atexit.register
+def shutdown() -> None:
+    """Close pooled sessions, stop the background loop and the transcript executor"""
+    global _loop, _loop_thread, _transcript_executor
+    with _lock:
+        loop, thread, executor = _loop, _loop_thread, _transcript_executor
+        _loop = _loop_thread = _transcript_executor = None
+
+    if loop is not None:
+        session = _sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
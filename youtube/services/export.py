@@ -0,0 +1,105 @@
+"""
+Streaming export of a channel's videos, optionally with their VideoMetrics history.
+
+Rows are read with server-side cursors (.iterator(chunk_size=...)) as plain
+tuples and encoded as they arrive, so memory stays constant however many rows
+are exported. With metrics, videos (ordered by id) are merge-joined with
+their snapshots (ordered by video, captured_at) read from a second cursor.
+
+NDJSON writes one object per video, with a nested "metrics" list. CSV writes
+one row per video, or one row per snapshot with the video's columns repeated
+(videos without snapshots get one row with empty metric columns).
+"""
+import csv
+import json
+from typing import Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from ..models import Video, VideoMetrics
+
+FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+VIDEO_FIELDS = ('id', 'youtube_id', 'title', 'description', 'published_at', 'view_count', 'like_count', 'duration')
+METRIC_FIELDS = ('captured_at', 'view_count', 'like_count')
+# Encoded rows are collected into chunks of about this many bytes before being yielded
+BUFFER_SIZE = 64 * 1024
+
+
+def _value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _videos(channel_id: int) -> Iterator[Tuple]:
+    return Video.objects.filter(channel_id=channel_id).order_by('id').values_list(*VIDEO_FIELDS).iterator(
+        chunk_size=settings.YOUTUBE_EXPORT_CHUNK_SIZE
+    )
+
+
+def _with_metrics(channel_id: int, videos: Iterable[Tuple]) -> Iterator[Tuple[Tuple, List[Tuple]]]:
+    """Pair each video row with its snapshots, holding one video's history in memory at a time"""
+    snapshots = VideoMetrics.objects.filter(video__channel_id=channel_id).order_by(
+        'video_id', 'captured_at', 'id'
+    ).values_list('video_id', *METRIC_FIELDS).iterator(chunk_size=settings.YOUTUBE_EXPORT_CHUNK_SIZE)
+    pending = next(snapshots, None)
+    for video in videos:
+        history = []
+        # Skip snapshots of videos the video cursor didn't see (created mid-export)
+        while pending is not None and pending[0] < video[0]:
+            pending = next(snapshots, None)
+        while pending is not None and pending[0] == video[0]:
+            history.append(pending[1:])
+            pending = next(snapshots, None)
+        yield video, history
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(channel_id: int, include_metrics: bool) -> Iterator[str]:
+    if include_metrics:
+        for video, history in _with_metrics(channel_id, _videos(channel_id)):
+            record = {field: _value(value) for field, value in zip(VIDEO_FIELDS, video)}
+            record['metrics'] = [
+                {field: _value(value) for field, value in zip(METRIC_FIELDS, snapshot)} for snapshot in history
+            ]
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+    else:
+        for video in _videos(channel_id):
+            record = {field: _value(value) for field, value in zip(VIDEO_FIELDS, video)}
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def _csv_lines(channel_id: int, include_metrics: bool) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    if include_metrics:
+        yield writer.writerow(VIDEO_FIELDS + tuple(f'metric_{field}' for field in METRIC_FIELDS))
+        for video, history in _with_metrics(channel_id, _videos(channel_id)):
+            video = [_value(value) for value in video]
+            for snapshot in history or [(None,) * len(METRIC_FIELDS)]:
+                yield writer.writerow(video + [_value(value) for value in snapshot])
+    else:
+        yield writer.writerow(VIDEO_FIELDS)
+        for video in _videos(channel_id):
+            yield writer.writerow([_value(value) for value in video])
+
+
+def export_channel(channel_id: int, output_format: str, include_metrics: bool = False,
+                   buffer_size: Optional[int] = None) -> Iterator[bytes]:
+    """Encoded export of a channel, in chunks; the first chunk (the header for CSV) is yielded at once"""
+    if output_format not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    lines = (_ndjson_lines if output_format == 'ndjson' else _csv_lines)(channel_id, include_metrics)
+    buffer_size = buffer_size or BUFFER_SIZE
+
+    buffer, size, first = [], 0, True
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if first or size >= buffer_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size, first = [], 0, False
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
@@ -0,0 +1,251 @@
+"""
+Near-duplicate transcript detection with MinHash and LSH banding.
+
+Each transcript is reduced at ingest to a fixed-size MinHash signature over its
+word 5-grams; the fraction of equal signature values estimates the Jaccard
+similarity of two transcripts. The signature is cut into bands and every band
+is hashed to a MinHashBucket row, so candidates for a video are the videos
+sharing one of its buckets: a handful of index lookups whatever the corpus size.
+Candidates are then scored on their full signatures.
+"""
+import hashlib
+import zlib
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from ..models import MinHashBucket, TranscriptSignature, Video
+from .terms import tokenize
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SHINGLE_SIZE = 5
+# Mersenne prime modulus of the permutations (a * x + b) % PRIME; shingle hashes are reduced below it
+PRIME = (1 << 31) - 1
+# Shingles hashed per vectorized step, bounding the permutations x shingles work array
+SHINGLE_CHUNK_SIZE = 4096
+
+# Members of one LSH bucket that seed a comparison against the rest of the bucket; buckets
+# are compared in O(size * pivots) instead of O(size²) pairs
+MAX_BUCKET_PIVOTS = 8
+
+# Permutation coefficients, built on first use
+_A = _B = None
+
+
+def _coefficients(name: str) -> List[int]:
+    # Derived from a fixed hash rather than a RNG so signatures never change between releases
+    return [
+        int.from_bytes(hashlib.blake2b(f'{name}{index}'.encode(), digest_size=8).digest(), 'little') % (PRIME - 1) + 1
+        for index in range(settings.YOUTUBE_MINHASH_PERMUTATIONS)
+    ]
+
+
+def _permutations() -> Tuple['np.ndarray', 'np.ndarray']:
+    import numpy as np
+
+    global _A, _B
+    if _A is None:
+        _A = np.array(_coefficients('a'), dtype=np.uint64)[:, None]
+        _B = np.array(_coefficients('b'), dtype=np.uint64)[:, None]
+    return _A, _B
+
+
+def signature(text: str) -> Optional['np.ndarray']:
+    """MinHash signature (uint32 array) of a text's word shingles, or None for an empty text"""
+    import numpy as np
+
+    words = tokenize(text)
+    if not words:
+        return None
+    shingles = {' '.join(words[start:start + SHINGLE_SIZE]) for start in range(max(len(words) - SHINGLE_SIZE, 0) + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) % PRIME for shingle in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    a, b = _permutations()
+    minimums = np.full(settings.YOUTUBE_MINHASH_PERMUTATIONS, PRIME, dtype=np.uint64)
+    for start in range(0, len(hashes), SHINGLE_CHUNK_SIZE):
+        chunk = hashes[None, start:start + SHINGLE_CHUNK_SIZE]
+        # a, b and x are below 2**31, so a * x + b fits in 64 bits
+        np.minimum(minimums, ((a * chunk + b) % PRIME).min(axis=1), out=minimums)
+    return minimums.astype(np.uint32)
+
+
+def _band_count() -> int:
+    # Checked on use rather than at import, so a bad setting doesn't break every importer
+    if settings.YOUTUBE_MINHASH_PERMUTATIONS % settings.YOUTUBE_MINHASH_BANDS:
+        raise ImproperlyConfigured('YOUTUBE_MINHASH_PERMUTATIONS must be a multiple of YOUTUBE_MINHASH_BANDS')
+    return settings.YOUTUBE_MINHASH_BANDS
+
+
+def band_buckets(values: 'np.ndarray') -> List[int]:
+    """One bucket key per LSH band, salted with the band number so bands never collide"""
+    bands = values.astype('<u4').reshape(_band_count(), -1)
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band_number.to_bytes(2, 'little') + band.tobytes(), digest_size=8).digest(),
+            'little',
+            signed=True
+        )
+        for band_number, band in enumerate(bands)
+    ]
+
+
+def _unpack(data) -> 'np.ndarray':
+    import numpy as np
+
+    return np.frombuffer(bytes(data), dtype='<u4').astype(np.uint32)
+
+
+def index_transcript_signatures(items: Iterable[Tuple[Video, str]]) -> int:
+    """Store the signatures and LSH buckets of (video, transcript text) pairs, replacing earlier ones"""
+    signatures = []
+    for video, text in items:
+        values = signature(text)
+        if values is not None:
+            signatures.append((video, values))
+    if not signatures:
+        return 0
+
+    with transaction.atomic():
+        TranscriptSignature.objects.bulk_create(
+            [TranscriptSignature(video=video, signature=values.astype('<u4').tobytes()) for video, values in signatures],
+            update_conflicts=True,
+            unique_fields=['video'],
+            update_fields=['signature'],
+            batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+        )
+        MinHashBucket.objects.filter(video__in=[video for video, _ in signatures]).delete()
+        MinHashBucket.objects.bulk_create(
+            [
+                MinHashBucket(video=video, bucket=bucket)
+                for video, values in signatures
+                for bucket in band_buckets(values)
+            ],
+            batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+        )
+    return len(signatures)
+
+
+def _load_signatures(video_ids: Iterable[int]) -> Dict[int, 'np.ndarray']:
+    return {
+        video_id: _unpack(data)
+        for video_id, data in TranscriptSignature.objects.filter(video_id__in=list(video_ids)).values_list(
+            'video_id', 'signature'
+        )
+    }
+
+
+def _video_details(video_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    return {
+        video['id']: video
+        for video in Video.objects.filter(pk__in=list(video_ids)).values(
+            'id', 'youtube_id', 'title', 'channel_id', 'published_at'
+        )
+    }
+
+
+def similar_videos(video_id: int, threshold: Optional[float] = None, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+    """
+    Videos whose transcripts are estimated at least `threshold` similar to a
+    video's, most similar first. None when the video has no signature.
+    """
+    import numpy as np
+
+    threshold = settings.YOUTUBE_DUPLICATE_THRESHOLD if threshold is None else threshold
+    own = _load_signatures([video_id]).get(video_id)
+    if own is None:
+        return None
+
+    candidates = set(
+        MinHashBucket.objects.filter(bucket__in=band_buckets(own)).exclude(video_id=video_id).values_list(
+            'video_id', flat=True
+        )
+    )
+    signatures = _load_signatures(candidates)
+    if not signatures:
+        return []
+    ids = np.array(list(signatures), dtype=np.int64)
+    similarity = (np.stack(list(signatures.values())) == own).mean(axis=1)
+    keep = np.flatnonzero(similarity >= threshold)
+    keep = keep[np.argsort(-similarity[keep], kind='stable')][:limit]
+
+    details = _video_details(int(ids[index]) for index in keep)
+    return [
+        {**details[int(ids[index])], 'similarity': round(float(similarity[index]), 3)}
+        for index in keep
+        if int(ids[index]) in details
+    ]
+
+
+def duplicate_clusters(channel_id: int, threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Groups of near-duplicate videos involving a channel's videos, including copies
+    on other channels.
+
+    Videos sharing an LSH bucket are joined with union-find: each bucket's first
+    member is compared with the rest in one vectorized step, the members it
+    doesn't match seed the next comparison, up to MAX_BUCKET_PIVOTS per bucket.
+    Similarities are those of the verified pairs.
+    """
+    import numpy as np
+
+    threshold = settings.YOUTUBE_DUPLICATE_THRESHOLD if threshold is None else threshold
+    members = defaultdict(set)
+    for bucket, video_id in MinHashBucket.objects.filter(
+        bucket__in=MinHashBucket.objects.filter(video__channel_id=channel_id).values('bucket')
+    ).values_list('bucket', 'video_id'):
+        members[bucket].add(video_id)
+    shared = [sorted(videos) for videos in members.values() if len(videos) > 1]
+    if not shared:
+        return []
+
+    signatures = _load_signatures({video_id for videos in shared for video_id in videos})
+    ids = list(signatures)
+    position = {video_id: index for index, video_id in enumerate(ids)}
+    matrix = np.stack([signatures[video_id] for video_id in ids])
+    parent = list(range(len(ids)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    scores = {}
+    for videos in shared:
+        remaining = np.array([position[video_id] for video_id in videos if video_id in position])
+        for _ in range(MAX_BUCKET_PIVOTS):
+            if len(remaining) < 2:
+                break
+            pivot, others = remaining[0], remaining[1:]
+            similarity = (matrix[others] == matrix[pivot]).mean(axis=1)
+            matched = similarity >= threshold
+            for other, score in zip(others[matched], similarity[matched]):
+                scores[(int(pivot), int(other))] = float(score)
+                parent[find(int(other))] = find(int(pivot))
+            remaining = others[~matched]
+
+    edges = defaultdict(list)
+    for (pivot, _), score in scores.items():
+        edges[find(pivot)].append(score)
+    groups = defaultdict(list)
+    for index in range(len(ids)):
+        groups[find(index)].append(ids[index])
+
+    clustered = [(root, videos) for root, videos in groups.items() if len(videos) > 1]
+    details = _video_details(video_id for _, videos in clustered for video_id in videos)
+    clusters = [
+        {
+            'videos': sorted(
+                (details[video_id] for video_id in videos if video_id in details),
+                key=lambda video: video['published_at']
+            ),
+            'min_similarity': round(min(edges[root]), 3),
+            'max_similarity': round(max(edges[root]), 3),
+        }
+        for root, videos in clustered
+    ]
+    return sorted(clusters, key=lambda cluster: (-len(cluster['videos']), -cluster['max_similarity']))
@@ -0,0 +1,209 @@
+"""
+PostgreSQL storage layout for the VideoMetrics time series: a BRIN index on
+captured_at and optional monthly range partitioning. Every function is a no-op on
+other databases (SQLite in tests), which only get the (video, captured_at, id) index.
+"""
+import re
+from datetime import datetime, timezone as dt_timezone
+from typing import List, Optional, Tuple
+from django.conf import settings
+from django.db import connection as default_connection, transaction
+from django.utils import timezone
+
+TABLE = 'youtube_videometrics'
+# Rows that predate partitioning stay in the original table, attached as one partition
+LEGACY_TABLE = 'youtube_videometrics_legacy'
+DEFAULT_PARTITION = 'youtube_videometrics_default'
+SEQUENCE = 'youtube_videometrics_id_seq'
+COMPOSITE_INDEX = 'videometrics_video_captured'
+BRIN_INDEX = 'videometrics_captured_brin'
+
+
+def is_postgres(connection=None) -> bool:
+    return (connection or default_connection).vendor == 'postgresql'
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{TABLE}_{month:%Y_%m}"
+
+
+def create_brin_index(connection=None) -> None:
+    """BRIN on captured_at: a few pages of summaries cover years of append-only snapshots"""
+    connection = connection or default_connection
+    if not is_postgres(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {BRIN_INDEX} ON {TABLE} USING brin (captured_at)")
+
+
+def drop_brin_index(connection=None) -> None:
+    connection = connection or default_connection
+    if not is_postgres(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX IF EXISTS {BRIN_INDEX}")
+
+
+def is_partitioned(connection=None) -> bool:
+    connection = connection or default_connection
+    if not is_postgres(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid))",
+            [TABLE]
+        )
+        return cursor.fetchone()[0]
+
+
+def list_partitions(connection=None) -> List[Tuple[str, str, int]]:
+    """(name, bounds, estimated rows) of every VideoMetrics partition"""
+    connection = connection or default_connection
+    if not is_partitioned(connection):
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s ORDER BY c.relname",
+            [TABLE]
+        )
+        return cursor.fetchall()
+
+
+def _legacy_upper_bound(cursor) -> Optional[datetime]:
+    """Months before this bound are covered by the legacy partition"""
+    cursor.execute("SELECT pg_get_expr(relpartbound, oid) FROM pg_class WHERE relname = %s", [LEGACY_TABLE])
+    row = cursor.fetchone()
+    match = re.search(r"TO \('([^']+)'\)", row[0] or '') if row else None
+    return datetime.fromisoformat(match.group(1)) if match else None
+
+
+def _create_month(cursor, start: datetime) -> None:
+    """
+    Create one monthly partition. Rows that landed in the default partition for
+    that month (maintenance fell behind) are moved into it.
+    """
+    end = add_months(start, 1)
+    name = partition_name(start)
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE captured_at >= %s AND captured_at < %s)",
+        [start, end]
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)", [start, end])
+        return
+
+    cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)", [start, end])
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE captured_at >= %s AND captured_at < %s RETURNING *) "
+        f"INSERT INTO {TABLE} (id, view_count, like_count, captured_at, video_id) "
+        f"SELECT id, view_count, like_count, captured_at, video_id FROM moved",
+        [start, end]
+    )
+    cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+
+
+def ensure_partitions(connection=None, ahead: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+    """Create the monthly partitions from the current month through `ahead` months out"""
+    connection = connection or default_connection
+    if not is_partitioned(connection):
+        return []
+    ahead = settings.YOUTUBE_METRICS_PARTITIONS_AHEAD if ahead is None else ahead
+    current = month_start(now or timezone.now())
+    created = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        first = max(current, _legacy_upper_bound(cursor) or current)
+        for offset in range(ahead + 1):
+            start = add_months(current, offset)
+            if start < first:
+                continue
+            cursor.execute("SELECT to_regclass(%s)", [partition_name(start)])
+            if cursor.fetchone()[0] is None:
+                _create_month(cursor, start)
+                created.append(partition_name(start))
+    return created
+
+
+def detach_partitions_before(month: datetime, connection=None) -> List[str]:
+    """Detach (without dropping) monthly partitions that end on or before `month`, for archiving"""
+    connection = connection or default_connection
+    detached = []
+    for name, _, _ in list_partitions(connection):
+        match = re.fullmatch(rf"{TABLE}_(\d{{4}})_(\d{{2}})", name)
+        if not match:
+            continue
+        start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc)
+        if add_months(start, 1) <= month:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+            detached.append(name)
+    return detached
+
+
+def convert_to_partitioned(connection=None, ahead: Optional[int] = None) -> bool:
+    """
+    Turn youtube_videometrics into a table range-partitioned by month on captured_at.
+
+    Existing rows are not copied: the old table is renamed and attached as a single
+    partition covering everything before the month after its newest row. New
+    months get their own partitions, plus a default partition as a safety net.
+    The ID sequence carries over, and the primary key becomes (id, captured_at)
+    because PostgreSQL requires the partition key in unique constraints.
+    Returns False when there is nothing to do.
+    """
+    connection = connection or default_connection
+    if not is_postgres(connection) or is_partitioned(connection):
+        return False
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"SELECT max(captured_at), coalesce(max(id), 0) FROM {TABLE}")
+        latest, max_id = cursor.fetchone()
+        boundary = month_start(timezone.now())
+        if latest is not None:
+            boundary = max(boundary, add_months(month_start(latest), 1))
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+        for index in (f"{TABLE}_pkey", COMPOSITE_INDEX, BRIN_INDEX):
+            cursor.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_legacy")
+
+        # IDs come from a plain sequence owned by the parent rather than the old identity column
+        cursor.execute(f"ALTER TABLE {LEGACY_TABLE} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        cursor.execute(f"ALTER TABLE {LEGACY_TABLE} ALTER COLUMN id DROP DEFAULT")
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}")
+        cursor.execute("SELECT setval(%s, %s, false)", [SEQUENCE, max_id + 1])
+
+        cursor.execute(f"""
+            CREATE TABLE {TABLE} (
+                id bigint NOT NULL DEFAULT nextval('{SEQUENCE}'),
+                view_count integer NOT NULL,
+                like_count integer NOT NULL,
+                captured_at timestamp with time zone NOT NULL,
+                video_id bigint NOT NULL REFERENCES youtube_video (id) DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY (id, captured_at)
+            ) PARTITION BY RANGE (captured_at)
+        """)
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY_TABLE} FOR VALUES FROM (MINVALUE) TO (%s)",
+            [boundary]
+        )
+        # Created on the parent, these cascade to every partition (reusing matching legacy indexes)
+        cursor.execute(f"CREATE INDEX {COMPOSITE_INDEX} ON {TABLE} (video_id, captured_at, id)")
+        cursor.execute(f"CREATE INDEX {BRIN_INDEX} ON {TABLE} USING brin (captured_at)")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+    ensure_partitions(connection, ahead)
+    return True
@@ -0,0 +1,278 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.core.cache import cache
+from .response_cache import cache_key, get_response_cache, params_from_uri, record
+
+# Documented YouTube Data API v3 unit cost per call
+QUOTA_COSTS = {
+    'channels.list': 1,
+    'playlists.list': 1,
+    'playlistItems.list': 1,
+    'videos.list': 1,
+    'search.list': 100,
+}
+
+# Error reasons that mean the daily quota is gone; retrying won't help until the reset
+QUOTA_EXHAUSTED_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+# Error reasons and statuses worth retrying with backoff
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError'}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# The quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+QUOTA_CACHE_KEY = 'youtube:quota:{}'
+
+# aiohttp and googleapiclient are imported inside the request helpers so that read-only
+# views can import QuotaExceeded and get_quota_usage without loading the HTTP clients
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class QuotaExceeded(Exception):
+    """The daily YouTube Data API budget is used up"""
+
+
+class YouTubeAPIError(Exception):
+    """A YouTube Data API call failed with a non-retryable error or ran out of retries"""
+
+    def __init__(self, message: str, status: Optional[int] = None, reason: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by coroutines and executor threads.
+
+    Tokens refill at `rate` per second up to `capacity`; every API call takes one.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if available; otherwise return how long to wait for one"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self) -> None:
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+
+_bucket = None
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Process-wide rate limiter for YouTube Data API calls"""
+    global _bucket
+    if _bucket is None:
+        _bucket = TokenBucket(settings.YOUTUBE_API_RATE, settings.YOUTUBE_API_BURST)
+    return _bucket
+
+
+def _quota_key() -> str:
+    return QUOTA_CACHE_KEY.format(datetime.now(QUOTA_TIMEZONE).date().isoformat())
+
+
+def get_quota_usage() -> Dict[str, Any]:
+    """Units used and remaining against today's budget"""
+    used = cache.get(_quota_key(), 0)
+    budget = settings.YOUTUBE_DAILY_QUOTA
+    return {
+        'date': datetime.now(QUOTA_TIMEZONE).date().isoformat(),
+        'budget': budget,
+        'used': used,
+        'remaining': max(budget - used, 0),
+        'costs': QUOTA_COSTS,
+    }
+
+
+def charge_quota(resource: str) -> int:
+    """Charge a call's unit cost against today's budget, refusing calls that would exceed it"""
+    cost = QUOTA_COSTS.get(resource, 1)
+    key = _quota_key()
+    cache.add(key, 0, timeout=2 * 24 * 60 * 60)
+    used = cache.incr(key, cost)
+    if used > settings.YOUTUBE_DAILY_QUOTA:
+        cache.decr(key, cost)
+        raise QuotaExceeded(f"Daily YouTube API quota of {settings.YOUTUBE_DAILY_QUOTA} units used up")
+    return used
+
+
+def _mark_quota_exhausted() -> None:
+    """YouTube says the quota is gone, so stop spending until the reset"""
+    cache.set(_quota_key(), settings.YOUTUBE_DAILY_QUOTA, timeout=2 * 24 * 60 * 60)
+
+
+def _error_reason(payload: Any) -> Optional[str]:
+    try:
+        return payload['error']['errors'][0]['reason']
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _error_message(payload: Any, default: str) -> str:
+    try:
+        return payload['error']['message']
+    except (KeyError, TypeError):
+        return default
+
+
+def _log_failure(error: Exception, attempt: int) -> None:
+    if attempt < settings.YOUTUBE_MAX_RETRIES:
+        print(f"  ! {error}, retrying ({attempt + 1}/{settings.YOUTUBE_MAX_RETRIES})")
+    else:
+        print(f"  ! {error}, giving up after {attempt + 1} attempts")
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, settings.YOUTUBE_RETRY_BASE_DELAY * (2 ** attempt))
+
+
+def _cache_lookup(resource: str, params: Dict[str, Any]):
+    """Return (cache key, fresh body, stale entry) for a request; all None when caching is off"""
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return None, None, None
+    key = cache_key(resource, params)
+    body, entry = response_cache.lookup(resource, key)
+    if body is not None:
+        record('hits')
+    return key, body, entry
+
+
+def _cache_response(key: Optional[str], entry: Optional[Dict[str, Any]], body: Optional[Dict]) -> Dict:
+    """Store a 200 response, or refresh and return the cached body on a 304 (body=None)"""
+    response_cache = get_response_cache()
+    if key is None or response_cache is None:
+        return body
+    if body is None:
+        response_cache.touch(key, entry)
+        record('not_modified')
+        return entry['body']
+    response_cache.store(key, body)
+    record('misses')
+    return body
+
+
+def _classify(status: int, reason: Optional[str], message: str, resource: str) -> Optional[Exception]:
+    """Turn an error response into the exception to raise, or None when it should be retried"""
+    if reason in QUOTA_EXHAUSTED_REASONS:
+        _mark_quota_exhausted()
+        return QuotaExceeded(f"YouTube API quota exceeded during {resource}: {message}")
+    if status in RETRYABLE_STATUSES or reason in RETRYABLE_REASONS:
+        return None
+    return YouTubeAPIError(f"{resource} failed ({status}): {message}", status, reason)
+
+
+async def api_get(session: 'aiohttp.ClientSession', url: str, resource: str, params: Dict[str, Any]) -> Dict:
+    """
+    GET a YouTube Data API resource over aiohttp.
+
+    Serves fresh bodies from the response cache and revalidates stale ones with
+    If-None-Match. Requests that go out are charged quota, wait for the rate
+    limiter and retry transient failures with jittered exponential backoff.
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    key, body, entry = await loop.run_in_executor(None, _cache_lookup, resource, params)
+    if body is not None:
+        return body
+    headers = {'If-None-Match': entry['etag']} if entry else None
+
+    last_error = None
+    for attempt in range(settings.YOUTUBE_MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(_backoff(attempt - 1))
+        await get_rate_limiter().acquire()
+        await loop.run_in_executor(None, charge_quota, resource)
+
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status == 304 and entry:
+                    return await loop.run_in_executor(None, _cache_response, key, entry, None)
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    return await loop.run_in_executor(None, _cache_response, key, entry, data)
+                # Error bodies from proxies and load balancers are often HTML or empty
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+                message = _error_message(data, response.reason)
+                error = _classify(response.status, _error_reason(data), message, resource)
+                if error is not None:
+                    raise error
+                last_error = YouTubeAPIError(f"{resource} failed ({response.status}): {message}", response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_error = YouTubeAPIError(f"{resource} failed: {str(e)}")
+
+        _log_failure(last_error, attempt)
+
+    raise last_error
+
+
+def api_execute(request, resource: str) -> Dict:
+    """Execute a googleapiclient request with the same caching, quota, rate limit and retry handling as api_get"""
+    from googleapiclient.errors import HttpError
+    from httplib2 import HttpLib2Error
+    from .clients import get_thread_http
+
+    key, body, entry = _cache_lookup(resource, params_from_uri(request.uri))
+    if body is not None:
+        return body
+    if entry:
+        request.headers['If-None-Match'] = entry['etag']
+
+    last_error = None
+    for attempt in range(settings.YOUTUBE_MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(_backoff(attempt - 1))
+        get_rate_limiter().acquire_sync()
+        charge_quota(resource)
+
+        try:
+            return _cache_response(key, entry, request.execute(http=get_thread_http()))
+        except HttpError as e:
+            if e.status_code == 304 and entry:
+                return _cache_response(key, entry, None)
+            try:
+                payload = json.loads(e.content)
+            except ValueError:
+                payload = None
+            message = _error_message(payload, str(e))
+            error = _classify(e.status_code, _error_reason(payload), message, resource)
+            if error is not None:
+                raise error from e
+            last_error = YouTubeAPIError(f"{resource} failed ({e.status_code}): {message}", e.status_code)
+        except (HttpLib2Error, OSError, TimeoutError) as e:
+            last_error = YouTubeAPIError(f"{resource} failed: {str(e)}")
+
+        _log_failure(last_error, attempt)
+
+    raise last_error
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlparse
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+# Hit/miss/304 counters live in the default Django cache: totals across processes with
+# CACHE_BACKEND=redis, per-process counts with the local memory default
+COUNTER_CACHE_KEY = 'youtube:response-cache:{}'
+COUNTER_EVENTS = ('hits', 'misses', 'not_modified', 'stores', 'evictions')
+
+
+def cache_key(resource: str, params: Dict[str, Any]) -> str:
+    """Stable key for a request, ignoring the API key"""
+    identity = json.dumps(
+        [resource, sorted((k, str(v)) for k, v in params.items() if k != 'key')]
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def params_from_uri(uri: str) -> Dict[str, Any]:
+    """Query parameters of a googleapiclient request URI"""
+    return dict(parse_qsl(urlparse(uri).query))
+
+
+def record(event: str, count: int = 1) -> None:
+    key = COUNTER_CACHE_KEY.format(event)
+    cache.add(key, 0, timeout=None)
+    cache.incr(key, count)
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    stats = {event: cache.get(COUNTER_CACHE_KEY.format(event), 0) for event in COUNTER_EVENTS}
+    response_cache = get_response_cache()
+    stats['backend'] = settings.YOUTUBE_RESPONSE_CACHE['BACKEND']
+    stats['bytes'] = response_cache.size() if response_cache else 0
+    stats['max_bytes'] = settings.YOUTUBE_RESPONSE_CACHE['MAX_BYTES']
+    return stats
+
+
+class ResponseCache(ABC):
+    """
+    Size-bounded LRU store of API response bodies and their ETags.
+
+    Entries are dicts with 'etag', 'body' and 'stored_at' (epoch seconds).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The entry stored under a key, or None"""
+
+    @abstractmethod
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry, evicting least recently used ones past max_bytes"""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Bytes currently stored"""
+
+    def lookup(self, resource: str, key: str):
+        """
+        Return (fresh body, stale entry) for a request.
+
+        A body younger than the resource's TTL is served without a request; an
+        older entry is returned so its ETag can be revalidated.
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None, None
+        ttl = settings.YOUTUBE_RESPONSE_CACHE['TTLS'].get(resource, 0)
+        if time.time() - entry['stored_at'] < ttl:
+            return entry['body'], entry
+        return None, entry
+
+    def store(self, key: str, body: Dict[str, Any]) -> None:
+        if body.get('etag'):
+            self.set(key, {'etag': body['etag'], 'body': body, 'stored_at': time.time()})
+            record('stores')
+
+    def touch(self, key: str, entry: Dict[str, Any]) -> None:
+        """Mark a revalidated entry fresh again"""
+        self.set(key, {**entry, 'stored_at': time.time()})
+
+
+class DiskResponseCache(ResponseCache):
+    """One JSON file per entry; file mtimes order the LRU"""
+
+    def __init__(self, location: str, max_bytes: int):
+        super().__init__(max_bytes)
+        self.directory = Path(location)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self._bytes = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def size(self) -> int:
+        if self._bytes is None:
+            self._bytes = sum(path.stat().st_size for path in self.directory.glob('*.json'))
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_bytes())
+            os.utime(path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        data = json.dumps(entry).encode()
+        with self.lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._bytes = self.size() + len(data) - old_size
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used files until the cache is back under 90% of its limit"""
+        files = sorted(self.directory.glob('*.json'), key=lambda path: path.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for path in files:
+            if self._bytes <= target:
+                break
+            try:
+                self._bytes -= path.stat().st_size
+                path.unlink()
+                evicted += 1
+            except OSError:
+                continue
+        if evicted:
+            record('evictions', evicted)
+
+
+class RedisResponseCache(ResponseCache):
+    """Entries as Redis strings, with a sorted set of last-access times for LRU eviction"""
+
+    def __init__(self, location: str, max_bytes: int, prefix: str = 'youtube:responses'):
+        super().__init__(max_bytes)
+        import redis
+
+        self.client = redis.Redis.from_url(location)
+        self.prefix = prefix
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def size(self) -> int:
+        return int(self.client.get(f"{self.prefix}:bytes") or 0)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.client.get(self._entry_key(key))
+        if data is None:
+            return None
+        self.client.zadd(f"{self.prefix}:lru", {key: time.time()})
+        return json.loads(data)
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        data = json.dumps(entry)
+        pipe = self.client.pipeline()
+        pipe.strlen(self._entry_key(key))
+        pipe.set(self._entry_key(key), data)
+        pipe.zadd(f"{self.prefix}:lru", {key: time.time()})
+        old_size = pipe.execute()[0]
+        total = self.client.incrby(f"{self.prefix}:bytes", len(data) - old_size)
+        if total > self.max_bytes:
+            self._evict(total)
+
+    def _evict(self, total: int) -> None:
+        target = self.max_bytes * 0.9
+        evicted = 0
+        while total > target:
+            oldest = self.client.zpopmin(f"{self.prefix}:lru")
+            if not oldest:
+                break
+            key = oldest[0][0].decode()
+            size = self.client.strlen(self._entry_key(key))
+            self.client.delete(self._entry_key(key))
+            total = self.client.decrby(f"{self.prefix}:bytes", size)
+            evicted += 1
+        if evicted:
+            record('evictions', evicted)
+
+
+_response_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide response cache from YOUTUBE_RESPONSE_CACHE, or None when disabled"""
+    global _response_cache
+    config = settings.YOUTUBE_RESPONSE_CACHE
+    if _response_cache is None and config['BACKEND'] != 'none':
+        if config['BACKEND'] == 'redis':
+            location = config['LOCATION']
+            if not location or not location.startswith(('redis://', 'rediss://', 'unix://')):
+                raise ImproperlyConfigured(
+                    'YOUTUBE_RESPONSE_CACHE_LOCATION must be set to a Redis URL for the redis response cache'
+                )
+            _response_cache = RedisResponseCache(location, config['MAX_BYTES'])
+        elif config['BACKEND'] == 'disk':
+            _response_cache = DiskResponseCache(config['LOCATION'], config['MAX_BYTES'])
+        else:
+            raise ImproperlyConfigured("YOUTUBE_RESPONSE_CACHE_BACKEND must be 'disk', 'redis' or 'none'")
+    return _response_cache
@@ -0,0 +1,176 @@
+"""
+Daily and weekly VideoMetrics rollups. New snapshots are folded into their
+buckets as they are written, so history reads never scan raw snapshots;
+rebuild_rollups() recomputes everything from VideoMetrics for backfills.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from ..models import Video, VideoMetrics, VideoMetricsRollup
+
+GRANULARITIES = [VideoMetricsRollup.GRANULARITY_DAY, VideoMetricsRollup.GRANULARITY_WEEK]
+ROLLUP_FIELDS = [
+    'min_views', 'max_views', 'last_views', 'min_likes', 'max_likes', 'last_likes',
+    'view_delta', 'like_delta', 'samples', 'last_captured_at',
+]
+
+# (view_count, like_count, captured_at) of one snapshot
+Sample = Tuple[int, int, datetime]
+
+
+def bucket_start(captured_at: datetime, granularity: str) -> date:
+    """The UTC day, or the Monday of the UTC week, a snapshot falls in"""
+    day = captured_at.astimezone(dt_timezone.utc).date()
+    if granularity == VideoMetricsRollup.GRANULARITY_WEEK:
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def _open(video_id: int, granularity: str, bucket: date, sample: Sample,
+          previous: Optional[Tuple[int, int]]) -> VideoMetricsRollup:
+    views, likes, captured_at = sample
+    open_views, open_likes = previous or (views, likes)
+    return VideoMetricsRollup(
+        video_id=video_id, granularity=granularity, bucket=bucket,
+        min_views=views, max_views=views, last_views=views,
+        min_likes=likes, max_likes=likes, last_likes=likes,
+        open_views=open_views, open_likes=open_likes,
+        view_delta=views - open_views, like_delta=likes - open_likes,
+        samples=0, last_captured_at=captured_at
+    )
+
+
+def _fold(rollup: VideoMetricsRollup, sample: Sample) -> None:
+    """Add one snapshot to a bucket"""
+    views, likes, captured_at = sample
+    rollup.min_views = min(rollup.min_views, views)
+    rollup.max_views = max(rollup.max_views, views)
+    rollup.min_likes = min(rollup.min_likes, likes)
+    rollup.max_likes = max(rollup.max_likes, likes)
+    if captured_at >= rollup.last_captured_at:
+        rollup.last_views, rollup.last_likes, rollup.last_captured_at = views, likes, captured_at
+    rollup.view_delta = rollup.last_views - rollup.open_views
+    rollup.like_delta = rollup.last_likes - rollup.open_likes
+    rollup.samples += 1
+
+
+def _previous_closes(granularity: str, bucket: date, video_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """Closing (views, likes) of each video's latest bucket before `bucket`"""
+    previous = VideoMetricsRollup.objects.filter(
+        video=OuterRef('pk'), granularity=granularity, bucket__lt=bucket
+    ).order_by('-bucket')
+    rows = Video.objects.filter(pk__in=video_ids).annotate(
+        previous_views=Subquery(previous.values('last_views')[:1]),
+        previous_likes=Subquery(previous.values('last_likes')[:1])
+    ).values_list('pk', 'previous_views', 'previous_likes')
+    return {pk: (views, likes) for pk, views, likes in rows if views is not None}
+
+
+def apply_snapshots(snapshots: Iterable[VideoMetrics]) -> int:
+    """
+    Fold freshly written VideoMetrics rows into their daily and weekly rollups.
+
+    Missing buckets are first inserted empty (ignoring conflicts), then every
+    bucket of the batch is locked and merged, so concurrent writers to the same
+    new bucket serialize on its row instead of overwriting each other. Touches
+    one bucket per video and granularity per batch in the common case, with a
+    constant number of queries per batch. Returns the number of rollups written.
+    """
+    samples = defaultdict(list)
+    for snapshot in snapshots:
+        samples[snapshot.video_id].append((snapshot.view_count, snapshot.like_count, snapshot.captured_at))
+    if not samples:
+        return 0
+
+    written = 0
+    with transaction.atomic():
+        for granularity in GRANULARITIES:
+            keyed = defaultdict(list)
+            for video_id, video_samples in samples.items():
+                for sample in sorted(video_samples, key=lambda sample: sample[2]):
+                    keyed[(video_id, bucket_start(sample[2], granularity))].append(sample)
+
+            # Empty buckets (samples=0) are opened properly below, once locked
+            VideoMetricsRollup.objects.bulk_create(
+                [
+                    _open(video_id, granularity, bucket, bucket_samples[0], None)
+                    for (video_id, bucket), bucket_samples in sorted(keyed.items())
+                ],
+                ignore_conflicts=True,
+                batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+            )
+            existing = {
+                (rollup.video_id, rollup.bucket): rollup
+                for rollup in VideoMetricsRollup.objects.select_for_update().filter(
+                    granularity=granularity,
+                    video_id__in=list(samples),
+                    bucket__in={bucket for _, bucket in keyed}
+                ).order_by('pk')
+            }
+
+            # Only a video's first bucket in the batch can need the close of an older, stored bucket
+            first_buckets = {}
+            for video_id, bucket in keyed:
+                first_buckets[video_id] = min(bucket, first_buckets.get(video_id, bucket))
+            first_empty = defaultdict(list)
+            for video_id, bucket in first_buckets.items():
+                if not existing[(video_id, bucket)].samples:
+                    first_empty[bucket].append(video_id)
+            closes = {}
+            for bucket, video_ids in first_empty.items():
+                closes.update(_previous_closes(granularity, bucket, video_ids))
+
+            previous = {}
+            for key in sorted(keyed):
+                video_id, bucket = key
+                if not existing[key].samples:
+                    rollup = previous.get(video_id)
+                    close = (rollup.last_views, rollup.last_likes) if rollup else closes.get(video_id)
+                    opened = _open(video_id, granularity, bucket, keyed[key][0], close)
+                    opened.pk = existing[key].pk
+                    existing[key] = opened
+                for sample in keyed[key]:
+                    _fold(existing[key], sample)
+                previous[video_id] = existing[key]
+
+            VideoMetricsRollup.objects.bulk_update(
+                [existing[key] for key in keyed],
+                ROLLUP_FIELDS + ['open_views', 'open_likes'],
+                batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+            )
+            written += len(keyed)
+    return written
+
+
+def rebuild_rollups(video_ids: List[int], granularities: Optional[List[str]] = None) -> int:
+    """
+    Recompute the rollups of some videos from their raw snapshots.
+
+    Snapshots are streamed in (video, captured_at) order, which the composite
+    VideoMetrics index serves without a sort.
+    """
+    granularities = granularities or GRANULARITIES
+    rollups = []
+    for granularity in granularities:
+        current = None
+        snapshots = VideoMetrics.objects.filter(video_id__in=video_ids).order_by(
+            'video_id', 'captured_at'
+        ).values_list('video_id', 'view_count', 'like_count', 'captured_at')
+        for video_id, views, likes, captured_at in snapshots.iterator(chunk_size=settings.YOUTUBE_BULK_BATCH_SIZE):
+            sample = (views, likes, captured_at)
+            bucket = bucket_start(captured_at, granularity)
+            if current is None or current.video_id != video_id or current.bucket != bucket:
+                previous = None
+                if current is not None and current.video_id == video_id:
+                    previous = (current.last_views, current.last_likes)
+                current = _open(video_id, granularity, bucket, sample, previous)
+                rollups.append(current)
+            _fold(current, sample)
+
+    with transaction.atomic():
+        VideoMetricsRollup.objects.filter(video_id__in=video_ids, granularity__in=granularities).delete()
+        VideoMetricsRollup.objects.bulk_create(rollups, batch_size=settings.YOUTUBE_BULK_BATCH_SIZE)
+    return len(rollups)
@@ -0,0 +1,189 @@
+"""
+Full-text search over transcripts.
+
+Transcript content is stored compressed, so the database can't index it by
+itself: index_transcripts() writes each transcript's text into the search index
+when it is created. PostgreSQL keeps a tsvector column with a GIN index; SQLite
+keeps an FTS5 table. Neither is visible to the ORM, so searches run as raw SQL.
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.db import connection as default_connection
+from ..models import Transcript
+
+TRANSCRIPT_TABLE = 'youtube_transcript'
+VIDEO_TABLE = 'youtube_video'
+GIN_INDEX = 'transcript_search_gin'
+FTS_TABLE = 'youtube_transcript_fts'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+HEADLINE_OPTIONS = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=25, MinWords=8'
+
+RESULT_COLUMNS = ['id', 'video', 'youtube_id', 'title', 'channel', 'published_at', 'language', 'score']
+
+
+def install_search_index(connection=None) -> None:
+    """Create the search column and index (PostgreSQL) or FTS5 table (SQLite); idempotent, doesn't index rows"""
+    connection = connection or default_connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"ALTER TABLE {TRANSCRIPT_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {GIN_INDEX} ON {TRANSCRIPT_TABLE} USING gin (search_vector)"
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(content, tokenize='porter unicode61')"
+            )
+            # Triggers are dropped whenever a migration rebuilds the transcript table, so
+            # migrations that alter Transcript on SQLite must recreate it
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TRANSCRIPT_TABLE} BEGIN "
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END"
+            )
+
+
+def drop_search_index(connection=None) -> None:
+    connection = connection or default_connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+            cursor.execute(f"ALTER TABLE {TRANSCRIPT_TABLE} DROP COLUMN IF EXISTS search_vector")
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def index_transcripts(rows: Iterable[Tuple[int, str]], connection=None) -> None:
+    """Write (transcript id, content) pairs into the search index, replacing earlier entries"""
+    connection = connection or default_connection
+    rows = list(rows)
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.executemany(
+                f"UPDATE {TRANSCRIPT_TABLE} SET search_vector = "
+                f"to_tsvector('{settings.YOUTUBE_TRANSCRIPT_SEARCH_CONFIG}'::regconfig, %s) WHERE id = %s",
+                [(content, transcript_id) for transcript_id, content in rows]
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {FTS_TABLE}(rowid, content) VALUES (%s, %s)", rows
+            )
+
+
+def rebuild_search_index(transcripts, batch_size: int = 200, connection=None) -> int:
+    """
+    Recreate the search index and index every transcript of a Transcript queryset
+    in batches. Returns the number indexed.
+    """
+    connection = connection or default_connection
+    drop_search_index(connection)
+    install_search_index(connection)
+    indexed = 0
+    last_id = 0
+    while True:
+        batch = list(
+            transcripts.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'content')[:batch_size]
+        )
+        if not batch:
+            return indexed
+        index_transcripts(batch, connection)
+        indexed += len(batch)
+        last_id = batch[-1][0]
+
+
+def _fts5_query(query: str) -> str:
+    """Quote each word or "phrase" so user input can't inject FTS5 operators; terms are ANDed"""
+    terms = re.findall(r'"([^"]+)"|(\S+)', query)
+    quoted = []
+    for phrase, word in terms:
+        term = (phrase or word).replace('"', '""')
+        quoted.append(f'"{term}"')
+    return ' '.join(quoted)
+
+
+def _filters(channel_id: Optional[int], published_after: Optional[datetime], published_before: Optional[datetime]):
+    clauses, params = [], []
+    if channel_id is not None:
+        clauses.append('v.channel_id = %s')
+        params.append(channel_id)
+    if published_after is not None:
+        clauses.append('v.published_at >= %s')
+        params.append(published_after)
+    if published_before is not None:
+        clauses.append('v.published_at < %s')
+        params.append(published_before)
+    return ''.join(f' AND {clause}' for clause in clauses), params
+
+
+def search_transcripts(query: str, channel_id: Optional[int] = None, published_after: Optional[datetime] = None,
+                       published_before: Optional[datetime] = None, limit: int = 20, offset: int = 0,
+                       connection=None) -> List[Dict[str, Any]]:
+    """
+    Ranked transcript hits for a query, best first, with a highlighted snippet.
+
+    PostgreSQL accepts web-search syntax ("phrases", OR, -exclusions) and ranks
+    with ts_rank_cd; SQLite ANDs words and "phrases" and ranks with bm25. Snippets
+    are only built for the returned page.
+    """
+    connection = connection or default_connection
+    where, params = _filters(channel_id, published_after, published_before)
+    columns = 't.id, t.video_id, v.youtube_id, v.title, v.channel_id, v.published_at, t.language'
+
+    if connection.vendor == 'postgresql':
+        config = settings.YOUTUBE_TRANSCRIPT_SEARCH_CONFIG
+        sql = f"""
+            SELECT {columns}, ts_rank_cd(t.search_vector, q.query) AS score
+            FROM {TRANSCRIPT_TABLE} t
+            JOIN {VIDEO_TABLE} v ON v.id = t.video_id,
+                 websearch_to_tsquery('{config}'::regconfig, %s) q(query)
+            WHERE t.search_vector @@ q.query{where}
+            ORDER BY score DESC, t.id
+            LIMIT %s OFFSET %s
+        """
+        params = [query] + params + [limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            hits = [dict(zip(RESULT_COLUMNS, row)) for row in cursor.fetchall()]
+        for hit, snippet in zip(hits, _headlines([hit['id'] for hit in hits], query, connection)):
+            hit['snippet'] = snippet
+        return hits
+    elif connection.vendor == 'sqlite':
+        # bm25() is lower-is-better, so negate it for a higher-is-better score
+        sql = f"""
+            SELECT {columns}, -bm25({FTS_TABLE}) AS score,
+                   snippet({FTS_TABLE}, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 24)
+            FROM {FTS_TABLE}
+            JOIN {TRANSCRIPT_TABLE} t ON t.id = {FTS_TABLE}.rowid
+            JOIN {VIDEO_TABLE} v ON v.id = t.video_id
+            WHERE {FTS_TABLE} MATCH %s{where}
+            ORDER BY bm25({FTS_TABLE}), t.id
+            LIMIT %s OFFSET %s
+        """
+        params = [_fts5_query(query)] + params + [limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [dict(zip(RESULT_COLUMNS + ['snippet'], row)) for row in rows]
+    else:
+        raise NotImplementedError(f"Transcript search isn't supported on {connection.vendor}")
+
+
+def _headlines(transcript_ids: List[int], query: str, connection) -> List[str]:
+    """ts_headline snippets for a page of PostgreSQL hits, from their decompressed content, in one query"""
+    if not transcript_ids:
+        return []
+    contents = Transcript.objects.only('content').in_bulk(transcript_ids)
+    config = settings.YOUTUBE_TRANSCRIPT_SEARCH_CONFIG
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT ts_headline('{config}'::regconfig, d.doc, websearch_to_tsquery('{config}'::regconfig, %s), %s) "
+            f"FROM unnest(%s::text[]) WITH ORDINALITY AS d(doc, n) ORDER BY d.n",
+            [query, HEADLINE_OPTIONS, [contents[transcript_id].content for transcript_id in transcript_ids]]
+        )
+        return [row[0] for row in cursor.fetchall()]
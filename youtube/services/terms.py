@@ -0,0 +1,279 @@
+"""
+Term trends across a channel's transcripts.
+
+Each transcript is tokenized once at ingest into words and word pairs (before
+the page's write transaction, see prepare_term_counts), and the counts are
+stored as a VideoTermCounts row: a sparse row of packed term ids and
+counts against the shared Term vocabulary. Queries load a channel's rows as a
+CSR matrix in publish order and aggregate it with NumPy, so answering them
+never decompresses or re-tokenizes a transcript.
+"""
+import re
+import sys
+from array import array
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from ..models import Term, Video, VideoTermCounts
+
+if TYPE_CHECKING:
+    import numpy as np
+
+WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+STOPWORDS = frozenset("""
+    a about after all also am an and any are as at be because been but by can could did do does doing
+    don't for from get got had has have he her here him his how i i'm if in into is it it's its just
+    know like me more my no not now of on one or our out over really right she so some than that that's
+    the their them then there these they this those to too up us very was we we're were what when where
+    which who will with would yeah you you're your
+""".split())
+PERIODS = ('week', 'month', 'year')
+# Bind parameters per vocabulary lookup (SQLite allows 999)
+LOOKUP_BATCH_SIZE = 900
+# A rising term needs at least this many mentions in the recent periods
+RISING_MIN_COUNT = 5
+
+
+def tokenize(text: str) -> List[str]:
+    return WORD_RE.findall(text.lower())
+
+
+def normalize_term(term: str) -> str:
+    """The stored form of a user-supplied term: lowercased words joined by single spaces"""
+    return ' '.join(tokenize(term))
+
+
+def count_terms(text: str) -> Tuple[Counter, int]:
+    """Counts of the words and adjacent word pairs of a text, skipping stopwords, and its word count"""
+    words = tokenize(text)
+    terms = Counter(word for word in words if word not in STOPWORDS)
+    terms.update(
+        f'{first} {second}' for first, second in zip(words, words[1:])
+        if first not in STOPWORDS and second not in STOPWORDS
+    )
+    return terms, len(words)
+
+
+def _pack(values: Iterable[int]) -> bytes:
+    packed = array('I', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def term_ids(texts: Iterable[str], create: bool = True) -> Dict[str, int]:
+    """
+    Vocabulary ids of some terms, adding the missing ones unless create is False.
+    Call it outside long transactions: the shared Term table is hot during ingests.
+    """
+    texts = list({text for text in texts if len(text) <= Term._meta.get_field('text').max_length})
+    ids = {}
+    for start in range(0, len(texts), LOOKUP_BATCH_SIZE):
+        ids.update(Term.objects.filter(text__in=texts[start:start + LOOKUP_BATCH_SIZE]).values_list('text', 'id'))
+    missing = [text for text in texts if text not in ids]
+    if create and missing:
+        # Concurrent ingests may add the same terms, so re-read ids instead of trusting bulk_create
+        with transaction.atomic():
+            Term.objects.bulk_create(
+                [Term(text=text) for text in missing],
+                ignore_conflicts=True,
+                batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+            )
+        for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+            ids.update(
+                Term.objects.filter(text__in=missing[start:start + LOOKUP_BATCH_SIZE]).values_list('text', 'id')
+            )
+    return ids
+
+
+class TermCounts(NamedTuple):
+    """A tokenized transcript, ready to be stored as a VideoTermCounts row"""
+    total_terms: int
+    term_ids: bytes
+    counts: bytes
+
+
+def prepare_term_counts(items: Iterable[Tuple[Any, str]]) -> Dict[Any, TermCounts]:
+    """
+    Tokenize (key, transcript text) pairs and resolve their vocabulary ids, adding
+    new terms in their own short transaction. Run it before opening the
+    transaction that stores the rows with save_term_counts().
+    """
+    counted = [(key, *count_terms(text)) for key, text in items]
+    if not counted:
+        return {}
+    vocabulary = term_ids(term for _, terms, _ in counted for term in terms)
+
+    prepared = {}
+    for key, terms, total in counted:
+        entries = sorted((vocabulary[term], count) for term, count in terms.items() if term in vocabulary)
+        prepared[key] = TermCounts(
+            total_terms=total,
+            term_ids=_pack(term_id for term_id, _ in entries),
+            counts=_pack(count for _, count in entries)
+        )
+    return prepared
+
+
+def save_term_counts(items: Iterable[Tuple[Video, TermCounts]]) -> int:
+    """Store the VideoTermCounts rows of (video, prepared counts) pairs, replacing earlier ones"""
+    rows = []
+    for video, term_counts in items:
+        published_at = video.published_at
+        if isinstance(published_at, str):
+            # Freshly created instances may still hold the API's ISO string
+            published_at = parse_datetime(published_at)
+        rows.append(VideoTermCounts(
+            video=video,
+            channel_id=video.channel_id,
+            published_at=published_at,
+            **term_counts._asdict()
+        ))
+    if not rows:
+        return 0
+    with transaction.atomic():
+        VideoTermCounts.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['video'],
+            update_fields=['channel', 'published_at', 'total_terms', 'term_ids', 'counts'],
+            batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+        )
+    return len(rows)
+
+
+def index_transcript_terms(items: Iterable[Tuple[Video, str]]) -> int:
+    """Tokenize (video, transcript text) pairs into their VideoTermCounts rows, replacing earlier ones"""
+    items = list(items)
+    prepared = prepare_term_counts((index, text) for index, (_, text) in enumerate(items))
+    return save_term_counts((video, prepared[index]) for index, (video, _) in enumerate(items))
+
+
+class TermMatrix(NamedTuple):
+    """A channel's videos x terms count matrix in CSR form, rows in publish order"""
+    published_at: 'np.ndarray'
+    total_terms: 'np.ndarray'
+    indptr: 'np.ndarray'
+    indices: 'np.ndarray'
+    data: 'np.ndarray'
+
+
+def load_term_matrix(channel_id: int) -> TermMatrix:
+    import numpy as np
+
+    rows = list(
+        VideoTermCounts.objects.filter(channel_id=channel_id).order_by('published_at').values_list(
+            'published_at', 'total_terms', 'term_ids', 'counts'
+        )
+    )
+    lengths = np.fromiter((len(row[2]) // 4 for row in rows), dtype=np.int64, count=len(rows))
+    return TermMatrix(
+        published_at=np.fromiter(
+            (int(row[0].timestamp()) for row in rows), dtype=np.int64, count=len(rows)
+        ).astype('datetime64[s]'),
+        total_terms=np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows)),
+        indptr=np.concatenate(([0], np.cumsum(lengths))),
+        indices=np.frombuffer(b''.join(row[2] for row in rows), dtype='<u4').astype(np.int64),
+        data=np.frombuffer(b''.join(row[3] for row in rows), dtype='<u4').astype(np.int64)
+    )
+
+
+def _period_buckets(published_at: 'np.ndarray', period: str) -> Tuple[List[str], 'np.ndarray']:
+    """Period labels in order, and the period index of each row"""
+    import numpy as np
+
+    if period == 'week':
+        days = published_at.astype('datetime64[D]').astype(np.int64)
+        # Day 0 (1970-01-01) was a Thursday; weeks start on Monday
+        starts = (days - (days + 3) % 7).astype('datetime64[D]')
+    elif period == 'month':
+        starts = published_at.astype('datetime64[M]')
+    else:
+        starts = published_at.astype('datetime64[Y]')
+    labels, row_period = np.unique(starts, return_inverse=True)
+    return [str(label) for label in labels], row_period.reshape(-1)
+
+
+def term_trends(channel_id: int, terms: List[str], period: str = 'month', recent: int = 3,
+                rising_limit: int = 20) -> Dict[str, Any]:
+    """
+    Per-period counts (and rates per 10k words) of the given terms in a channel's
+    transcripts, plus the terms whose rate in the last `recent` periods rose most
+    over the earlier ones.
+    """
+    import numpy as np
+
+    terms = list(dict.fromkeys(term for term in map(normalize_term, terms) if term))
+    matrix = load_term_matrix(channel_id)
+    result = {'period': period, 'terms': terms, 'periods': [], 'rising': []}
+    if not len(matrix.published_at):
+        return result
+
+    labels, row_period = _period_buckets(matrix.published_at, period)
+    n_periods = len(labels)
+    # Period of every stored (row, term) entry
+    entry_period = np.repeat(row_period, np.diff(matrix.indptr))
+    videos = np.bincount(row_period, minlength=n_periods)
+    totals = np.bincount(row_period, weights=matrix.total_terms, minlength=n_periods)
+
+    vocabulary = term_ids(terms, create=False)
+    query_ids = np.array([vocabulary.get(term, -1) for term in terms], dtype=np.int64)
+    counts = np.zeros((n_periods, len(terms)))
+    if len(terms):
+        order = np.argsort(query_ids)
+        matched = np.isin(matrix.indices, query_ids[query_ids >= 0])
+        column = order[np.searchsorted(query_ids, matrix.indices[matched], sorter=order)]
+        counts = np.bincount(
+            entry_period[matched] * len(terms) + column,
+            weights=matrix.data[matched],
+            minlength=n_periods * len(terms)
+        ).reshape(n_periods, len(terms))
+    rates = np.divide(counts * 10000, totals[:, None], out=np.zeros_like(counts), where=totals[:, None] > 0)
+
+    result['periods'] = [
+        {
+            'period': labels[index],
+            'videos': int(videos[index]),
+            'total_terms': int(totals[index]),
+            'counts': {term: int(counts[index, column]) for column, term in enumerate(terms)},
+            'per_10k': {term: round(float(rates[index, column]), 3) for column, term in enumerate(terms)},
+        }
+        for index in range(n_periods)
+    ]
+    result['rising'] = _rising_terms(matrix, entry_period, totals, n_periods - recent, rising_limit)
+    return result
+
+
+def _rising_terms(matrix: TermMatrix, entry_period: 'np.ndarray', totals: 'np.ndarray', first_recent: int,
+                  limit: int) -> List[Dict[str, Any]]:
+    """Terms ranked by smoothed recent rate / baseline rate, over the channel's own vocabulary"""
+    import numpy as np
+
+    recent_total, baseline_total = totals[max(first_recent, 0):].sum(), totals[:max(first_recent, 0)].sum()
+    if first_recent <= 0 or not recent_total or not baseline_total:
+        return []
+
+    # Dense columns over only the terms this channel uses
+    vocabulary, column = np.unique(matrix.indices, return_inverse=True)
+    is_recent = entry_period >= first_recent
+    recent = np.bincount(column[is_recent], weights=matrix.data[is_recent], minlength=len(vocabulary))
+    baseline = np.bincount(column[~is_recent], weights=matrix.data[~is_recent], minlength=len(vocabulary))
+    # Add-one smoothing keeps terms that are new in the recent periods finite
+    score = ((recent + 1) / recent_total) / ((baseline + 1) / baseline_total)
+    candidates = np.flatnonzero(recent >= RISING_MIN_COUNT)
+    top = candidates[np.argsort(-score[candidates], kind='stable')[:limit]]
+
+    texts = Term.objects.in_bulk([int(term_id) for term_id in vocabulary[top]])
+    return [
+        {
+            'term': texts[int(vocabulary[index])].text,
+            'recent_count': int(recent[index]),
+            'baseline_count': int(baseline[index]),
+            'recent_per_10k': round(float(recent[index] * 10000 / recent_total), 3),
+            'baseline_per_10k': round(float(baseline[index] * 10000 / baseline_total), 3),
+            'score': round(float(score[index]), 3),
+        }
+        for index in top
+    ]
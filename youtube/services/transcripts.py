@@ -0,0 +1,202 @@
+"""
+Transcript storage with timed segments.
+
+Transcripts are only created through create_transcripts(), which also writes
+their segments, search index entries, term counts and MinHash signatures.
+
+Every caption entry is kept as a TranscriptSegment indexed by (transcript,
+start_ms), with its text as a character span of the compressed content rather
+than a second, uncompressed copy. A time window is read from the index and its
+text sliced from the one decompressed transcript.
+"""
+import re
+import zlib
+from collections import defaultdict
+from functools import reduce
+from itertools import islice
+from operator import or_
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from django.db.models import BinaryField, ExpressionWrapper, F, Q, QuerySet
+from ..models import Transcript, TranscriptSegment, Video
+from .search import index_transcripts
+from .minhash import index_transcript_signatures
+from .terms import TermCounts, index_transcript_terms, save_term_counts
+
+# Caption entries are a few seconds long; an entry starting further back than this
+# before a window is assumed to have ended before it, which keeps the index scan bounded
+SEGMENT_LOOKBACK_MS = 60_000
+# Timestamps returned per search hit, located from this many term matches
+TIMESTAMPS_PER_HIT = 3
+MATCHES_PER_HIT = 2 * TIMESTAMPS_PER_HIT
+# (transcript, position) pairs looked up per segment query
+SEGMENT_LOOKUP_BATCH = 250
+# Web-search operators that aren't terms
+QUERY_OPERATORS = {'or', 'and', 'not'}
+
+
+def create_transcripts(items: Iterable[Tuple[Video, Dict]],
+                       term_counts: Optional[Dict[str, TermCounts]] = None) -> List[Transcript]:
+    """
+    Bulk create transcripts from fetched transcript data, with everything derived from them.
+
+    `term_counts` maps YouTube IDs to counts from terms.prepare_term_counts(), so
+    callers inside a long transaction can tokenize before opening it; transcripts
+    without prepared counts are tokenized here.
+    """
+    items = list(items)
+    term_counts = term_counts or {}
+    transcripts = Transcript.objects.bulk_create([
+        Transcript(
+            video=video,
+            content_size=len(data['content'].encode('utf-8')),
+            **{key: value for key, value in data.items() if key != 'segments'}
+        )
+        for video, data in items
+    ])
+    index_transcripts((transcript.id, transcript.content) for transcript in transcripts)
+    save_term_counts(
+        (video, term_counts[video.youtube_id]) for video, _ in items if video.youtube_id in term_counts
+    )
+    index_transcript_terms((video, data['content']) for video, data in items if video.youtube_id not in term_counts)
+    index_transcript_signatures((video, data['content']) for video, data in items)
+    TranscriptSegment.objects.bulk_create(
+        [
+            TranscriptSegment(
+                transcript=transcript, start_ms=start_ms, duration_ms=duration_ms,
+                char_offset=char_offset, char_length=char_length
+            )
+            for transcript, (_, data) in zip(transcripts, items)
+            for start_ms, duration_ms, char_offset, char_length in segment_spans(
+                data['content'], data.get('segments', [])
+            )
+        ],
+        batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+    )
+    return transcripts
+
+
+def segment_spans(content: str, segments: Iterable[Tuple[int, int, str]]) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    (start_ms, duration_ms, char_offset, char_length) of each (start_ms, duration_ms,
+    text) caption entry, locating the texts in order in the joined content. An entry
+    whose text isn't found gets an empty span.
+    """
+    position = 0
+    for start_ms, duration_ms, text in segments:
+        offset = content.find(text, position)
+        if offset < 0:
+            yield start_ms, duration_ms, position, 0
+            continue
+        yield start_ms, duration_ms, offset, len(text)
+        position = offset + len(text)
+
+
+def compressed_content(transcripts: QuerySet, transcript_id: int) -> Optional[Tuple[bytes, str, str]]:
+    """A transcript's stored gzip bytes (undecoded) with its video's YouTube ID and language, or None"""
+    row = transcripts.filter(pk=transcript_id).annotate(
+        raw=ExpressionWrapper(F('content'), output_field=BinaryField())
+    ).values_list('raw', 'video__youtube_id', 'language').first()
+    if row is None:
+        return None
+    return bytes(row[0]), row[1], row[2]
+
+
+def iter_chunks(data: bytes, chunk_size: int) -> Iterator[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def iter_decompressed(data: bytes, chunk_size: int) -> Iterator[bytes]:
+    """Decompress gzip bytes incrementally, for clients that don't accept gzip"""
+    decompressor = zlib.decompressobj(wbits=31)
+    for chunk in iter_chunks(data, chunk_size):
+        # Cap each output chunk so a highly compressible input doesn't expand all at once
+        output = decompressor.decompress(chunk, chunk_size)
+        while output:
+            yield output
+            output = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def _segment_dict(segment: Dict, content: str) -> Dict:
+    return {
+        'start': segment['start_ms'] / 1000,
+        'duration': segment['duration_ms'] / 1000,
+        'text': content[segment['char_offset']:segment['char_offset'] + segment['char_length']],
+    }
+
+
+def _contents(transcript_ids: Iterable[int]) -> Dict[int, str]:
+    return dict(Transcript.objects.filter(pk__in=list(transcript_ids)).values_list('pk', 'content'))
+
+
+def segments_between(transcript_id: int, start_ms: int, end_ms: Optional[int] = None) -> List[Dict]:
+    """Segments of a transcript overlapping [start_ms, end_ms), in order; times in seconds"""
+    segments = TranscriptSegment.objects.filter(
+        transcript_id=transcript_id,
+        start_ms__gte=max(start_ms - SEGMENT_LOOKBACK_MS, 0)
+    ).annotate(end_ms=F('start_ms') + F('duration_ms')).filter(end_ms__gt=start_ms)
+    if end_ms is not None:
+        segments = segments.filter(start_ms__lt=end_ms)
+    segments = list(segments.order_by('start_ms').values('start_ms', 'duration_ms', 'char_offset', 'char_length'))
+    if not segments:
+        return []
+    content = _contents([transcript_id]).get(transcript_id, '')
+    return [_segment_dict(segment, content) for segment in segments]
+
+
+def _query_terms(query: str) -> List[str]:
+    """Words and "phrases" of a search query, without operators and -exclusions"""
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', query):
+        term = (phrase or word).strip()
+        if word and (word.startswith('-') or word.lower() in QUERY_OPERATORS):
+            continue
+        if term:
+            terms.append(term)
+    return terms
+
+
+def timestamps_for_hits(transcript_ids: List[int], query: str) -> Dict[int, List[Dict]]:
+    """
+    The first segments of each transcript that contain a query term.
+
+    Terms are matched case-insensitively in the decompressed content, so stemmed
+    search hits ("run" for "running") still map to their segments, and the segments
+    holding the first MATCHES_PER_HIT matches are read in one query per
+    SEGMENT_LOOKUP_BATCH matches. Phrases split across two segments are not located.
+    """
+    terms = _query_terms(query)
+    if not transcript_ids or not terms:
+        return {}
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    contents = _contents(transcript_ids)
+    positions = [
+        (transcript_id, match.start())
+        for transcript_id, content in contents.items()
+        for match in islice(pattern.finditer(content), MATCHES_PER_HIT)
+    ]
+
+    found = defaultdict(dict)
+    for start in range(0, len(positions), SEGMENT_LOOKUP_BATCH):
+        batch = positions[start:start + SEGMENT_LOOKUP_BATCH]
+        for segment in TranscriptSegment.objects.annotate(
+            char_end=F('char_offset') + F('char_length')
+        ).filter(
+            reduce(or_, [
+                Q(transcript_id=transcript_id, char_offset__lte=position, char_end__gt=position)
+                for transcript_id, position in batch
+            ])
+        ).values('id', 'transcript_id', 'start_ms', 'duration_ms', 'char_offset', 'char_length'):
+            found[segment['transcript_id']][segment['id']] = segment
+
+    return {
+        transcript_id: [
+            _segment_dict(segment, contents[transcript_id])
+            for segment in sorted(segments.values(), key=lambda segment: segment['start_ms'])[:TIMESTAMPS_PER_HIT]
+        ]
+        for transcript_id, segments in found.items()
+    }
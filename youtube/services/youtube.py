@@ -1,17 +1,88 @@
 import asyncio
 import aiohttp
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 from googleapiclient.discovery import build
 from django.conf import settings
-from youtube_transcript_api import YouTubeTranscriptApi
-from ..models import Channel, Video, Transcript, VideoMetrics
-from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Q, QuerySet, Subquery
+from django.utils import timezone
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
+from ..models import Channel, Video, Transcript, VideoMetrics, IngestionJob
+from .clients import get_http_session, get_thread_transcript_api, get_transcript_executor, run_async
+from .quota import api_execute, api_get
+from .analytics_cache import forget_video_channels, invalidate_channels
+from .channel_stats import apply_video_changes
+from .rollups import apply_snapshots
+from .terms import prepare_term_counts
+from .transcripts import create_transcripts
+
+# Failures that won't go away on retry; cached for YOUTUBE_TRANSCRIPT_NEGATIVE_TTL
+PERMANENT_TRANSCRIPT_ERRORS = (TranscriptsDisabled, NoTranscriptFound)
+NO_TRANSCRIPT_CACHE_KEY = 'youtube:no-transcript:{}'
+
+
+def videos_due_for_snapshot(now: Optional[datetime] = None) -> QuerySet:
+    """
+    Videos whose latest VideoMetrics snapshot is older than their age tier allows.
+    
+    Tiers come from YOUTUBE_SNAPSHOT_TIERS as (max age in hours, hours between
+    snapshots), youngest first. Results are newest uploads first, so the fast
+    moving tiers win when a run's budget runs out.
+    """
+    now = now or timezone.now()
+    last_snapshot = VideoMetrics.objects.filter(
+        video=OuterRef('pk')
+    ).order_by('-captured_at').values('captured_at')[:1]
+    
+    due = Q()
+    newer_bound = None
+    for max_age_hours, interval_hours in settings.YOUTUBE_SNAPSHOT_TIERS:
+        tier = Q(last_snapshot__isnull=True) | Q(last_snapshot__lte=now - timedelta(hours=interval_hours))
+        if max_age_hours is not None:
+            tier &= Q(published_at__gte=now - timedelta(hours=max_age_hours))
+        if newer_bound is not None:
+            tier &= Q(published_at__lt=newer_bound)
+        due |= tier
+        if max_age_hours is None:
+            break
+        newer_bound = now - timedelta(hours=max_age_hours)
+    
+    return Video.objects.annotate(
+        last_snapshot=Subquery(last_snapshot)
+    ).filter(due).order_by('-published_at')
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_youtube_service() -> 'YouTubeService':
+    """The process-wide YouTubeService, created on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = YouTubeService(settings.YOUTUBE_API_KEY)
+    return _service
+
 
 class YouTubeService:
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        # The discovery document bundled with google-api-python-client; no network fetch
+        self.youtube = build(
+            'youtube', 'v3',
+            developerKey=api_key,
+            static_discovery=True,
+            cache_discovery=False
+        )
         self.base_url = "https://www.googleapis.com/youtube/v3"
+        self._transcript_semaphore = None
+        self._transcript_semaphore_loop = None
 
     async def _fetch_video_details_batch(self, session: aiohttp.ClientSession, video_ids: List[str]) -> List[Dict]:
         """Fetch video details for a batch of videos concurrently"""
@@ -22,37 +93,59 @@ class YouTubeService:
             'id': ','.join(video_ids)
         }
         
-        async with session.get(url, params=params) as response:
-            data = await response.json()
-            return data.get('items', [])
+        data = await api_get(session, url, 'videos.list', params)
+        return data.get('items', [])
 
-    async def _fetch_transcript(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch transcript for a video asynchronously"""
-        try:
-            # Run transcript fetching in a thread pool since youtube_transcript_api is synchronous
-            loop = asyncio.get_event_loop()
-            transcript_list = await loop.run_in_executor(
-                None, YouTubeTranscriptApi.get_transcript, video_id
-            )
-            
-            if not transcript_list:
-                return None
+    def _transcript_limit(self) -> asyncio.Semaphore:
+        """Concurrency limit for transcript fetches on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._transcript_semaphore_loop is not loop:
+            self._transcript_semaphore_loop = loop
+            self._transcript_semaphore = asyncio.Semaphore(settings.YOUTUBE_TRANSCRIPT_CONCURRENCY)
+        return self._transcript_semaphore
 
-            full_text = " ".join(entry['text'] for entry in transcript_list)
-            
-            # Get transcript info
-            transcript_info = await loop.run_in_executor(
-                None, YouTubeTranscriptApi.list_transcripts, video_id
-            )
-            language = transcript_info.find_generated_transcript(['en']).language_code
-            is_generated = transcript_info.find_generated_transcript(['en']).is_generated
-
-            print(f"  ✓ Transcript acquired ({language})")
-            return {
-                'content': full_text,
-                'language': language,
-                'is_generated': is_generated
-            }
+    def _fetch_transcript_sync(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """List a video's transcripts once, pick the best track and fetch it"""
+        transcript_list = get_thread_transcript_api().list(video_id)
+        # find_transcript prefers manually created tracks over generated ones
+        transcript = transcript_list.find_transcript(settings.YOUTUBE_TRANSCRIPT_LANGUAGES)
+        snippets = transcript.fetch()
+        
+        if not snippets:
+            return None
+        
+        return {
+            'content': " ".join(snippet.text for snippet in snippets),
+            'language': transcript.language_code,
+            'is_generated': transcript.is_generated,
+            'segments': [
+                (round(snippet.start * 1000), round(snippet.duration * 1000), snippet.text)
+                for snippet in snippets
+            ]
+        }
+
+    def fetch_transcript(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single video's transcript from synchronous code"""
+        return run_async(self._fetch_transcript(video_id))
+
+    async def _fetch_transcript(self, video_id: str, stats: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch transcript for a video asynchronously.
+        
+        Runs on the dedicated transcript executor so transcript I/O can't starve
+        the database writes on the default executor. When given, stats is
+        updated with 'fetched', 'failed' and 'seconds' totals, and videos that
+        permanently have no transcript are appended to stats['unavailable'].
+        """
+        started = time.monotonic()
+        transcript_data = None
+        try:
+            async with self._transcript_limit():
+                transcript_data = await asyncio.get_running_loop().run_in_executor(
+                    get_transcript_executor(), self._fetch_transcript_sync, video_id
+                )
+            if transcript_data:
+                print(f"  ✓ Transcript acquired ({transcript_data['language']})")
 
         except Exception as e:
             if "Subtitles are disabled for this video" in str(e):
@@ -61,36 +154,64 @@ class YouTubeService:
                 print(f"  × No transcript available for video {video_id}")
             else:
                 print(f"  × Error fetching transcript for video {video_id}: {str(e)}")
-            return None
+            
+            if stats is not None and isinstance(e, PERMANENT_TRANSCRIPT_ERRORS):
+                stats['unavailable'].append(video_id)
+
+        if stats is not None:
+            stats['fetched' if transcript_data else 'failed'] += 1
+            stats['seconds'] += time.monotonic() - started
+        return transcript_data
 
     async def _process_video_batch(
         self,
         session: aiohttp.ClientSession,
         videos_batch: List[Dict],
         channel: Channel,
-        processed_count: int
-    ) -> List[Dict]:
-        """Process a batch of videos concurrently"""
+        processed_count: int,
+        job: Optional[IngestionJob] = None
+    ) -> List[Video]:
+        """Process a batch of videos concurrently and write the page in one transaction"""
         # Get video IDs for this batch
         video_ids = [item['contentDetails']['videoId'] for item in videos_batch]
         
         # Fetch video details
         video_details = await self._fetch_video_details_batch(session, video_ids)
         details_map = {v['id']: v for v in video_details}
+        # Deleted or private videos (or ones a partial response dropped) come back without
+        # details; saving them would overwrite their stored counts with zeros
+        errors = [
+            f"{video_id}: not returned by videos.list, skipped"
+            for video_id in video_ids if video_id not in details_map
+        ]
+        if errors:
+            print(f"Skipping {len(errors)} videos without details")
+            videos_batch = [item for item in videos_batch if item['contentDetails']['videoId'] in details_map]
+            video_ids = [video_id for video_id in video_ids if video_id in details_map]
+        transcript_stats = {'fetched': 0, 'failed': 0, 'skipped': 0, 'seconds': 0.0, 'unavailable': []}
         
-        # Process videos concurrently
+        # Don't spend transcript calls on videos that have one or can't produce one
+        skip_transcripts = await asyncio.get_event_loop().run_in_executor(
+            None, self._videos_to_skip_transcripts, video_ids
+        )
+        
+        # Fetch details and transcripts concurrently; database writes happen once per page
         async def process_video(item):
             video_id = item['contentDetails']['videoId']
-            details = details_map.get(video_id, {})
+            details = details_map[video_id]
             
             print(f"Processing video {video_id} - '{item['snippet']['title']}'")
-            print(f"  Attempting to fetch transcript...")
             
             # Fetch transcript
-            transcript_data = await self._fetch_transcript(video_id)
+            transcript_data = None
+            if video_id in skip_transcripts:
+                transcript_stats['skipped'] += 1
+            else:
+                print("  Attempting to fetch transcript...")
+                transcript_data = await self._fetch_transcript(video_id, transcript_stats)
             
             video_data = {
-                'youtube_id': video_id,  # Keep youtube_id in the dictionary
+                'youtube_id': video_id,
                 'title': item['snippet']['title'],
                 'description': item['snippet']['description'],
                 'published_at': item['contentDetails']['videoPublishedAt'],
@@ -98,64 +219,140 @@ class YouTubeService:
                 'like_count': int(details.get('statistics', {}).get('likeCount', 0)),
                 'duration': self._parse_duration(details.get('contentDetails', {}).get('duration', 'PT0S'))
             }
-            
-            # Save to database
-            try:
-                # Update or create video
-                video, created = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: Video.objects.update_or_create(
-                        youtube_id=video_id,
-                        defaults={
-                            'channel': channel,
-                            **{k: v for k, v in video_data.items() if k != 'youtube_id'}
-                        }
-                    )
-                )
-                
-                # Create metrics record
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: VideoMetrics.objects.create(
-                        video=video,
-                        view_count=video_data['view_count'],
-                        like_count=video_data['like_count']
-                    )
-                )
-                
-                # Create transcript if available
-                if transcript_data:
-                    await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: Transcript.objects.get_or_create(
-                            video=video,
-                            defaults=transcript_data
-                        )
-                    )
-                
-            except Exception as e:
-                print(f"Error processing video {video_id}: {str(e)}")
-                # Continue processing other videos even if one fails
-            
-            return video_data  # Return the complete video data including youtube_id
+            return video_data, transcript_data
         
         # Process all videos in this batch concurrently
         results = await asyncio.gather(*[
             process_video(item) for item in videos_batch
         ])
         
-        new_count = processed_count + len(results)
+        attempted = transcript_stats['fetched'] + transcript_stats['failed']
+        average = transcript_stats['seconds'] / attempted if attempted else 0
+        print(
+            f"Transcripts: {transcript_stats['fetched']} fetched, {transcript_stats['failed']} failed, "
+            f"{transcript_stats['skipped']} skipped, {average:.2f}s average"
+        )
+        
+        if transcript_stats['unavailable']:
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: cache.set_many(
+                    {NO_TRANSCRIPT_CACHE_KEY.format(video_id): True for video_id in transcript_stats['unavailable']},
+                    timeout=settings.YOUTUBE_TRANSCRIPT_NEGATIVE_TTL
+                )
+            )
+        
+        videos = []
+        transcript_count = 0
+        try:
+            if results:
+                videos, transcript_count = await asyncio.get_event_loop().run_in_executor(
+                    None, self._save_video_batch, channel, results
+                )
+        except Exception as e:
+            print(f"Error saving batch of {len(results)} videos: {str(e)}")
+            errors.append(f"{', '.join(video_ids)}: {str(e)}")
+        
+        new_count = processed_count + len(videos)
         print(f"Processed {new_count} videos so far...")
-        return results
-    def save_playlist_videos(self, playlist_id: str) -> List[Video]:
-        """Save or update all videos from a playlist including transcripts"""
-        from asgiref.sync import async_to_sync
         
+        if job is not None:
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: job.record_progress(
+                    pages=1,
+                    videos=len(videos),
+                    transcripts=transcript_count,
+                    transcripts_failed=transcript_stats['failed'],
+                    errors=errors
+                )
+            )
+        return videos
+
+    def _videos_to_skip_transcripts(self, video_ids: List[str]) -> set:
+        """YouTube IDs in a page that already have a stored transcript or are known to have none"""
+        stored = set(
+            Transcript.objects.filter(video__youtube_id__in=video_ids)
+            .values_list('video__youtube_id', flat=True)
+        )
+        unavailable = cache.get_many([NO_TRANSCRIPT_CACHE_KEY.format(video_id) for video_id in video_ids])
+        return stored | {video_id for video_id in video_ids if NO_TRANSCRIPT_CACHE_KEY.format(video_id) in unavailable}
+
+    def _save_video_batch(self, channel: Channel, results: List[Tuple[Dict, Optional[Dict]]]) -> Tuple[List[Video], int]:
+        """
+        Upsert a page of videos with their metrics snapshots and new transcripts.
+        
+        Returns the saved Video instances (in page order) and the number of
+        transcripts created.
+        """
+        # Tokenizing and adding new terms to the shared vocabulary stay out of the page transaction
+        term_counts = prepare_term_counts(
+            (video_data['youtube_id'], transcript_data['content'])
+            for video_data, transcript_data in results if transcript_data
+        )
+        with transaction.atomic():
+            # Looked up by youtube_id alone: a playlist ingest can move a video to another channel
+            previous, previous_channels = {}, {}
+            for youtube_id, channel_id, view_count, like_count in Video.objects.filter(
+                youtube_id__in=[video_data['youtube_id'] for video_data, _ in results]
+            ).values_list('youtube_id', 'channel_id', 'view_count', 'like_count'):
+                previous[youtube_id] = (view_count, like_count)
+                previous_channels[youtube_id] = channel_id
+            Video.objects.bulk_create(
+                [Video(channel=channel, **video_data) for video_data, _ in results],
+                update_conflicts=True,
+                unique_fields=['youtube_id'],
+                update_fields=[
+                    'channel', 'title', 'description', 'published_at',
+                    'view_count', 'like_count', 'duration', 'updated_at'
+                ]
+            )
+            
+            # Conflicting rows don't get their primary keys back, so reload the page
+            video_map = Video.objects.in_bulk(
+                [video_data['youtube_id'] for video_data, _ in results],
+                field_name='youtube_id'
+            )
+            videos = [video_map[video_data['youtube_id']] for video_data, _ in results]
+            apply_video_changes(videos, previous, previous_channels)
+            invalidate_channels({channel.id, *previous_channels.values()})
+            forget_video_channels(
+                video.pk for video in videos if previous_channels.get(video.youtube_id, channel.id) != channel.id
+            )
+            
+            apply_snapshots(VideoMetrics.objects.bulk_create([
+                VideoMetrics(
+                    video=video,
+                    view_count=video.view_count,
+                    like_count=video.like_count
+                )
+                for video in videos
+            ]))
+            
+            has_transcript = set(
+                Transcript.objects.filter(video__in=videos).values_list('video_id', flat=True)
+            )
+            new_transcripts = create_transcripts(
+                [
+                    (video, transcript_data)
+                    for video, (_, transcript_data) in zip(videos, results)
+                    if transcript_data and video.id not in has_transcript
+                ],
+                term_counts
+            )
+        
+        return videos, len(new_transcripts)
+    def save_playlist_videos(self, playlist_id: str, job: Optional[IngestionJob] = None) -> List[Video]:
+        """Save or update all videos from a playlist including transcripts"""
+                
         # First get playlist info
-        playlist_info = self.youtube.playlists().list(
-            part="snippet",
-            id=playlist_id
-        ).execute()
+        playlist_info = api_execute(
+            self.youtube.playlists().list(
+                part="snippet",
+                id=playlist_id
+            ),
+            'playlists.list'
+        )
         
         if not playlist_info.get('items'):
             raise ValueError(f"No playlist found for ID: {playlist_id}")
@@ -175,181 +372,306 @@ class YouTubeService:
                 'video_count': channel_data['video_count']
             }
         )
+        invalidate_channels([channel.id])
         
-        # Run async video collection using async_to_sync and return the Video objects
-        video_dicts = async_to_sync(self._get_playlist_videos_async)(playlist_id, channel)
+        if job is not None:
+            job.channel = channel
+            job.save(update_fields=['channel'])
         
-        # Convert the dictionaries to Video objects
-        videos = []
-        for video_data in video_dicts:
-            video, created = Video.objects.update_or_create(
-                youtube_id=video_data['youtube_id'],
-                defaults={
-                    'channel': channel,
-                    'title': video_data['title'],
-                    'description': video_data['description'],
-                    'published_at': video_data['published_at'],
-                    'view_count': video_data['view_count'],
-                    'like_count': video_data['like_count'],
-                    'duration': video_data['duration']
-                }
-            )
-            videos.append(video)
-        
-        return videos
+        # Run async video collection on the shared loop; batches return the saved Video objects
+        return run_async(self._get_playlist_videos_async(playlist_id, channel, job=job))
     
-    async def _get_playlist_videos_async(self, playlist_id: str, channel: Channel, max_results: int = None, timeout: int = 30) -> List[Dict]:
-        """Fetch all videos from a playlist asynchronously with timeout"""
-        import logging
-        logger = logging.getLogger(__name__)
-        print(f"Starting video collection for playlist {playlist_id}")
+    async def _fetch_playlist_page(self, session: aiohttp.ClientSession, playlist_id: str, page_token: Optional[str] = None) -> Dict:
+        """Fetch one page of playlist items directly over aiohttp"""
+        url = f"{self.base_url}/playlistItems"
+        params = {
+            'key': self.api_key,
+            'part': 'snippet,contentDetails',
+            'playlistId': playlist_id,
+            'maxResults': 50
+        }
+        if page_token:
+            params['pageToken'] = page_token
         
-        videos = []
+        return await api_get(session, url, 'playlistItems.list', params)
+
+    async def _produce_playlist_pages(
+        self,
+        session: aiohttp.ClientSession,
+        playlist_id: str,
+        queue: asyncio.Queue,
+        max_results: int = None,
+        max_total: int = None,
+        skip_known: bool = False
+    ) -> None:
+        """
+        Walk playlist pages ahead of processing, blocking when the queue is full.
+        
+        With skip_known, videos already in the database are left out and walking
+        stops at the first page made up entirely of known videos.
+        """
         next_page_token = None
-        processed_count = 0
+        fetched = 0
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            # First, get total count
-            initial_response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.youtube.playlistItems().list(
-                    part="snippet",
-                    playlistId=playlist_id,
-                    maxResults=1
-                ).execute()
-            )
-            total_videos = int(initial_response.get('pageInfo', {}).get('totalResults', 0))
-            logger.info(f"Total videos in playlist: {total_videos}")
+        while True:
+            response = await self._fetch_playlist_page(session, playlist_id, next_page_token)
             
-            if total_videos > 500:  # Set a reasonable limit
-                raise ValueError(f"Playlist too large ({total_videos} videos). Maximum supported is 500.")
-            logger.info(f"Starting playlist processing: {playlist_id}")
-            while True:
-                # Get playlist items
-                response = await asyncio.get_event_loop().run_in_executor(
+            if max_total and next_page_token is None:
+                total_videos = int(response.get('pageInfo', {}).get('totalResults', 0))
+                if total_videos > max_total:
+                    raise ValueError(f"Playlist too large ({total_videos} videos). Maximum supported is {max_total}.")
+            
+            if not response.get('items'):
+                break
+            
+            items = response['items']
+            fetched += len(items)
+            if skip_known:
+                page_ids = [item['contentDetails']['videoId'] for item in items]
+                known = await asyncio.get_event_loop().run_in_executor(
                     None,
-                    lambda: self.youtube.playlistItems().list(
-                        part="snippet,contentDetails",
-                        playlistId=playlist_id,
-                        maxResults=50,
-                        pageToken=next_page_token
-                    ).execute()
-                )
-                
-                if not response.get('items'):
-                    break
-                
-                print(f"Fetching details for batch of {len(response['items'])} videos...")
-                batch_results = await self._process_video_batch(
-                    session,
-                    response['items'],
-                    channel,
-                    processed_count
+                    lambda: set(Video.objects.filter(youtube_id__in=page_ids).values_list('youtube_id', flat=True))
                 )
-                videos.extend(batch_results)
-                processed_count += len(batch_results)
-                
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token or (max_results and len(videos) >= max_results):
+                if len(known) == len(set(page_ids)):
+                    print(f"Reached already known uploads after {fetched} videos, stopping")
                     break
+                items = [item for item in items if item['contentDetails']['videoId'] not in known]
+            
+            await queue.put(items)
+            
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token or (max_results and fetched >= max_results):
+                break
+
+    async def _stream_playlist_videos(
+        self,
+        playlist_id: str,
+        channel: Channel,
+        max_results: int = None,
+        max_total: int = None,
+        max_in_flight: int = None,
+        skip_known: bool = False,
+        job: Optional[IngestionJob] = None
+    ) -> AsyncIterator[List[Video]]:
+        """
+        Ingest a playlist and yield the saved videos page by page.
         
-        print(f"Completed playlist video collection. Processed {len(videos)} videos total.")
-        return videos[:max_results] if max_results else videos
-    async def _get_playlist_videos_async(self, playlist_id: str, channel: Channel, max_results: int = None) -> List[Dict]:
-        """Fetch all videos from a playlist asynchronously"""
-        print(f"Starting video collection for playlist {playlist_id}")
+        A producer prefetches up to YOUTUBE_PIPELINE_PREFETCH_PAGES pages while at
+        most max_in_flight pages are processed concurrently, so memory is bounded
+        by those two numbers rather than by the size of the playlist. Pages are
+        yielded in playlist order.
+        """
+        max_in_flight = max_in_flight or settings.YOUTUBE_INGEST_MAX_IN_FLIGHT
+        pages = asyncio.Queue(maxsize=settings.YOUTUBE_PIPELINE_PREFETCH_PAGES)
+        session = await get_http_session()
         
-        videos = []
-        next_page_token = None
+        async def produce():
+            try:
+                await self._produce_playlist_pages(session, playlist_id, pages, max_results, max_total, skip_known)
+            except Exception as e:
+                await pages.put(e)
+                return
+            await pages.put(None)
+        
+        producer = asyncio.create_task(produce())
+        in_flight = deque()
         processed_count = 0
+        remaining = max_results
         
-        async with aiohttp.ClientSession() as session:
+        try:
             while True:
-                # Get playlist items
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.youtube.playlistItems().list(
-                        part="snippet,contentDetails",
-                        playlistId=playlist_id,
-                        maxResults=50,
-                        pageToken=next_page_token
-                    ).execute()
-                )
-                
-                if not response.get('items'):
+                items = await pages.get()
+                if items is None:
                     break
+                if isinstance(items, Exception):
+                    raise items
                 
-                print(f"Fetching details for batch of {len(response['items'])} videos...")
-                batch_results = await self._process_video_batch(
-                    session,
-                    response['items'],
-                    channel,
-                    processed_count
-                )
-                videos.extend(batch_results)
-                processed_count += len(batch_results)
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
                 
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token or (max_results and len(videos) >= max_results):
-                    break
+                print(f"Fetching details for batch of {len(items)} videos...")
+                in_flight.append(asyncio.create_task(
+                    self._process_video_batch(session, items, channel, processed_count, job=job)
+                ))
+                processed_count += len(items)
+                
+                if len(in_flight) >= max_in_flight:
+                    yield await in_flight.popleft()
+            
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            producer.cancel()
+            for task in in_flight:
+                task.cancel()
+
+    async def _get_playlist_videos_async(self, playlist_id: str, channel: Channel, max_results: int = None, job: Optional[IngestionJob] = None) -> List[Video]:
+        """Fetch all videos from a playlist asynchronously"""
+        print(f"Starting video collection for playlist {playlist_id}")
+        
+        videos = []
+        async for page in self._stream_playlist_videos(
+            playlist_id,
+            channel,
+            max_results=max_results,
+            max_total=settings.YOUTUBE_PLAYLIST_MAX_VIDEOS,
+            job=job
+        ):
+            videos.extend(page)
         
         print(f"Completed playlist video collection. Processed {len(videos)} videos total.")
-        return videos[:max_results] if max_results else videos
+        return videos
 
-    async def _get_channel_videos_async(self, channel_id: str, channel: Channel, max_results: int = None) -> List[Dict]:
-        """Fetch all videos for a channel asynchronously"""
+    async def _get_channel_videos_async(
+        self,
+        channel_id: str,
+        channel: Channel,
+        max_results: int = None,
+        incremental: bool = False,
+        job: Optional[IngestionJob] = None
+    ) -> int:
+        """
+        Fetch all videos for a channel asynchronously and return how many were saved.
+        
+        In incremental mode only uploads newer than the ones already stored are
+        ingested; the statistics of the known videos are refreshed afterwards.
+        """
         print(f"Starting video collection for channel {channel_id}")
         
         # Get uploads playlist ID
         playlist_id = (await asyncio.get_event_loop().run_in_executor(
             None,
-            lambda: self.youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            ).execute()
+            lambda: api_execute(
+                self.youtube.channels().list(
+                    part="contentDetails",
+                    id=channel_id
+                ),
+                'channels.list'
+            )
         ))['items'][0]['contentDetails']['relatedPlaylists']['uploads']
         
-        videos = []
-        next_page_token = None
-        processed_count = 0
+        # Only count the pages; the saved videos are dropped as soon as they are yielded.
+        # Incremental syncs also remember the (few) new videos so they aren't refreshed twice.
+        video_count = 0
+        new_video_ids = set()
+        async for page in self._stream_playlist_videos(
+            playlist_id,
+            channel,
+            max_results=max_results,
+            skip_known=incremental,
+            job=job
+        ):
+            video_count += len(page)
+            if incremental:
+                new_video_ids.update(video.pk for video in page)
         
-        async with aiohttp.ClientSession() as session:
-            while True:
-                # Get playlist items
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.youtube.playlistItems().list(
-                        part="snippet,contentDetails",
-                        playlistId=playlist_id,
-                        maxResults=50,
-                        pageToken=next_page_token
-                    ).execute()
-                )
-                
-                if not response.get('items'):
-                    break
-                
-                print(f"Fetching details for batch of {len(response['items'])} videos...")
-                batch_results = await self._process_video_batch(
-                    session,
-                    response['items'],
-                    channel,
-                    processed_count
+        print(f"Completed video collection. Processed {video_count} videos total.")
+        
+        if incremental:
+            known_videos = await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: list(
+                    Video.objects.filter(channel=channel)
+                    .exclude(pk__in=new_video_ids)
+                    .values_list('id', 'youtube_id')
                 )
-                videos.extend(batch_results)
-                processed_count += len(batch_results)
-                
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token or (max_results and len(videos) >= max_results):
-                    break
+            )
+            refreshed = await self._refresh_video_stats(known_videos)
+            print(f"Refreshed statistics for {refreshed} known videos.")
+        
+        return video_count
+
+    def refresh_channel_metrics(self, channel: Channel) -> int:
+        """Refresh view and like counts for every stored video of a channel"""
+        videos = list(Video.objects.filter(channel=channel).values_list('id', 'youtube_id'))
+        refreshed = run_async(self._refresh_video_stats(videos))
+        print(f"Refreshed statistics for {refreshed} of {len(videos)} videos in {channel.title}.")
+        return refreshed
+
+    def snapshot_due_metrics(self, budget_units: int = None) -> int:
+        """
+        Take VideoMetrics snapshots for the videos due in their age tier.
+        
+        Each videos.list call costs one quota unit and covers 50 videos, so a run
+        snapshots at most budget_units * 50 videos.
+        """
+        budget_units = budget_units or settings.YOUTUBE_SNAPSHOT_BUDGET_UNITS
+        videos = list(videos_due_for_snapshot().values_list('id', 'youtube_id')[:budget_units * 50])
+        refreshed = run_async(self._refresh_video_stats(videos))
+        print(f"Snapshotted {refreshed} of {len(videos)} due videos.")
+        return refreshed
+
+    async def _refresh_video_stats(self, videos: List[Tuple[int, str]]) -> int:
+        """
+        Refresh view and like counts for (pk, youtube_id) pairs with 50-ID videos.list calls.
+        
+        Chunks are fetched concurrently (up to YOUTUBE_REFRESH_CONCURRENCY at a time)
+        over one session, then written with a few large bulk queries. Videos missing
+        from the responses (deleted or private) are left untouched.
+        """
+        if not videos:
+            return 0
+        
+        limit = asyncio.Semaphore(settings.YOUTUBE_REFRESH_CONCURRENCY)
+        session = await get_http_session()
+        
+        async def fetch_chunk(chunk):
+            async with limit:
+                return await self._fetch_video_details_batch(session, [youtube_id for _, youtube_id in chunk])
         
-        print(f"Completed video collection. Processed {len(videos)} videos total.")
-        return videos[:max_results] if max_results else videos
+        chunks = await asyncio.gather(*[
+            fetch_chunk(videos[start:start + 50]) for start in range(0, len(videos), 50)
+        ])
+        
+        details = [item for chunk in chunks for item in chunk]
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self._save_video_stats, videos, details
+        )
+
+    def _save_video_stats(self, videos: List[Tuple[int, str]], details: List[Dict]) -> int:
+        """Write fresh statistics for the given videos, snapshot them in VideoMetrics and update ChannelStats"""
+        stats_map = {item['id']: item.get('statistics', {}) for item in details}
+        now = timezone.now()
+        
+        with transaction.atomic():
+            current = Video.objects.only(
+                'channel_id', 'youtube_id', 'title', 'published_at', 'view_count', 'like_count'
+            ).in_bulk([pk for pk, youtube_id in videos if youtube_id in stats_map])
+            previous = {}
+            updated = []
+            for video in current.values():
+                previous[video.youtube_id] = (video.view_count, video.like_count)
+                video.view_count = int(stats_map[video.youtube_id].get('viewCount', 0))
+                video.like_count = int(stats_map[video.youtube_id].get('likeCount', 0))
+                video.updated_at = now
+                updated.append(video)
 
-    def save_channel_with_videos(self, identifier: str) -> Channel:
-        """Save or update a channel and all its videos including transcripts"""
-        from asgiref.sync import async_to_sync
+            Video.objects.bulk_update(
+                updated,
+                ['view_count', 'like_count', 'updated_at'],
+                batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+            )
+            snapshots = VideoMetrics.objects.bulk_create(
+                [
+                    VideoMetrics(video_id=video.pk, view_count=video.view_count, like_count=video.like_count)
+                    for video in updated
+                ],
+                batch_size=settings.YOUTUBE_BULK_BATCH_SIZE
+            )
+            apply_snapshots(snapshots)
+            apply_video_changes(updated, previous)
+            invalidate_channels({video.channel_id for video in updated})
+        return len(updated)
+
+    def save_channel_with_videos(self, identifier: str, job: Optional[IngestionJob] = None, incremental: bool = False) -> Channel:
+        """
+        Save or update a channel and all its videos including transcripts.
         
+        With incremental=True, pagination stops at the first page of uploads that
+        are all stored already, and the known videos only get their statistics refreshed.
+        """
+                
         # Get channel data
         channel_data = self.get_channel_data(identifier)
         
@@ -363,9 +685,16 @@ class YouTubeService:
                 'video_count': channel_data['video_count']
             }
         )
+        invalidate_channels([channel.id])
+        
+        if job is not None:
+            job.channel = channel
+            job.save(update_fields=['channel'])
         
-        # Run async video collection using async_to_sync
-        async_to_sync(self._get_channel_videos_async)(channel_data['youtube_id'], channel)
+        # Run async video collection on the shared loop
+        run_async(self._get_channel_videos_async(
+            channel_data['youtube_id'], channel, incremental=incremental, job=job
+        ))
         
         return channel
 
@@ -376,9 +705,9 @@ class YouTubeService:
             part="snippet,statistics",
             **({'forHandle': identifier[1:]} if identifier.startswith('@') else {'id': identifier})
         )
-        response = request.execute()
+        response = api_execute(request, 'channels.list')
 
-        if not response['items']:
+        if not response.get('items'):
             raise ValueError(f"No channel found for: {identifier}")
         
         channel_data = response['items'][0]
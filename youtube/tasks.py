@@ -0,0 +1,94 @@
+from celery import shared_task
+from django.utils import timezone
+from .models import IngestionJob
+
+# services.youtube pulls in googleapiclient, aiohttp and youtube_transcript_api; it is
+# imported inside each task so the web process can import this module to call .delay()
+
+
+def _run_job(job_id: int, run):
+    """Mark a job running, execute it and store the final result or error"""
+    job = IngestionJob.objects.get(pk=job_id)
+    job.status = IngestionJob.STATUS_RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    try:
+        result = run(job)
+    except Exception as e:
+        job.refresh_from_db()
+        job.status = IngestionJob.STATUS_FAILED
+        job.errors = (job.errors or []) + [str(e)]
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'errors', 'finished_at'])
+        return {'job': job_id, 'status': job.status}
+
+    job.refresh_from_db()
+    job.status = IngestionJob.STATUS_SUCCEEDED
+    job.result = result
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'finished_at'])
+
+    # The ingest bumped the channel's analytics version; recompute its hot dashboards now
+    if result.get('channel'):
+        warm_analytics_cache.delay([result['channel']])
+    return {'job': job_id, 'status': job.status}
+
+
+@shared_task
+def ingest_channel(job_id: int, incremental: bool = False):
+    """Import a channel and its uploads (only the new ones when incremental) for an IngestionJob"""
+    def run(job):
+        from .services.youtube import get_youtube_service
+
+        youtube_service = get_youtube_service()
+        channel = youtube_service.save_channel_with_videos(job.identifier, job=job, incremental=incremental)
+        return {
+            'channel': channel.id,
+            'youtube_id': channel.youtube_id,
+            'title': channel.title,
+            'incremental': incremental,
+        }
+
+    return _run_job(job_id, run)
+
+
+@shared_task
+def ingest_playlist(job_id: int):
+    """Import every video of a playlist for an IngestionJob"""
+    def run(job):
+        from .services.youtube import get_youtube_service
+
+        youtube_service = get_youtube_service()
+        videos = youtube_service.save_playlist_videos(job.identifier, job=job)
+        return {
+            'channel': job.channel_id,
+            'videos': [video.id for video in videos],
+        }
+
+    return _run_job(job_id, run)
+
+
+@shared_task
+def snapshot_metrics(budget_units: int = None):
+    """Periodic (Celery beat) VideoMetrics snapshot of the videos due in their age tier"""
+    from .services.youtube import get_youtube_service
+
+    youtube_service = get_youtube_service()
+    return {'snapshotted': youtube_service.snapshot_due_metrics(budget_units)}
+
+
+@shared_task
+def maintain_metrics_partitions():
+    """Daily (Celery beat) creation of upcoming VideoMetrics partitions; a no-op unless partitioned"""
+    from .services.partitions import ensure_partitions
+
+    return {'created': ensure_partitions()}
+
+
+@shared_task
+def warm_analytics_cache(channel_ids):
+    """Recompute cached analytics responses of channels that are requested often"""
+    from .api.analytics_cache import warm_channels
+
+    return {'warmed': warm_channels(channel_ids)}
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from youtube.models import Channel
+from youtube.services import analytics_cache
+from youtube.services.channel_stats import rebuild_channel_stats
+
+CACHE_ENABLED = {**settings.YOUTUBE_ANALYTICS_CACHE, 'ENABLED': True, 'STALE_WHILE_REVALIDATE': False}
+
+
+class AnalyticsCacheTests(TestCase):
+    def setUp(self):
+        caches[settings.YOUTUBE_ANALYTICS_CACHE['ALIAS']].clear()
+        self.channel = Channel.objects.create(youtube_id='UCcached', title='Cached')
+        rebuild_channel_stats([self.channel.pk])
+
+    def test_writes_bump_channel_and_list_versions_on_commit(self):
+        other = analytics_cache.channel_scope(self.channel.pk + 1)
+        scopes = [analytics_cache.channel_scope(self.channel.pk), other, analytics_cache.ALL_SCOPE]
+        before = analytics_cache.get_versions(scopes)
+        with self.captureOnCommitCallbacks(execute=True):
+            analytics_cache.invalidate_channels([self.channel.pk])
+        after = analytics_cache.get_versions(scopes)
+        self.assertNotEqual(after[scopes[0]], before[scopes[0]])
+        self.assertEqual(after[other], before[other])
+        self.assertNotEqual(after[analytics_cache.ALL_SCOPE], before[analytics_cache.ALL_SCOPE])
+
+    @override_settings(YOUTUBE_ANALYTICS_CACHE=CACHE_ENABLED)
+    def test_responses_are_cached_until_their_channel_changes(self):
+        url = f'/api/channel-analytics/{self.channel.pk}/'
+        self.assertEqual(self.client.get(url)['X-Analytics-Cache'], 'miss')
+        self.assertEqual(self.client.get(url)['X-Analytics-Cache'], 'hit')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            analytics_cache.invalidate_channels([self.channel.pk])
+        self.assertEqual(self.client.get(url)['X-Analytics-Cache'], 'miss')
+
+    def test_disabled_cache_is_bypassed(self):
+        response = self.client.get(f'/api/channel-analytics/{self.channel.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('X-Analytics-Cache'))
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from youtube.models import Channel, Video
+from youtube.services.channel_stats import rebuild_channel_stats
+
+
+class ChannelAnalyticsQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(8):
+            channel = Channel.objects.create(youtube_id=f'UCq{index}', title=f'Channel {index}')
+            for video in range(3):
+                Video.objects.create(
+                    youtube_id=f'q{index}-{video}', channel=channel, title=f'Video {video}',
+                    published_at=datetime(2026, 2, 1 + video, tzinfo=timezone.utc),
+                    view_count=100 * video, like_count=video, duration=1
+                )
+        rebuild_channel_stats(list(Channel.objects.values_list('pk', flat=True)))
+
+    def query_count(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_listing_query_count_does_not_grow_with_page_size(self):
+        small, _ = self.query_count('/api/channel-analytics/?page_size=2')
+        large, page = self.query_count('/api/channel-analytics/?page_size=8')
+        self.assertEqual(small, large)
+        self.assertEqual(len(page['results']), 8)
+
+    def test_listing_values(self):
+        _, page = self.query_count('/api/channel-analytics/?page_size=1')
+        channel = page['results'][0]
+        self.assertEqual(
+            (channel['stored_video_count'], channel['total_view_count'], channel['avg_view_count']),
+            (3, 300, 100)
+        )
+        self.assertEqual([video['youtube_id'] for video in channel['top_videos']], ['q0-2', 'q0-1', 'q0-0'])
+        self.assertEqual(len(channel['publishing_dates']), 3)
@@ -0,0 +1,102 @@
+import importlib
+from datetime import datetime, timezone
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from youtube.models import Channel, ChannelStats, Video
+from youtube.services.channel_stats import build_channel_stats
+from .utils import make_service
+
+
+def video_data(index: int, views: int) -> dict:
+    return {
+        'youtube_id': f'vid{index}',
+        'title': f'Video {index}',
+        'description': '',
+        'published_at': datetime(2026, 3, 1 + index % 4, tzinfo=timezone.utc),
+        'view_count': views,
+        'like_count': views // 10,
+        'duration': 60,
+    }
+
+
+def stats_row(stats: ChannelStats) -> tuple:
+    return (
+        stats.video_count, stats.total_views, stats.total_likes, round(stats.avg_views, 6),
+        stats.last_upload_at, stats.top_videos, stats.publishing_dates
+    )
+
+
+class ChannelStatsDeltaTests(TestCase):
+    def setUp(self):
+        self.service = make_service()
+        self.first = Channel.objects.create(youtube_id='UCfirst', title='First')
+        self.second = Channel.objects.create(youtube_id='UCsecond', title='Second')
+
+    def assertMatchesRebuild(self, channel):
+        rebuilt = build_channel_stats([channel.pk])[0]
+        self.assertEqual(stats_row(ChannelStats.objects.get(pk=channel.pk)), stats_row(rebuilt))
+
+    def test_inserts_and_updates(self):
+        self.service._save_video_batch(self.first, [(video_data(i, i * 100), None) for i in range(8)])
+        self.assertMatchesRebuild(self.first)
+        self.service._save_video_batch(self.first, [(video_data(i, i * 100 + 7), None) for i in range(5, 12)])
+        self.assertMatchesRebuild(self.first)
+
+    def test_metrics_refresh_with_tied_views(self):
+        self.service._save_video_batch(self.first, [(video_data(i, i * 100), None) for i in range(6)])
+        pairs = list(Video.objects.filter(channel=self.first).values_list('pk', 'youtube_id')[:3])
+        self.service._save_video_stats(
+            pairs, [{'id': youtube_id, 'statistics': {'viewCount': '5000', 'likeCount': '9'}} for _, youtube_id in pairs]
+        )
+        self.assertMatchesRebuild(self.first)
+
+    def test_videos_moving_between_channels(self):
+        self.service._save_video_batch(self.first, [(video_data(i, i * 100), None) for i in range(6)])
+        self.service._save_video_batch(self.second, [(video_data(i, i * 50), None) for i in range(4, 9)])
+        self.assertMatchesRebuild(self.first)
+        self.assertMatchesRebuild(self.second)
+        self.service._save_video_batch(self.second, [(video_data(i, i * 50), None) for i in range(4)])
+        self.assertMatchesRebuild(self.first)
+        self.assertMatchesRebuild(self.second)
+
+
+class MissingChannelStatsTests(TestCase):
+    """Channels that predate ChannelStats, or whose row was never written"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(8):
+            channel = Channel.objects.create(youtube_id=f'UCm{index}', title=f'Channel {index}')
+            Video.objects.create(
+                youtube_id=f'm{index}', channel=channel, title='Video', view_count=10 * index, like_count=1,
+                published_at=datetime(2026, 2, 1, tzinfo=timezone.utc), duration=1
+            )
+        ChannelStats.objects.all().delete()
+
+    def test_listing_builds_the_page_in_one_go_and_saves_it(self):
+        counts = []
+        for page_size in (2, 8):
+            ChannelStats.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f'/api/channel-analytics/?page_size={page_size}')
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+            self.assertEqual(ChannelStats.objects.count(), page_size)
+        self.assertEqual(counts[0], counts[1])
+
+        results = self.client.get('/api/channel-analytics/?page_size=8').json()['results']
+        self.assertEqual([channel['total_view_count'] for channel in results], [10 * index for index in range(8)])
+
+    def test_detail_saves_the_row(self):
+        channel = Channel.objects.get(youtube_id='UCm3')
+        response = self.client.get(f'/api/channel-analytics/{channel.pk}/')
+        self.assertEqual(response.json()['total_view_count'], 30)
+        self.assertTrue(ChannelStats.objects.filter(pk=channel.pk).exists())
+
+    def test_migration_backfills_existing_channels(self):
+        migration = importlib.import_module('youtube.migrations.0007_channelstats')
+        migration.backfill_channel_stats(apps, None)
+        self.assertEqual(ChannelStats.objects.count(), 8)
+        self.assertEqual(ChannelStats.objects.get(channel__youtube_id='UCm5').total_views, 50)
@@ -0,0 +1,20 @@
+import threading
+from django.test import SimpleTestCase
+from youtube.services import clients
+
+
+class SharedClientTests(SimpleTestCase):
+    def test_sessions_and_loop_are_reused(self):
+        first = clients.run_async(clients.get_http_session())
+        second = clients.run_async(clients.get_http_session())
+        self.assertIs(first, second)
+        self.assertFalse(first.closed)
+        self.assertIs(clients.get_event_loop(), clients.get_event_loop())
+
+    def test_transcript_clients_are_per_thread(self):
+        apis = []
+        thread = threading.Thread(target=lambda: apis.append(clients.get_thread_transcript_api()))
+        thread.start()
+        thread.join()
+        self.assertIs(clients.get_thread_transcript_api(), clients.get_thread_transcript_api())
+        self.assertIsNot(apis[0], clients.get_thread_transcript_api())
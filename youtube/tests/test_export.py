@@ -0,0 +1,41 @@
+import json
+from datetime import datetime, timezone
+from django.test import TestCase
+from youtube.models import Channel, Video, VideoMetrics
+
+
+class ChannelExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.channel = Channel.objects.create(youtube_id='UCexport', title='Export')
+        cls.videos = [
+            Video.objects.create(
+                youtube_id=f'export{i}', channel=cls.channel, title=f'Video {i}, "quoted"',
+                published_at=datetime(2026, 1, i + 1, tzinfo=timezone.utc), duration=1
+            )
+            for i in range(5)
+        ]
+        for views in (10, 20):
+            VideoMetrics.objects.create(video=cls.videos[1], view_count=views, like_count=0)
+
+    def export(self, query: str = '') -> str:
+        response = self.client.get(f'/api/channels/{self.channel.pk}/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_streams_every_video(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        self.assertEqual([row['youtube_id'] for row in rows], [video.youtube_id for video in self.videos])
+
+    def test_ndjson_with_metrics(self):
+        rows = [json.loads(line) for line in self.export('?metrics=1').splitlines()]
+        self.assertEqual([len(row['metrics']) for row in rows], [0, 2, 0, 0, 0])
+        self.assertEqual([snapshot['view_count'] for snapshot in rows[1]['metrics']], [10, 20])
+
+    def test_csv_has_one_row_per_video(self):
+        self.assertEqual(len(self.export('?output=csv').splitlines()), len(self.videos) + 1)
+        # Videos without snapshots still get a row
+        self.assertEqual(len(self.export('?output=csv&metrics=1').splitlines()), len(self.videos) + 2)
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get(f'/api/channels/{self.channel.pk}/export/?output=xml').status_code, 400)
@@ -0,0 +1,76 @@
+from unittest import mock
+from django.test import TestCase
+from config.celery import app as celery_app
+from youtube.models import Channel, IngestionJob
+from youtube.services.quota import QuotaExceeded
+
+
+class FakeService:
+    """Stands in for YouTubeService, reporting progress like a two-page import"""
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def save_channel_with_videos(self, identifier, job=None, incremental=False):
+        job.record_progress(pages=1, videos=2, transcripts=1)
+        if self.error:
+            raise self.error
+        job.record_progress(pages=1, videos=1, transcripts_failed=1, errors=['v3: transcript failed'])
+        return Channel.objects.create(youtube_id=identifier, title='Imported')
+
+    def save_playlist_videos(self, playlist_id, job=None):
+        job.channel = Channel.objects.create(youtube_id='UCplaylist', title='Owner')
+        job.save(update_fields=['channel'])
+        job.record_progress(pages=1, videos=0)
+        return []
+
+
+class IngestionJobTests(TestCase):
+    def setUp(self):
+        # Run tasks in-process, as with CELERY_TASK_ALWAYS_EAGER=1
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', celery_app.conf.task_always_eager)
+        celery_app.conf.task_always_eager = True
+
+    def run_with(self, service, url):
+        with mock.patch('youtube.services.youtube.get_youtube_service', return_value=service):
+            return self.client.post(url)
+
+    def test_channel_import_is_accepted_and_queued(self):
+        with mock.patch('youtube.api.views.ingest_channel.delay') as delay:
+            response = self.client.post('/api/channels/add_by_url/@someone/?incremental=true')
+        self.assertEqual(response.status_code, 202)
+        job = IngestionJob.objects.get(pk=response.json()['id'])
+        self.assertEqual((job.kind, job.identifier, job.status), ('channel', '@someone', 'pending'))
+        delay.assert_called_once_with(job.id, incremental=True)
+
+    def test_channel_import_reports_progress_and_succeeds(self):
+        response = self.run_with(FakeService(), '/api/channels/add_by_url/UCjobs/')
+        self.assertEqual(response.status_code, 202)
+
+        job = self.client.get(f"/api/jobs/{response.json()['id']}/").json()
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(
+            (job['pages_fetched'], job['videos_saved'], job['transcripts_found'], job['transcripts_failed']),
+            (2, 3, 1, 1)
+        )
+        self.assertEqual(job['errors'], ['v3: transcript failed'])
+        self.assertEqual(job['result']['channel'], Channel.objects.get(youtube_id='UCjobs').pk)
+        self.assertIsNotNone(job['started_at'])
+        self.assertIsNotNone(job['finished_at'])
+
+    def test_failed_import_keeps_progress_and_error(self):
+        response = self.run_with(FakeService(QuotaExceeded('quota used up')), '/api/channels/add_by_url/UCjobs/')
+
+        job = self.client.get(f"/api/jobs/{response.json()['id']}/").json()
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['videos_saved'], 2)
+        self.assertEqual(job['errors'], ['quota used up'])
+        self.assertIsNotNone(job['finished_at'])
+
+    def test_playlist_import(self):
+        response = self.run_with(FakeService(), '/api/playlists/PLjobs/')
+        self.assertEqual(response.status_code, 202)
+
+        job = IngestionJob.objects.get(pk=response.json()['id'])
+        self.assertEqual((job.kind, job.status, job.pages_fetched), ('playlist', 'succeeded', 1))
+        self.assertEqual(job.result, {'channel': job.channel_id, 'videos': []})
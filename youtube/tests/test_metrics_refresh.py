@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from unittest import mock
+from django.test import TransactionTestCase
+from youtube.models import Channel, Video, VideoMetrics
+from .utils import make_service
+
+
+# The refresh runs on the shared event loop, so data has to be committed
+class RefreshChannelMetricsTests(TransactionTestCase):
+    def test_refreshes_in_batches_of_50_and_leaves_missing_videos(self):
+        channel = Channel.objects.create(youtube_id='UCrefresh', title='Refresh')
+        Video.objects.bulk_create([
+            Video(
+                youtube_id=f'r{i}', channel=channel, title=f'r{i}', view_count=1, like_count=1,
+                published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), duration=1
+            )
+            for i in range(120)
+        ])
+        batches = []
+
+        async def fetch_details(session, video_ids):
+            batches.append(len(video_ids))
+            return [
+                {'id': video_id, 'statistics': {'viewCount': '900', 'likeCount': '30'}}
+                for video_id in video_ids if video_id != 'r7'
+            ]
+        service = make_service()
+        service._fetch_video_details_batch = fetch_details
+
+        with mock.patch('youtube.services.youtube.get_youtube_service', return_value=service):
+            response = self.client.post(f'/api/channels/{channel.pk}/refresh_metrics/')
+
+        self.assertEqual(response.json(), {'channel': channel.pk, 'refreshed': 119})
+        self.assertEqual(sorted(batches), [20, 50, 50])
+        self.assertEqual(Video.objects.get(youtube_id='r8').view_count, 900)
+        self.assertEqual(Video.objects.get(youtube_id='r7').view_count, 1)
+        self.assertEqual(VideoMetrics.objects.filter(video__channel=channel).count(), 119)
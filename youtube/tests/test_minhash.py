@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from django.test import TestCase
+from youtube.models import Channel, Video
+from youtube.services.minhash import duplicate_clusters, similar_videos
+from youtube.services.transcripts import create_transcripts
+
+WORDS = (
+    'the quick brown fox jumps over the lazy dog while a curious cat watches from the old wooden fence '
+    'near the river bank where children play football every sunday afternoon in the warm summer sun'
+).split()
+
+
+class NearDuplicateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.channel = Channel.objects.create(youtube_id='UCdupes', title='Dupes')
+        other = Channel.objects.create(youtube_id='UCother', title='Other')
+        contents = [
+            ('orig', cls.channel, ' '.join(WORDS * 3)),
+            ('copy', other, ' '.join(WORDS * 3) + ' subscribe'),
+            ('other', cls.channel, ' '.join(reversed(WORDS)) + ' espresso grinder espresso'),
+        ]
+        items = []
+        for month, (youtube_id, channel, content) in enumerate(contents, start=1):
+            video = Video.objects.create(
+                youtube_id=youtube_id, channel=channel, title=youtube_id,
+                published_at=datetime(2026, month, 1, tzinfo=timezone.utc), duration=1
+            )
+            items.append((video, {'content': content, 'language': 'en', 'is_generated': False}))
+        cls.videos = {video.youtube_id: video for video, _ in items}
+        create_transcripts(items)
+
+    def test_similar_videos_finds_copies_across_channels(self):
+        similar = similar_videos(self.videos['orig'].pk)
+        self.assertEqual([video['youtube_id'] for video in similar], ['copy'])
+        self.assertGreaterEqual(similar[0]['similarity'], 0.8)
+        self.assertEqual(similar_videos(self.videos['other'].pk), [])
+
+    def test_duplicate_clusters(self):
+        clusters = duplicate_clusters(self.channel.pk)
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual([video['youtube_id'] for video in clusters[0]['videos']], ['orig', 'copy'])
+
+    def test_endpoints(self):
+        response = self.client.get(f"/api/videos/{self.videos['orig'].pk}/similar/")
+        self.assertEqual([video['youtube_id'] for video in response.json()['similar']], ['copy'])
+        self.assertEqual(self.client.get(f"/api/videos/{self.videos['orig'].pk}/similar/?threshold=2").status_code, 400)
+        clusters = self.client.get(f'/api/channels/{self.channel.pk}/duplicates/').json()['clusters']
+        self.assertEqual([video['youtube_id'] for video in clusters[0]['videos']], ['orig', 'copy'])
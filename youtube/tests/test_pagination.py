@@ -0,0 +1,61 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from youtube.models import Channel, Video, VideoMetrics
+
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.channel = Channel.objects.create(youtube_id='UCpages', title='Pages')
+        now = timezone.now()
+        # Three uploads per day, so pages split ties on published_at
+        cls.videos = [
+            Video.objects.create(
+                youtube_id=f'page{i}', channel=cls.channel, title=f'Video {i}',
+                published_at=now - timedelta(days=i // 3), view_count=i, like_count=1, duration=1
+            )
+            for i in range(14)
+        ]
+
+    def walk(self, url: str) -> tuple:
+        """Follow next links from url, returning the ids seen and the last page"""
+        seen, page = [], None
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content[:200])
+            page = response.json()
+            seen += [item['id'] for item in page['results']]
+            url = page['next']
+        return seen, page
+
+    def expected(self):
+        return list(
+            Video.objects.filter(channel=self.channel).order_by('-published_at', '-id').values_list('id', flat=True)
+        )
+
+    def test_round_trip_in_both_directions(self):
+        forward, last = self.walk(f'/api/channels/{self.channel.pk}/videos/?page_size=4')
+        self.assertEqual(forward, self.expected())
+
+        backward, url = [], last['previous']
+        while url:
+            page = self.client.get(url).json()
+            backward = [item['id'] for item in page['results']] + backward
+            url = page['previous']
+        self.assertEqual(backward + [item['id'] for item in last['results']], forward)
+
+    def test_video_list_and_metrics_history(self):
+        seen, _ = self.walk('/api/videos/?channel_id=UCpages&page_size=5')
+        self.assertEqual(seen, self.expected())
+
+        for views in range(7):
+            VideoMetrics.objects.create(video=self.videos[0], view_count=views, like_count=0)
+        seen, _ = self.walk(f'/api/videos/{self.videos[0].pk}/metrics/?page_size=3')
+        self.assertEqual(
+            seen,
+            list(VideoMetrics.objects.filter(video=self.videos[0]).order_by('-captured_at', '-id').values_list('id', flat=True))
+        )
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/videos/?cursor=garbage').status_code, 404)
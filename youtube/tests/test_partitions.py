@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+from django.db import connection
+from django.test import TestCase
+from youtube.models import VideoMetrics
+from youtube.services import partitions
+
+
+class PartitionHelperTests(TestCase):
+    def test_month_arithmetic(self):
+        december = partitions.month_start(datetime(2026, 12, 31, 23, tzinfo=timezone.utc))
+        self.assertEqual(december, datetime(2026, 12, 1, tzinfo=timezone.utc))
+        self.assertEqual(partitions.add_months(december, 1), datetime(2027, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(partitions.add_months(december, -12), datetime(2025, 12, 1, tzinfo=timezone.utc))
+        self.assertEqual(partitions.partition_name(december), 'youtube_videometrics_2026_12')
+
+    def test_partitioning_is_a_no_op_off_postgresql(self):
+        if connection.vendor == 'postgresql':
+            self.skipTest('PostgreSQL layout')
+        self.assertFalse(partitions.is_partitioned())
+        self.assertEqual(partitions.ensure_partitions(), [])
+
+    def test_history_queries_use_the_composite_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite query plan')
+        query = VideoMetrics.objects.filter(video_id=1).order_by('-captured_at')
+        sql, params = query.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn(partitions.COMPOSITE_INDEX, plan)
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timezone
+from django.test import TransactionTestCase
+from youtube.models import Channel, Video
+from .utils import make_service, playlist_item
+
+
+# Threads from run_in_executor use their own connections, so data has to be committed
+class PlaylistPagesTests(TransactionTestCase):
+    def setUp(self):
+        self.service = make_service()
+        self.channel = Channel.objects.create(youtube_id='UCpages', title='Pages')
+        self.fetched = []
+
+        async def fetch_page(session, playlist_id, page_token=None):
+            page = int(page_token or 0)
+            self.fetched.append(page)
+            return {
+                'items': [playlist_item(f'v{i}') for i in range(page * 5, page * 5 + 5)],
+                'nextPageToken': str(page + 1) if page < 3 else None,
+            }
+        self.service._fetch_playlist_page = fetch_page
+
+    def produce(self, **kwargs) -> list:
+        async def run():
+            queue = asyncio.Queue()
+            await self.service._produce_playlist_pages(None, 'PL', queue, **kwargs)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+        return asyncio.run(run())
+
+    def store(self, video_ids):
+        for video_id in video_ids:
+            Video.objects.create(
+                youtube_id=video_id, channel=self.channel, title=video_id,
+                published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), duration=1
+            )
+
+    def test_walks_every_page(self):
+        pages = self.produce()
+        self.assertEqual(self.fetched, [0, 1, 2, 3])
+        self.assertEqual(sum(len(page) for page in pages), 20)
+
+    def test_max_results_limits_pages(self):
+        self.produce(max_results=7)
+        self.assertEqual(self.fetched, [0, 1])
+
+    def test_skip_known_stops_at_first_known_page(self):
+        # v3 and v4 are known on the first page, page 1 is entirely known
+        self.store([f'v{i}' for i in range(3, 15)])
+        pages = self.produce(skip_known=True)
+        self.assertEqual(self.fetched, [0, 1])
+        self.assertEqual(
+            [[item['contentDetails']['videoId'] for item in page] for page in pages],
+            [['v0', 'v1', 'v2']]
+        )
+
+    def test_skip_known_walks_on_without_known_uploads(self):
+        self.produce(skip_known=True)
+        self.assertEqual(self.fetched, [0, 1, 2, 3])
+
+    def test_max_total_rejects_large_playlists(self):
+        async def fetch_page(session, playlist_id, page_token=None):
+            return {'items': [playlist_item('v0')], 'pageInfo': {'totalResults': 500}}
+        self.service._fetch_playlist_page = fetch_page
+        with self.assertRaisesMessage(ValueError, 'Playlist too large'):
+            self.produce(max_total=100)
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest import mock
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from youtube_transcript_api import TranscriptsDisabled
+from youtube.models import Channel, IngestionJob, Transcript, Video
+from youtube.services.youtube import NO_TRANSCRIPT_CACHE_KEY, YouTubeService
+from .utils import make_service, playlist_item
+
+
+def details(video_ids) -> list:
+    return [
+        {'id': video_id, 'statistics': {'viewCount': '100', 'likeCount': '5'}, 'contentDetails': {'duration': 'PT1M'}}
+        for video_id in video_ids
+    ]
+
+
+# Threads from run_in_executor use their own connections, so data has to be committed
+class ProcessVideoBatchTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = make_service()
+        self.channel = Channel.objects.create(youtube_id='UCbatch', title='Batch')
+        self.job = IngestionJob.objects.create(kind=IngestionJob.KIND_CHANNEL, identifier='UCbatch')
+
+    def process(self, items):
+        return asyncio.run(self.service._process_video_batch(None, items, self.channel, 0, job=self.job))
+
+    def test_transcripts_are_stored_once_and_disabled_ones_cached(self):
+        def fetch(video_id):
+            if video_id == 'off':
+                raise TranscriptsDisabled(video_id)
+            return {
+                'content': 'hello world', 'language': 'en', 'is_generated': False,
+                'segments': [(0, 1000, 'hello'), (1000, 1000, 'world')],
+            }
+        self.service._fetch_video_details_batch = mock.AsyncMock(return_value=details(['on', 'off']))
+        items = [playlist_item('on'), playlist_item('off')]
+        with mock.patch.object(YouTubeService, '_fetch_transcript_sync', side_effect=fetch) as fetch_sync:
+            self.process(items)
+            self.assertEqual(fetch_sync.call_count, 2)
+            self.process(items)
+            self.assertEqual(fetch_sync.call_count, 2)
+
+        self.assertEqual(Transcript.objects.get(video__youtube_id='on').content, 'hello world')
+        self.assertIsNotNone(cache.get(NO_TRANSCRIPT_CACHE_KEY.format('off')))
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.transcripts_found, self.job.transcripts_failed), (1, 1))
+
+    def test_videos_missing_details_are_skipped(self):
+        Video.objects.create(
+            youtube_id='gone', channel=self.channel, title='gone', view_count=500, like_count=50,
+            published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), duration=1
+        )
+        self.service._fetch_video_details_batch = mock.AsyncMock(return_value=details(['kept']))
+        with mock.patch.object(YouTubeService, '_fetch_transcript_sync', return_value=None):
+            videos = self.process([playlist_item('kept'), playlist_item('gone')])
+
+        self.assertEqual([video.youtube_id for video in videos], ['kept'])
+        self.assertEqual(Video.objects.get(youtube_id='gone').view_count, 500)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.videos_saved, 1)
+        self.assertEqual(self.job.errors, ['gone: not returned by videos.list, skipped'])
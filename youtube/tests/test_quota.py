@@ -0,0 +1,127 @@
+import asyncio
+import json
+from unittest import mock
+import httplib2
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from googleapiclient.errors import HttpError
+from youtube.services import quota
+
+HTML_BODY = b'<html><body>502 Bad Gateway</body></html>'
+
+
+class FakeResponse:
+    def __init__(self, status, body, reason='Error'):
+        self.status = status
+        self.body = body
+        self.reason = reason
+
+    async def json(self, content_type='application/json'):
+        return json.loads(self.body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Hands out the given responses in order, like session.get()"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, headers=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+class FakeRequest:
+    """Stands in for a googleapiclient HttpRequest"""
+    uri = 'https://www.googleapis.com/youtube/v3/videos?id=abc&part=statistics'
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.headers = {}
+        self.calls = 0
+
+    def execute(self, http=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def http_error(status, content):
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+@override_settings(YOUTUBE_RETRY_BASE_DELAY=0, YOUTUBE_MAX_RETRIES=3, YOUTUBE_DAILY_QUOTA=100)
+@mock.patch('youtube.services.quota.get_response_cache', return_value=None)
+class ApiGetTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get(self, session):
+        return asyncio.run(quota.api_get(session, 'https://example.invalid/videos', 'videos.list', {'id': 'abc'}))
+
+    def test_retries_non_json_server_error(self, _):
+        session = FakeSession([FakeResponse(502, HTML_BODY, 'Bad Gateway'), FakeResponse(200, b'{"items": [1]}')])
+        self.assertEqual(self.get(session), {'items': [1]})
+        self.assertEqual(session.calls, 2)
+        self.assertEqual(quota.get_quota_usage()['used'], 2)
+
+    def test_gives_up_after_max_retries(self, _):
+        session = FakeSession([FakeResponse(503, b'') for _ in range(4)])
+        with self.assertRaises(quota.YouTubeAPIError):
+            self.get(session)
+        self.assertEqual(session.calls, 4)
+
+    def test_client_errors_are_not_retried(self, _):
+        body = b'{"error": {"message": "bad id", "errors": [{"reason": "badRequest"}]}}'
+        session = FakeSession([FakeResponse(400, body)])
+        with self.assertRaisesMessage(quota.YouTubeAPIError, 'bad id'):
+            self.get(session)
+        self.assertEqual(session.calls, 1)
+
+    def test_quota_exceeded_response_exhausts_budget(self, _):
+        body = b'{"error": {"message": "quota", "errors": [{"reason": "quotaExceeded"}]}}'
+        with self.assertRaises(quota.QuotaExceeded):
+            self.get(FakeSession([FakeResponse(403, body)]))
+        self.assertEqual(quota.get_quota_usage()['remaining'], 0)
+        with self.assertRaises(quota.QuotaExceeded):
+            self.get(FakeSession([]))
+
+
+@override_settings(YOUTUBE_RETRY_BASE_DELAY=0, YOUTUBE_MAX_RETRIES=3, YOUTUBE_DAILY_QUOTA=100)
+@mock.patch('youtube.services.quota.get_response_cache', return_value=None)
+class ApiExecuteTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_retries_non_json_server_error(self, _):
+        request = FakeRequest([http_error(503, HTML_BODY), {'items': [1]}])
+        self.assertEqual(quota.api_execute(request, 'videos.list'), {'items': [1]})
+        self.assertEqual(request.calls, 2)
+
+    def test_retries_transport_errors(self, _):
+        request = FakeRequest([httplib2.ServerNotFoundError('dns'), TimeoutError(), {'items': []}])
+        self.assertEqual(quota.api_execute(request, 'videos.list'), {'items': []})
+        self.assertEqual(request.calls, 3)
+
+    def test_client_errors_are_not_retried(self, _):
+        request = FakeRequest([http_error(404, b'{"error": {"message": "gone", "errors": [{"reason": "notFound"}]}}')])
+        with self.assertRaisesMessage(quota.YouTubeAPIError, 'gone'):
+            quota.api_execute(request, 'videos.list')
+        self.assertEqual(request.calls, 1)
+
+    @override_settings(YOUTUBE_DAILY_QUOTA=2)
+    def test_refuses_calls_over_budget(self, _):
+        request = FakeRequest([{'items': []}, {'items': []}])
+        quota.api_execute(request, 'videos.list')
+        quota.api_execute(request, 'videos.list')
+        with self.assertRaises(quota.QuotaExceeded):
+            quota.api_execute(FakeRequest([]), 'videos.list')
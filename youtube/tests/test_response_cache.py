@@ -0,0 +1,78 @@
+import asyncio
+import tempfile
+from unittest import mock
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from youtube.services import quota, response_cache
+from youtube.services.response_cache import DiskResponseCache
+from .test_quota import FakeResponse
+
+RESPONSE_CACHE = {'BACKEND': 'disk', 'LOCATION': '', 'MAX_BYTES': 1024, 'TTLS': {'channels.list': 3600, 'videos.list': 0}}
+
+
+class RecordingSession:
+    """Answers every GET with the given responses in order, keeping the request headers"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def get(self, url, params=None, headers=None):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+
+@override_settings(YOUTUBE_RESPONSE_CACHE=RESPONSE_CACHE)
+class DiskResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = DiskResponseCache(directory.name, max_bytes=1024)
+
+    def test_fresh_bodies_are_served_and_stale_ones_revalidated(self):
+        self.cache.store('channel', {'etag': 'a', 'items': [1]})
+        self.cache.store('video', {'etag': 'b', 'items': [2]})
+        self.assertEqual(self.cache.lookup('channels.list', 'channel')[0], {'etag': 'a', 'items': [1]})
+        body, entry = self.cache.lookup('videos.list', 'video')
+        self.assertIsNone(body)
+        self.assertEqual(entry['etag'], 'b')
+
+    def test_bodies_without_etag_are_not_stored(self):
+        self.cache.store('video', {'items': []})
+        self.assertEqual(self.cache.lookup('videos.list', 'video'), (None, None))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for index in range(20):
+            self.cache.store(f'key{index}', {'etag': str(index), 'padding': 'x' * 100})
+        self.assertLessEqual(self.cache.size(), 1024)
+        self.assertIsNone(self.cache.get('key0'))
+        self.assertIsNotNone(self.cache.get('key19'))
+
+    def test_not_modified_responses_serve_the_cached_body(self):
+        cache.clear()
+        session = RecordingSession([
+            FakeResponse(200, b'{"etag": "v1", "items": [1]}'),
+            FakeResponse(304, b''),
+        ])
+        with mock.patch('youtube.services.quota.get_response_cache', return_value=self.cache):
+            for _ in range(2):
+                body = asyncio.run(quota.api_get(session, 'https://example.invalid/videos', 'videos.list', {'id': 'a'}))
+                self.assertEqual(body, {'etag': 'v1', 'items': [1]})
+        self.assertEqual(session.headers, [None, {'If-None-Match': 'v1'}])
+        self.assertEqual(cache.get(response_cache.COUNTER_CACHE_KEY.format('not_modified')), 1)
+
+
+class GetResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(setattr, response_cache, '_response_cache', None)
+        response_cache._response_cache = None
+
+    @override_settings(YOUTUBE_RESPONSE_CACHE={**RESPONSE_CACHE, 'BACKEND': 'redis', 'LOCATION': '/tmp/cache'})
+    def test_redis_backend_requires_a_url(self):
+        with self.assertRaises(ImproperlyConfigured):
+            response_cache.get_response_cache()
+
+    @override_settings(YOUTUBE_RESPONSE_CACHE={**RESPONSE_CACHE, 'BACKEND': 'none'})
+    def test_none_disables_the_cache(self):
+        self.assertIsNone(response_cache.get_response_cache())
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from django.test import TestCase
+from youtube.models import Channel, Video, VideoMetrics, VideoMetricsRollup
+from youtube.services.rollups import apply_snapshots, rebuild_rollups
+
+FIELDS = (
+    'granularity', 'bucket', 'min_views', 'max_views', 'last_views', 'open_views',
+    'view_delta', 'like_delta', 'samples'
+)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        channel = Channel.objects.create(youtube_id='UCroll', title='Roll')
+        self.video = Video.objects.create(
+            youtube_id='roll', channel=channel, title='Roll',
+            published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), duration=1
+        )
+        # Monday, so the samples span two days of one week and a second week
+        start = datetime(2026, 10, 5, 1, tzinfo=timezone.utc)
+        self.snapshots = []
+        for hours, views in [(0, 10), (5, 15), (25, 30), (50, 40), (24 * 8, 100)]:
+            with mock.patch('django.utils.timezone.now', return_value=start + timedelta(hours=hours)):
+                self.snapshots.append(
+                    VideoMetrics.objects.create(video=self.video, view_count=views, like_count=views // 10)
+                )
+
+    def rows(self):
+        return list(VideoMetricsRollup.objects.order_by('granularity', 'bucket').values_list(*FIELDS))
+
+    def test_incremental_rollups_match_rebuild(self):
+        for batch in (self.snapshots[:2], self.snapshots[2:4], self.snapshots[4:]):
+            apply_snapshots(batch)
+        incremental = self.rows()
+        rebuild_rollups([self.video.pk])
+
+        self.assertEqual(incremental, self.rows())
+        self.assertEqual(sum(row[-1] for row in incremental if row[0] == 'day'), 5)
+
+    def test_weekly_metrics_history(self):
+        rebuild_rollups([self.video.pk])
+        response = self.client.get(f'/api/video-analytics/{self.video.pk}/metrics/?granularity=week')
+        self.assertEqual(response.status_code, 200)
+        history = response.json()['history']
+        self.assertEqual(len(history), 2)
+        self.assertEqual(sum(week['view_delta'] for week in history), 90)
+        self.assertEqual(
+            self.client.get(f'/api/video-analytics/{self.video.pk}/metrics/?granularity=month').status_code, 400
+        )
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from django.test import TestCase
+from youtube.models import Channel, Transcript, Video
+from youtube.services.transcripts import create_transcripts
+
+
+class TranscriptSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.coffee = Channel.objects.create(youtube_id='UCcoffee', title='Coffee')
+        cls.tea = Channel.objects.create(youtube_id='UCtea', title='Tea')
+        contents = [
+            ('grinder', cls.coffee, 1, 'we review the new espresso grinder and the grinder burrs'),
+            ('kettle', cls.tea, 2, 'a gooseneck kettle for pour over, no grinder needed for tea'),
+            ('beans', cls.coffee, 3, 'roasting coffee beans at home'),
+        ]
+        items = []
+        for youtube_id, channel, month, content in contents:
+            video = Video.objects.create(
+                youtube_id=youtube_id, channel=channel, title=youtube_id,
+                published_at=datetime(2026, month, 1, tzinfo=timezone.utc), duration=1
+            )
+            items.append((video, {'content': content, 'language': 'en', 'is_generated': False}))
+        create_transcripts(items)
+
+    def search(self, params):
+        response = self.client.get('/api/transcripts/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [result['youtube_id'] for result in response.json()['results']]
+
+    def test_ranked_hits(self):
+        self.assertEqual(self.search({'q': 'grinder'}), ['grinder', 'kettle'])
+        self.assertEqual(self.search({'q': 'grinders'}), ['grinder', 'kettle'])
+        self.assertEqual(self.search({'q': 'espresso grinder'}), ['grinder'])
+        self.assertEqual(self.search({'q': 'matcha'}), [])
+
+    def test_filters_and_paging(self):
+        self.assertEqual(self.search({'q': 'grinder', 'channel': self.tea.pk}), ['kettle'])
+        self.assertEqual(self.search({'q': 'grinder', 'published_after': '2026-01-15'}), ['kettle'])
+        response = self.client.get('/api/transcripts/search/', {'q': 'grinder', 'limit': 1}).json()
+        self.assertTrue(response['has_more'])
+
+    def test_deleted_transcripts_leave_the_index(self):
+        Transcript.objects.filter(video__youtube_id='kettle').delete()
+        self.assertEqual(self.search({'q': 'grinder'}), ['grinder'])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get('/api/transcripts/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/transcripts/search/', {'q': 'x', 'published_after': 'soon'}).status_code, 400)
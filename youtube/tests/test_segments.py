@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from django.test import TestCase
+from youtube.models import Channel, TranscriptSegment, Video
+from youtube.services.transcripts import create_transcripts
+
+SEGMENTS = [
+    (0, 2000, 'welcome back to the channel'),
+    (2000, 3000, 'today we review'),
+    (5000, 2500, 'the new Grinder'),
+    (7500, 2000, 'and its grinder burrs'),
+    (9500, 1500, 'grinders compared'),
+    (11000, 1000, 'one more grinder'),
+]
+
+
+class TranscriptSegmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        channel = Channel.objects.create(youtube_id='UCseg', title='Segments')
+        video = Video.objects.create(
+            youtube_id='seg', channel=channel, title='seg',
+            published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), duration=12
+        )
+        cls.transcript = create_transcripts([(video, {
+            'content': ' '.join(text for _, _, text in SEGMENTS),
+            'language': 'en',
+            'is_generated': False,
+            'segments': SEGMENTS,
+        })])[0]
+
+    def segments(self, params):
+        return self.client.get(f'/api/transcripts/{self.transcript.pk}/segments/', params)
+
+    def test_window(self):
+        self.assertEqual(TranscriptSegment.objects.filter(transcript=self.transcript).count(), len(SEGMENTS))
+        response = self.segments({'start': 2.5, 'end': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['segments'], [{'start': 2.0, 'duration': 3.0, 'text': 'today we review'}])
+        texts = [segment['text'] for segment in self.segments({'start': 9}).json()['segments']]
+        self.assertEqual(texts, ['and its grinder burrs', 'grinders compared', 'one more grinder'])
+
+    def test_invalid_window(self):
+        self.assertEqual(self.segments({'start': 5, 'end': 1}).status_code, 400)
+        self.assertEqual(self.segments({'start': 'nan'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/transcripts/0/segments/').status_code, 404)
+
+    def test_search_timestamps(self):
+        results = self.client.get('/api/transcripts/search/', {'q': 'grinder'}).json()['results']
+        self.assertEqual(
+            [timestamp['start'] for timestamp in results[0]['timestamps']], [5.0, 7.5, 9.5]
+        )
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from django.test import TestCase, override_settings
+from youtube.models import Channel, Video, VideoMetrics
+from youtube.services.youtube import videos_due_for_snapshot
+
+NOW = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+
+
+@override_settings(YOUTUBE_SNAPSHOT_TIERS=[(48, 1), (24 * 30, 24), (None, 24 * 7)])
+class VideosDueForSnapshotTests(TestCase):
+    def setUp(self):
+        self.channel = Channel.objects.create(youtube_id='UCtiers', title='Tiers')
+
+    def video(self, youtube_id, age_hours, snapshot_hours_ago=None):
+        video = Video.objects.create(
+            youtube_id=youtube_id, channel=self.channel, title=youtube_id,
+            published_at=NOW - timedelta(hours=age_hours), duration=1
+        )
+        if snapshot_hours_ago is not None:
+            with mock.patch('django.utils.timezone.now', return_value=NOW - timedelta(hours=snapshot_hours_ago)):
+                VideoMetrics.objects.create(video=video, view_count=0, like_count=0)
+        return video
+
+    def test_each_age_tier_uses_its_own_interval(self):
+        self.video('fresh-due', 10, snapshot_hours_ago=2)
+        self.video('fresh-recent', 12, snapshot_hours_ago=0.5)
+        self.video('month-due', 24 * 5, snapshot_hours_ago=30)
+        self.video('month-recent', 24 * 6, snapshot_hours_ago=2)
+        self.video('old-due', 24 * 400, snapshot_hours_ago=24 * 8)
+        self.video('old-recent', 24 * 300, snapshot_hours_ago=24 * 3)
+        self.video('never', 24 * 500)
+
+        due = list(videos_due_for_snapshot(NOW).values_list('youtube_id', flat=True))
+        self.assertEqual(due, ['fresh-due', 'month-due', 'old-due', 'never'])
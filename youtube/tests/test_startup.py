@@ -0,0 +1,12 @@
+from django.test import SimpleTestCase
+from youtube.management.commands.startup_benchmark import _run
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_web_and_cli_start_without_client_libraries(self):
+        for scenario in ('web', 'cli'):
+            with self.subTest(scenario=scenario):
+                measurements, _, _ = _run(scenario)
+                self.assertEqual(measurements['lazy_modules_loaded'], [])
+                if scenario == 'web':
+                    self.assertTrue(measurements['status'].startswith('200'))
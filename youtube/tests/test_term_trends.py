@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from django.test import TestCase
+from youtube.models import Channel, Video
+from youtube.services.terms import term_trends
+from youtube.services.transcripts import create_transcripts
+
+
+class TermTrendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.channel = Channel.objects.create(youtube_id='UCterms', title='Terms')
+        contents = [
+            'the quick brown fox jumps over the lazy fox and another fox',
+            'no matching words here',
+            'espresso grinder espresso and one fox',
+        ]
+        items = []
+        for month, content in enumerate(contents, start=1):
+            video = Video.objects.create(
+                youtube_id=f'terms{month}', channel=cls.channel, title=f'terms{month}',
+                published_at=datetime(2026, month, 1, tzinfo=timezone.utc), duration=1
+            )
+            items.append((video, {'content': content, 'language': 'en', 'is_generated': False}))
+        create_transcripts(items)
+
+    def test_counts_per_period(self):
+        trends = term_trends(self.channel.pk, ['Espresso', 'fox'])
+        self.assertEqual(trends['terms'], ['espresso', 'fox'])
+        counts = {period['period']: period['counts'] for period in trends['periods']}
+        self.assertEqual(counts['2026-01'], {'espresso': 0, 'fox': 3})
+        self.assertEqual(counts['2026-03'], {'espresso': 2, 'fox': 1})
+
+    def test_endpoint(self):
+        url = f'/api/channel-analytics/{self.channel.pk}/terms/'
+        response = self.client.get(url, {'q': 'fox', 'period': 'year'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['periods'][0]['counts'], {'fox': 4})
+        self.assertEqual(self.client.get(url, {'q': 'fox', 'period': 'decade'}).status_code, 400)
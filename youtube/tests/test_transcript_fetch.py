@@ -0,0 +1,35 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase
+from .utils import make_service
+
+
+class FetchTranscriptSyncTests(SimpleTestCase):
+    def test_builds_content_and_segments_from_one_listing(self):
+        snippets = [
+            SimpleNamespace(text='first', start=0.0, duration=1.5),
+            SimpleNamespace(text='second', start=1.5, duration=2.25),
+        ]
+        transcript = mock.Mock(language_code='en', is_generated=True)
+        transcript.fetch.return_value = snippets
+        api = mock.Mock()
+        api.list.return_value.find_transcript.return_value = transcript
+
+        with mock.patch('youtube.services.youtube.get_thread_transcript_api', return_value=api):
+            data = make_service()._fetch_transcript_sync('abc')
+
+        api.list.assert_called_once_with('abc')
+        self.assertEqual(data, {
+            'content': 'first second',
+            'language': 'en',
+            'is_generated': True,
+            'segments': [(0, 1500, 'first'), (1500, 2250, 'second')],
+        })
+
+    def test_failures_are_counted_not_raised(self):
+        stats = {'fetched': 0, 'failed': 0, 'seconds': 0.0, 'unavailable': []}
+        service = make_service()
+        with mock.patch.object(service, '_fetch_transcript_sync', side_effect=RuntimeError('boom')):
+            self.assertIsNone(asyncio.run(service._fetch_transcript('abc', stats)))
+        self.assertEqual((stats['fetched'], stats['failed'], stats['unavailable']), (0, 1, []))
@@ -0,0 +1,56 @@
+import gzip
+from datetime import datetime, timezone
+from django.test import SimpleTestCase, TestCase, override_settings
+from youtube.models import Channel, Transcript, Video
+from youtube.services.transcripts import create_transcripts, segment_spans
+
+CONTENT = 'welcome back to the channel today we review the new espresso grinder ' * 50
+
+
+class CompressedTranscriptTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        channel = Channel.objects.create(youtube_id='UCgzip', title='Gzip')
+        video = Video.objects.create(
+            youtube_id='gzip', channel=channel, title='gzip',
+            published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), duration=1
+        )
+        cls.transcript = create_transcripts([(video, {
+            'content': CONTENT, 'language': 'en', 'is_generated': False,
+        })])[0]
+
+    def test_content_is_stored_compressed(self):
+        stored = Transcript.objects.filter(pk=self.transcript.pk).values_list('content_size', flat=True).get()
+        self.assertEqual(stored, len(CONTENT.encode('utf-8')))
+        self.assertEqual(Transcript.objects.get(pk=self.transcript.pk).content, CONTENT)
+
+    @override_settings(YOUTUBE_TRANSCRIPT_DOWNLOAD_CHUNK_SIZE=64)
+    def test_download_passes_gzip_through(self):
+        response = self.client.get(f'/api/transcripts/{self.transcript.pk}/download/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = b''.join(response.streaming_content)
+        self.assertEqual(int(response['Content-Length']), len(body))
+        self.assertLess(len(body), len(CONTENT))
+        self.assertEqual(gzip.decompress(body).decode(), CONTENT)
+
+    @override_settings(YOUTUBE_TRANSCRIPT_DOWNLOAD_CHUNK_SIZE=64)
+    def test_download_decompresses_for_other_clients(self):
+        response = self.client.get(f'/api/transcripts/{self.transcript.pk}/download/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(b''.join(response.streaming_content).decode(), CONTENT)
+
+    def test_list_omits_content(self):
+        results = self.client.get('/api/transcripts/').json()['results']
+        self.assertEqual([item['id'] for item in results], [self.transcript.pk])
+        self.assertNotIn('content', results[0])
+
+
+class SegmentSpanTests(SimpleTestCase):
+    def test_spans_follow_the_joined_content(self):
+        segments = [(0, 1000, 'go'), (1000, 1000, 'go on'), (2000, 500, 'missing'), (2500, 500, 'on')]
+        self.assertEqual(
+            list(segment_spans('go go on on', segments)),
+            [(0, 1000, 0, 2), (1000, 1000, 3, 5), (2000, 500, 8, 0), (2500, 500, 9, 2)]
+        )
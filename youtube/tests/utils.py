@@ -0,0 +1,18 @@
+from youtube.services.youtube import YouTubeService
+
+
+def make_service() -> YouTubeService:
+    """A service that never builds the googleapiclient client"""
+    service = YouTubeService.__new__(YouTubeService)
+    service.api_key = 'test'
+    service.base_url = 'https://example.invalid'
+    service._transcript_semaphore = None
+    service._transcript_semaphore_loop = None
+    return service
+
+
+def playlist_item(video_id: str) -> dict:
+    return {
+        'snippet': {'title': f'Video {video_id}', 'description': ''},
+        'contentDetails': {'videoId': video_id, 'videoPublishedAt': '2026-03-01T00:00:00Z'},
+    }
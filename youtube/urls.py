@@ -8,6 +8,9 @@ router.register(r'channels', views.ChannelViewSet)
 router.register(r'videos', views.VideoViewSet)
 router.register(r'transcripts', views.TranscriptViewSet)
 router.register(r'playlists', views.PlaylistViewSet, basename='playlist')
+router.register(r'jobs', views.IngestionJobViewSet)
+router.register(r'quota', views.QuotaViewSet, basename='quota')
+router.register(r'response-cache', views.ResponseCacheViewSet, basename='response-cache')
 router.register(r'channel-analytics', ChannelAnalyticsViewSet, basename='channel-analytics')
 router.register(r'video-analytics', VideoAnalyticsViewSet, basename='video-analytics')
 